@@ -1,10 +1,9 @@
 """Module for handling the PGA cache"""
 import os
-import shutil
 
 from lutris import settings
 from lutris.util.log import logger
-from lutris.util.system import merge_folders
+from lutris.util.system import copy_file, merge_folders
 
 
 def get_cache_path():
@@ -29,5 +28,5 @@ def save_to_cache(source, destination):
         # Copy folder recursively
         merge_folders(source, destination)
     else:
-        shutil.copy(source, destination)
+        copy_file(source, destination)
     logger.debug("Copied %s to cache %s", source, destination)
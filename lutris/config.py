@@ -12,6 +12,54 @@ from lutris.util.system import path_exists
 from lutris.util.yaml import read_yaml_from_file, write_yaml_to_file
 
 
+# Parsed config files, indexed by path, with the modification time and size
+# of the file when it was parsed
+_CONFIG_FILES_CACHE = {}
+
+
+def _get_file_stamp(path):
+    """Return a tuple identifying the version of a file, None if it doesn't exist"""
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        return None
+    return file_stat.st_mtime_ns, file_stat.st_size
+
+
+def copy_config(config):
+    """Return a copy of a parsed config, faster than a deepcopy"""
+    if isinstance(config, dict):
+        return {key: copy_config(value) for key, value in config.items()}
+    if isinstance(config, list):
+        return [copy_config(value) for value in config]
+    return config
+
+
+def read_config_file(path):
+    """Return the content of a YAML config file. Files are only parsed the first
+    time they are read or when they change, a copy of the cached content is
+    returned otherwise."""
+    if not path:
+        return {}
+    stamp = _get_file_stamp(path)
+    if not stamp:
+        _CONFIG_FILES_CACHE.pop(path, None)
+        return read_yaml_from_file(path)
+    cached_stamp, content = _CONFIG_FILES_CACHE.get(path, (None, None))
+    if cached_stamp != stamp:
+        content = read_yaml_from_file(path)
+        _CONFIG_FILES_CACHE[path] = (stamp, content)
+    return copy_config(content)
+
+
+def write_config_file(config, path):
+    """Write a config to a YAML file and cache its content"""
+    write_yaml_to_file(config, path)
+    stamp = _get_file_stamp(path)
+    if stamp:
+        _CONFIG_FILES_CACHE[path] = (stamp, copy_config(config))
+
+
 def make_game_config_id(game_slug):
     """Return an unique config id to avoid clashes between multiple games"""
     return "{}-{}".format(game_slug, int(time.time()))
@@ -117,9 +165,9 @@ class LutrisConfig:
         self.game_level = {"system": {}, self.runner_slug: {}, "game": {}}
         self.runner_level = {"system": {}, self.runner_slug: {}}
         self.system_level = {"system": {}}
-        self.game_level.update(read_yaml_from_file(self.game_config_path))
-        self.runner_level.update(read_yaml_from_file(self.runner_config_path))
-        self.system_level.update(read_yaml_from_file(self.system_config_path))
+        self.game_level.update(read_config_file(self.game_config_path))
+        self.runner_level.update(read_config_file(self.runner_config_path))
+        self.system_level.update(read_config_file(self.system_config_path))
 
         self.update_cascaded_config()
         self.update_raw_config()
@@ -209,7 +257,7 @@ class LutrisConfig:
             raise ValueError("Invalid config level '%s'" % self.level)
 
         logger.debug("Saving %s config to %s", self, config_path)
-        write_yaml_to_file(config, config_path)
+        write_config_file(config, config_path)
         self.initialize_config()
 
     def get_defaults(self, options_type):
@@ -218,7 +266,10 @@ class LutrisConfig:
         defaults = {}
         for option, params in options_dict.items():
             if "default" in params:
-                defaults[option] = params["default"]
+                default = params["default"]
+                if callable(default):
+                    default = default()
+                defaults[option] = default
         return defaults
 
     def options_as_dict(self, options_type):
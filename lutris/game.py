@@ -41,6 +41,7 @@ class Game(GObject.Object):
     __gsignals__ = {
         "game-error": (GObject.SIGNAL_RUN_FIRST, None, (str, )),
         "game-start": (GObject.SIGNAL_RUN_FIRST, None, ()),
+        "game-launch-status": (GObject.SIGNAL_RUN_FIRST, None, (str, )),
         "game-started": (GObject.SIGNAL_RUN_FIRST, None, ()),
         "game-stop": (GObject.SIGNAL_RUN_FIRST, None, ()),
         "game-stopped": (GObject.SIGNAL_RUN_FIRST, None, (int, )),
@@ -289,8 +290,13 @@ class Game(GObject.Object):
             return
 
         self.emit("game-start")
+        self.runner.status_callback = self.on_prelaunch_status
         jobs.AsyncCall(self.runner.prelaunch, self.configure_game)
 
+    def on_prelaunch_status(self, message):
+        """Report the progress of the prelaunch, called from its thread"""
+        GLib.idle_add(self.emit, "game-launch-status", message)
+
     def restrict_to_display(self, display):
         outputs = DISPLAY_MANAGER.get_config()
         if display == "primary":
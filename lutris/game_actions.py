@@ -24,11 +24,7 @@ from lutris.util.system import path_exists
 
 
 def game_in_favorite(game_id):
-    categories = pga.get_categories_in_game(game_id)
-    for category in categories:
-        if category == "favorite":
-            return True
-    return False
+    return pga.is_game_in_category(game_id, "favorite")
 
 
 class GameActions:
@@ -40,26 +36,38 @@ class GameActions:
         self.window = window
         self.game_id = None
         self._game = None
+        self._summary = None
 
     @property
     def game(self):
+        """Return the full Game, loaded on first access"""
         if not self._game:
             self._game = self.application.get_game_by_id(self.game_id)
             if not self._game:
-                self._game = Game(self.game_id)
+                self._game = self._summary.load_game() if self._summary else Game(self.game_id)
             self._game.connect("game-error", self.window.on_game_error)
         return self._game
 
+    @property
+    def summary(self):
+        """Return what is known about the game without loading it"""
+        return self._game or self._summary or self.game
+
     @property
     def is_game_running(self):
         return bool(self.application.get_game_by_id(self.game_id))
 
     def set_game(self, game=None, game_id=None):
+        """Set the game to act on, either a Game or a GameSummary"""
+        self._game = None
+        self._summary = None
         if game:
-            self._game = game
+            if isinstance(game, Game):
+                self._game = game
+            else:
+                self._summary = game
             self.game_id = game.id
         else:
-            self._game = None
             self.game_id = game_id
 
     def get_game_actions(self):
@@ -104,23 +112,23 @@ class GameActions:
 
     def on_hide_game(self, _widget):
         """Add a game to the list of hidden games"""
-        game = Game(self.window.view.selected_game.id)
+        game_id = self.window.view.selected_game.id
 
         # Append the new hidden ID and save it
-        ignores = pga.get_hidden_ids() + [game.id]
+        ignores = pga.get_hidden_ids() + [game_id]
         pga.set_hidden_ids(ignores)
 
         # Update the GUI
         if not self.window.show_hidden_games:
-            self.window.game_store.remove_game(game.id)
+            self.window.game_store.remove_game(game_id)
 
     def on_unhide_game(self, _widget):
         """Removes a game from the list of hidden games"""
-        game = Game(self.window.view.selected_game.id)
+        game_id = self.window.view.selected_game.id
 
         # Remove the ID to unhide and save it
         ignores = pga.get_hidden_ids()
-        ignores.remove(game.id)
+        ignores.remove(game_id)
         pga.set_hidden_ids(ignores)
 
     @staticmethod
@@ -128,40 +136,43 @@ class GameActions:
         """Returns whether a game is on the list of hidden games"""
         return game.id in pga.get_hidden_ids()
 
-    def get_displayed_entries(self):
-        """Return a dictionary of actions that should be shown for a game"""
+    def has_manual_command(self):
+        """Return whether the game has a script to execute, this reads the
+        game's configuration"""
+        game = self.summary
+        return bool(game.is_installed and game.config and game.config.system_config.get("manual_command"))
+
+    def get_displayed_entries(self, read_config=True):
+        """Return a dictionary of actions that should be shown for a game.
+        Without read_config, the entries depending on the game's configuration
+        are hidden, so that it doesn't get loaded."""
+        game = self.summary
+        is_installed = game.is_installed
+        is_running = self.is_game_running
+        is_favorite = is_installed and game_in_favorite(self.game_id)
+        has_desktop_launcher = is_installed and xdgshortcuts.desktop_launcher_exists(game.slug, game.id)
+        has_menu_launcher = is_installed and xdgshortcuts.menu_launcher_exists(game.slug, game.id)
+        is_hidden = GameActions.is_game_hidden(game)
         return {
-            "add": not self.game.is_installed and not self.game.is_search_result,
-            "install": not self.game.is_installed,
-            "play": self.game.is_installed and not self.is_game_running,
-            "stop": self.is_game_running,
-            "show_logs": self.game.is_installed,
-            "configure": bool(self.game.is_installed),
-            "favorite": self.game.is_installed and bool(not game_in_favorite(self.game_id)),
-            "deletefavorite": self.game.is_installed and bool(game_in_favorite(self.game_id)),
-            "install_more": self.game.is_installed and not self.game.is_search_result,
-            "execute-script": bool(self.game.is_installed and self.game.runner.system_config.get("manual_command")),
-            "desktop-shortcut": (
-                self.game.is_installed
-                and not xdgshortcuts.desktop_launcher_exists(self.game.slug, self.game.id)
-            ),
-            "menu-shortcut": (
-                self.game.is_installed
-                and not xdgshortcuts.menu_launcher_exists(self.game.slug, self.game.id)
-            ),
-            "rm-desktop-shortcut": bool(
-                self.game.is_installed
-                and xdgshortcuts.desktop_launcher_exists(self.game.slug, self.game.id)
-            ),
-            "rm-menu-shortcut": bool(
-                self.game.is_installed
-                and xdgshortcuts.menu_launcher_exists(self.game.slug, self.game.id)
-            ),
-            "browse": self.game.is_installed and self.game.runner_name != "browser",
-            "remove": not self.game.is_search_result,
+            "add": not is_installed and not game.is_search_result,
+            "install": not is_installed,
+            "play": is_installed and not is_running,
+            "stop": is_running,
+            "show_logs": is_installed,
+            "configure": bool(is_installed),
+            "favorite": is_installed and not is_favorite,
+            "deletefavorite": bool(is_favorite),
+            "install_more": is_installed and not game.is_search_result,
+            "execute-script": read_config and self.has_manual_command(),
+            "desktop-shortcut": is_installed and not has_desktop_launcher,
+            "menu-shortcut": is_installed and not has_menu_launcher,
+            "rm-desktop-shortcut": bool(has_desktop_launcher),
+            "rm-menu-shortcut": bool(has_menu_launcher),
+            "browse": is_installed and game.runner_name != "browser",
+            "remove": not game.is_search_result,
             "view": True,
-            "hide": not GameActions.is_game_hidden(self.game),
-            "unhide": GameActions.is_game_hidden(self.game)
+            "hide": not is_hidden,
+            "unhide": is_hidden
         }
 
     def on_game_run(self, *_args):
@@ -202,7 +213,7 @@ class GameActions:
     def on_install_clicked(self, *_args):
         """Install a game"""
         # Install the currently selected game in the UI
-        self.application.show_window(InstallerWindow, parent=self.window, game_slug=self.game.slug)
+        self.application.show_window(InstallerWindow, parent=self.window, game_slug=self.summary.slug)
 
     def on_add_manually(self, _widget, *_args):
         """Callback that presents the Add game dialog"""
@@ -216,8 +227,9 @@ class GameActions:
         """Add to favorite Games list"""
         favorite = pga.get_category("favorite")
         if not favorite:
-            favorite = pga.add_category("favorite")
-        pga.add_game_to_category(self.game.id, favorite["id"])
+            pga.add_category("favorite")
+            favorite = pga.get_category("favorite")
+        pga.add_game_to_category(self.game_id, favorite["id"])
 
     def on_delete_favorite_game(self, _widget):
         """delete from favorites"""
@@ -247,24 +259,24 @@ class GameActions:
 
     def on_create_menu_shortcut(self, *_args):
         """Add the selected game to the system's Games menu."""
-        xdgshortcuts.create_launcher(self.game.slug, self.game.id, self.game.name, menu=True)
+        xdgshortcuts.create_launcher(self.summary.slug, self.game_id, self.summary.name, menu=True)
 
     def on_create_desktop_shortcut(self, *_args):
         """Create a desktop launcher for the selected game."""
-        xdgshortcuts.create_launcher(self.game.slug, self.game.id, self.game.name, desktop=True)
+        xdgshortcuts.create_launcher(self.summary.slug, self.game_id, self.summary.name, desktop=True)
 
     def on_remove_menu_shortcut(self, *_args):
         """Remove an XDG menu shortcut"""
-        xdgshortcuts.remove_launcher(self.game.slug, self.game.id, menu=True)
+        xdgshortcuts.remove_launcher(self.summary.slug, self.game_id, menu=True)
 
     def on_remove_desktop_shortcut(self, *_args):
         """Remove a .desktop shortcut"""
-        xdgshortcuts.remove_launcher(self.game.slug, self.game.id, desktop=True)
+        xdgshortcuts.remove_launcher(self.summary.slug, self.game_id, desktop=True)
 
     def on_view_game(self, _widget):
         """Callback to open a game on lutris.net"""
-        open_uri("https://lutris.net/games/%s" % self.game.slug)
+        open_uri("https://lutris.net/games/%s" % self.summary.slug)
 
     def on_remove_game(self, *_args):
         """Callback that present the uninstall dialog to the user"""
-        UninstallGameDialog(game_id=self.game.id, callback=self.window.remove_game_from_view, parent=self.window)
+        UninstallGameDialog(game_id=self.game_id, callback=self.window.remove_game_from_view, parent=self.window)
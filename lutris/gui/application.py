@@ -37,9 +37,10 @@ from lutris.gui.dialogs import ErrorDialog, InstallOrPlayDialog
 from lutris.gui.dialogs.issue import IssueReportWindow
 from lutris.gui.installerwindow import InstallerWindow
 from lutris.gui.widgets.status_icon import LutrisStatusIcon
+from lutris.installer import download_cache
 from lutris.migrations import migrate
 from lutris.startup import init_lutris, run_all_checks
-from lutris.util import datapath, log
+from lutris.util import datapath, log, profiler
 from lutris.util.http import HTTPError, Request
 from lutris.util.jobs import AsyncCall
 from lutris.util.log import logger
@@ -57,7 +58,6 @@ class Application(Gtk.Application):
             application_id="net.lutris.Lutris",
             flags=Gio.ApplicationFlags.HANDLES_COMMAND_LINE,
         )
-        init_lutris()
 
         GLib.set_application_name(_("Lutris"))
         self.running_games = Gio.ListStore.new(Game)
@@ -66,6 +66,7 @@ class Application(Gtk.Application):
         self.tray = None
         self.css_provider = Gtk.CssProvider.new()
         self.run_in_background = False
+        self.is_initialized = False
 
         if os.geteuid() == 0:
             ErrorDialog(_("Running Lutris as root is not recommended and may cause unexpected issues"))
@@ -179,6 +180,22 @@ class Application(Gtk.Application):
             _("Reinstall game"),
             None,
         )
+        self.add_main_option(
+            "cache-gc",
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            _("Remove the least recently used files from the installer cache"),
+            None,
+        )
+        self.add_main_option(
+            "profile",
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            _("Print the time spent in each startup phase on exit"),
+            None,
+        )
         self.add_main_option("submit-issue", 0, GLib.OptionFlags.NONE, GLib.OptionArg.NONE, _("Submit an issue"), None)
         self.add_main_option(
             GLib.OPTION_REMAINING,
@@ -251,6 +268,7 @@ class Application(Gtk.Application):
         game.load_config()
         game.write_script(script_path)
 
+    @profiler.phase("do_command_line")
     def do_command_line(self, command_line):  # noqa: C901  # pylint: disable=arguments-differ
         # pylint: disable=too-many-locals,too-many-return-statements,too-many-branches
         # pylint: disable=too-many-statements
@@ -289,16 +307,21 @@ class Application(Gtk.Application):
             logger.setLevel(logging.NOTSET)
             return 0
 
-        logger.info("Running Lutris %s", settings.VERSION)
-        migrate()
-        run_all_checks()
-        AsyncCall(init_dxvk_versions, None)
+        # Prune the installer store and exit
+        if options.contains("cache-gc"):
+            freed = download_cache.collect_garbage()
+            self._print(command_line, _("Freed {size:0.2f}MB from the installer cache").format(
+                size=float(freed) / (1024 * 1024)))
+            return 0
+
+        # Read only queries, these don't need the startup checks and never
+        # write to the database
 
         # List game
         if options.contains("list-games"):
-            game_list = pga.get_games()
-            if options.contains("installed"):
-                game_list = [game for game in game_list if game["installed"]]
+            game_list = []
+            if os.path.exists(pga.PGA_DB):
+                game_list = pga.get_games(filter_installed=options.contains("installed"), read_only=True)
             if options.contains("json"):
                 self.print_game_json(command_line, game_list)
             else:
@@ -313,6 +336,16 @@ class Application(Gtk.Application):
             self.print_steam_folders(command_line)
             return 0
 
+        logger.info("Running Lutris %s", settings.VERSION)
+        if not self.is_initialized:
+            init_lutris()
+            self.is_initialized = True
+        with profiler.phase("migrate"):
+            migrate()
+        with profiler.phase("run_all_checks"):
+            run_all_checks()
+        AsyncCall(init_dxvk_versions, None)
+
         # Execute command in Lutris context
         if options.contains("exec"):
             command = options.lookup_value("exec").get_string()
@@ -552,6 +585,7 @@ class Application(Gtk.Application):
 
     def do_shutdown(self):  # pylint: disable=arguments-differ
         logger.info("Shutting down Lutris")
+        settings.sio.flush()
         Gtk.Application.do_shutdown(self)
         if self.window:
             self.window.destroy()
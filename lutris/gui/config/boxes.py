@@ -80,8 +80,9 @@ class ConfigBox(VBox):
                     continue
             option_key = option["option"]
             value = self.config.get(option_key)
-            default = option.get("default")
 
+            if callable(option.get("default")):
+                option["default"] = option["default"]()
             if callable(option.get("choices")) and option["type"] != "choice_with_search":
                 option["choices"] = option["choices"]()
             if callable(option.get("condition")):
@@ -61,8 +61,8 @@ class RunnersDialog(GtkBuilderDialog):
 
     def get_runner_hbox(self, runner_name):
         # Get runner details
-        runner = runners.import_runner(runner_name)()
-        platform_list = sorted(list(set(runner.platforms)))
+        runner_info = runners.get_runner_info(runner_name)
+        platform_list = sorted(list(set(runner_info.platforms)))
         if len(platform_list) > 4:
             platform = _("Multiple platforms")
         else:
@@ -79,25 +79,25 @@ class RunnersDialog(GtkBuilderDialog):
 
         # Label
         runner_name = builder.get_object('runner_name')
-        runner_name.set_text(runner.human_name)
+        runner_name.set_text(runner_info.human_name)
         runner_description = builder.get_object('runner_description')
-        runner_description.set_text(runner.description)
+        runner_description.set_text(runner_info.description)
         runner_platform = builder.get_object('runner_platform')
         runner_platform.set_text(platform)
         runner_label = builder.get_object('runner_label')
-        if not runner.is_installed():
+        if not runner_info.is_installed():
             runner_label.set_sensitive(False)
 
         # Buttons
         self.versions_button = builder.get_object('manage_versions')
-        self.versions_button.connect("clicked", self.on_versions_clicked, runner, runner_label)
+        self.versions_button.connect("clicked", self.on_versions_clicked, runner_info, runner_label)
         self.install_button = builder.get_object('install_runner')
-        self.install_button.connect("clicked", self.on_install_clicked, runner, runner_label)
+        self.install_button.connect("clicked", self.on_install_clicked, runner_info, runner_label)
         self.remove_button = builder.get_object('remove_runner')
-        self.remove_button.connect("clicked", self.on_remove_clicked, runner, runner_label)
+        self.remove_button.connect("clicked", self.on_remove_clicked, runner_info, runner_label)
         self.configure_button = builder.get_object('configure_runner')
-        self.configure_button.connect("clicked", self.on_configure_clicked, runner, runner_label)
-        self.set_button_display(runner)
+        self.configure_button.connect("clicked", self.on_configure_clicked, runner_info, runner_label)
+        self.set_button_display(runner_info)
 
         return hbox
 
@@ -106,11 +106,11 @@ class RunnersDialog(GtkBuilderDialog):
             hbox = self.get_runner_hbox(runner_name)
             self.runner_listbox.add(hbox)
 
-    def set_button_display(self, runner):
-        if runner.multiple_versions:
+    def set_button_display(self, runner_info):
+        if runner_info.multiple_versions:
             self.versions_button.show()
             self.install_button.hide()
-            if runner.can_uninstall():
+            if runner_info.runner.can_uninstall():
                 self.remove_button.show()
             else:
                 self.remove_button.hide()
@@ -119,22 +119,23 @@ class RunnersDialog(GtkBuilderDialog):
             self.remove_button.hide()
             self.install_button.show()
 
-        if runner.is_installed():
+        if runner_info.is_installed():
             self.install_button.hide()
-            if runner.can_uninstall():
+            if runner_info.runner.can_uninstall():
                 self.remove_button.show()
             else:
                 self.remove_button.hide()
 
         self.configure_button.show()
 
-    def on_versions_clicked(self, widget, runner, runner_label):
-        dlg_title = _("Manage %s versions") % runner.name
-        versions_dialog = RunnerInstallDialog(dlg_title, self.dialog, runner.name)
-        versions_dialog.connect("destroy", self.set_install_state, runner, runner_label)
+    def on_versions_clicked(self, widget, runner_info, runner_label):
+        dlg_title = _("Manage %s versions") % runner_info.name
+        versions_dialog = RunnerInstallDialog(dlg_title, self.dialog, runner_info.name)
+        versions_dialog.connect("destroy", self.set_install_state, runner_info, runner_label)
 
-    def on_install_clicked(self, widget, runner, runner_label):
+    def on_install_clicked(self, widget, runner_info, runner_label):
         """Install a runner."""
+        runner = runner_info.runner_class()
         if runner.depends_on:
             dependency = runner.depends_on()
             dependency.install(downloader=simple_downloader)
@@ -145,16 +146,17 @@ class RunnersDialog(GtkBuilderDialog):
             runners.NonInstallableRunnerError,
         ) as ex:
             ErrorDialog(ex.message, parent=self)
-        if runner.is_installed():
+        if runner_info.is_installed():
             self.emit("runner-installed")
             self.refresh_button.emit("clicked")
 
-    def on_configure_clicked(self, widget, runner, runner_label):
-        config_dialog = RunnerConfigDialog(runner, parent=self.dialog)
-        config_dialog.connect("destroy", self.set_install_state, runner, runner_label)
+    def on_configure_clicked(self, widget, runner_info, runner_label):
+        config_dialog = RunnerConfigDialog(runner_info.runner_class(), parent=self.dialog)
+        config_dialog.connect("destroy", self.set_install_state, runner_info, runner_label)
 
-    def on_remove_clicked(self, widget, runner, runner_label):
-        if not runner.is_installed():
+    def on_remove_clicked(self, widget, runner_info, runner_label):
+        runner = runner_info.runner_class()
+        if not runner_info.is_installed():
             logger.warning("Runner %s is not installed", runner)
             return
 
@@ -209,8 +211,8 @@ class RunnersDialog(GtkBuilderDialog):
     def on_close_clicked(self, _widget):
         self.destroy()
 
-    def set_install_state(self, _widget, runner, runner_label):
-        if runner.is_installed():
+    def set_install_state(self, _widget, runner_info, runner_label):
+        if runner_info.is_installed():
             runner_label.set_sensitive(True)
             self.emit("runner-installed")
         else:
@@ -48,6 +48,7 @@ class InstallerWindow(BaseApplicationWindow):  # pylint: disable=too-many-public
 
         self.log_buffer = None
         self.log_textview = None
+        self.extract_progressbar = None
 
         self.title_label = InstallerLabel()
         self.title_label.set_selectable(False)
@@ -488,6 +489,7 @@ class InstallerWindow(BaseApplicationWindow):  # pylint: disable=too-many-public
         """Cleanup before displaying the next stage."""
         for child_widget in self.widget_box.get_children():
             child_widget.destroy()
+        self.extract_progressbar = None
 
     def set_status(self, text):
         """Display a short status text."""
@@ -508,6 +510,36 @@ class InstallerWindow(BaseApplicationWindow):  # pylint: disable=too-many-public
         spinner.show()
         spinner.start()
 
+    def show_extract_progress(self):
+        """Display a progress bar for an archive extraction."""
+        self.hide_extract_progress()
+        self.extract_progressbar = Gtk.ProgressBar(show_text=True)
+        self.extract_progressbar.set_margin_left(18)
+        self.extract_progressbar.set_margin_right(18)
+        self.widget_box.pack_start(self.extract_progressbar, False, False, 18)
+        self.extract_progressbar.show()
+
+    def hide_extract_progress(self):
+        """Remove the extraction progress bar."""
+        if self.extract_progressbar:
+            self.extract_progressbar.destroy()
+            self.extract_progressbar = None
+
+    def set_extract_progress(self, bytes_done, bytes_total, files_done):
+        """Update the extraction progress bar."""
+        if not self.extract_progressbar:
+            return
+        if bytes_total:
+            self.extract_progressbar.set_fraction(min(bytes_done / bytes_total, 1))
+        megabytes = 1024 * 1024
+        self.extract_progressbar.set_text(
+            _("{done:0.2f} / {total:0.2f}MB, {files} files extracted").format(
+                done=float(bytes_done) / megabytes,
+                total=float(bytes_total) / megabytes,
+                files=files_done,
+            )
+        )
+
     def attach_logger(self, command):
         """Creates a TextBuffer and attach it to a command"""
         self.log_buffer = Gtk.TextBuffer()
@@ -29,7 +29,7 @@ from lutris.gui.widgets.utils import IMAGE_SIZES, open_uri
 from lutris.runtime import RuntimeUpdater
 from lutris.services import get_services_synced_at_startup, steam
 from lutris.sync import sync_from_remote
-from lutris.util import datapath, http
+from lutris.util import datapath, http, profiler
 from lutris.util.jobs import AsyncCall
 from lutris.util.log import logger
 
@@ -68,6 +68,7 @@ class LutrisWindow(Gtk.ApplicationWindow):  # pylint: disable=too-many-public-me
     viewtype_icon = GtkTemplate.Child()
     website_search_toggle = GtkTemplate.Child()
 
+    @profiler.phase("LutrisWindow.__init__")
     def __init__(self, application, **kwargs):
         # pylint: disable=too-many-statements
         # TODO: refactor
@@ -278,23 +279,23 @@ class LutrisWindow(Gtk.ApplicationWindow):  # pylint: disable=too-many-public-me
 
     def on_hide_game(self, _widget):
         """Add a game to the list of hidden games"""
-        game = Game(self.view.selected_game)
+        game_id = self.view.selected_game.id
 
         # Append the new hidden ID and save it
-        ignores = pga.get_hidden_ids() + [game.id]
+        ignores = pga.get_hidden_ids() + [game_id]
         pga.set_hidden_ids(ignores)
 
         # Update the GUI
         if not self.show_hidden_games:
-            self.view.remove_game(game.id)
+            self.view.remove_game(game_id)
 
     def on_unhide_game(self, _widget):
         """Removes a game from the list of hidden games"""
-        game = Game(self.view.selected_game)
+        game_id = self.view.selected_game.id
 
         # Remove the ID to unhide and save it
         ignores = pga.get_hidden_ids()
-        ignores.remove(game.id)
+        ignores.remove(game_id)
         pga.set_hidden_ids(ignores)
 
     def hidden_state_change(self, action, value):
@@ -567,7 +568,14 @@ class LutrisWindow(Gtk.ApplicationWindow):  # pylint: disable=too-many-public-me
         self.sync_label.set_label(_("Synchronizing…"))
         self.sync_spinner.props.active = True
         self.sync_button.set_sensitive(False)
-        AsyncCall(sync_from_remote, update_gui)
+        AsyncCall(sync_from_remote, update_gui, self.on_sync_media_loaded)
+
+    def on_sync_media_loaded(self, media):
+        """Refresh the icons downloaded by the library sync, called from a worker thread"""
+        def emit_icons_loaded():
+            for slug, media_type in media:
+                self.game_store.emit("icon-loaded", slug, media_type)
+        GLib.idle_add(emit_icons_loaded)
 
     def open_sync_dialog(self):
         """Opens the service sync dialog"""
@@ -602,7 +610,7 @@ class LutrisWindow(Gtk.ApplicationWindow):  # pylint: disable=too-many-public-me
     def on_game_activated(self, _widget, game):
         self.game_selection_changed(None, game)
         if game.is_installed:
-            self.application.launch(game)
+            self.application.launch(self.game_actions.game)
         else:
             self.application.show_window(InstallerWindow, parent=self, game_slug=game.slug)
 
@@ -3,15 +3,16 @@ from gi.repository import Gdk, GObject
 
 # Lutris Modules
 from lutris import pga
-from lutris.game import Game
-from lutris.gui.views import COL_ID, COL_INSTALLED, COL_NAME, COL_SLUG
+from lutris.gui.views import COL_ID, COL_SLUG
+from lutris.gui.views.game_summary import GameSummary
 from lutris.util.log import logger
 
 
 class GameView:
     __gsignals__ = {
-        "game-selected": (GObject.SIGNAL_RUN_FIRST, None, (Game, )),
-        "game-activated": (GObject.SIGNAL_RUN_FIRST, None, (Game, )),
+        # Both signals carry a GameSummary
+        "game-selected": (GObject.SIGNAL_RUN_FIRST, None, (object, )),
+        "game-activated": (GObject.SIGNAL_RUN_FIRST, None, (object, )),
         "remove-game": (GObject.SIGNAL_RUN_FIRST, None, ()),
     }
     selected_game = None
@@ -37,22 +38,14 @@ class GameView:
             logger.error("Failed to read path: %s", ex)
 
     def get_selected_game(self, selected_item):
-        selected_game = None
+        """Return a GameSummary of the game in the selected row"""
         model = self.get_model()
-        game_id = model.get_value(selected_item, COL_ID)
-        game_slug = model.get_value(selected_item, COL_SLUG)
-        pga_game = pga.get_games_by_slug(game_slug)
-        if game_id > 0:
-            selected_game = Game(game_id)
-        elif pga_game:
-            selected_game = Game(pga_game[0]["id"])
-        else:
-            selected_game = Game(game_id)
-            selected_game.id = game_id
-            selected_game.slug = game_slug
-            selected_game.name = model.get_value(selected_item, COL_NAME)
-            selected_game.installed = model.get_value(selected_item, COL_INSTALLED)
-        return selected_game
+        if model.get_value(selected_item, COL_ID) <= 0:
+            # Search results refer to the local game with the same slug, if any
+            pga_game = pga.get_games_by_slug(model.get_value(selected_item, COL_SLUG))
+            if pga_game:
+                return GameSummary.from_pga(pga_game[0])
+        return GameSummary.from_row(model, selected_item)
 
     def select(self):
         """Selects the object pointed by current_path"""
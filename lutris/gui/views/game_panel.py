@@ -4,7 +4,7 @@ from datetime import datetime
 from gettext import gettext as _
 
 # Third Party Libraries
-from gi.repository import GObject, Gtk, Pango
+from gi.repository import GLib, GObject, Gtk, Pango
 
 # Lutris Modules
 from lutris import runners
@@ -15,19 +15,64 @@ from lutris.util.strings import gtk_safe
 
 class GamePanel(GenericPanel):
 
-    """Panel allowing users to interact with a game"""
+    """Panel allowing users to interact with a game
+
+    The panel is drawn from the game summary of the GameActions. The game's
+    configuration and runner are only loaded once the selection settles on
+    the game, to show the entries that depend on them.
+    """
 
     __gsignals__ = {
         "panel-closed": (GObject.SIGNAL_RUN_FIRST, None, ()),
     }
 
+    buttons_x_offset = 28
+    extra_button_start = 540  # Y position for runner actions
+    runner_entries_delay = 250  # Milliseconds the selection must stay on the game before loading its config
+
     def __init__(self, game_actions):
         self.game_actions = game_actions
-        self.game = game_actions.game
+        self.game = game_actions.summary
+        self.running_game = None
+        self.runner_entries_timer = None
+        self.extra_button_count = 0
         super().__init__()
-        self.game.connect("game-start", self.on_game_start)
-        self.game.connect("game-started", self.on_game_started)
-        self.game.connect("game-stopped", self.on_game_state_changed)
+        self.running_games = game_actions.application.running_games
+        self.running_games_handler = self.running_games.connect("items-changed", self.on_running_games_changed)
+        self.connect("destroy", self.on_destroy)
+        self.watch_running_game()
+
+    def watch_running_game(self):
+        """Follow the state of the game once it is launched"""
+        game = self.game_actions.application.get_game_by_id(self.game.id)
+        if not game or game is self.running_game:
+            return
+        self.unwatch_running_game()
+        self.running_game = game
+        game.connect("game-start", self.on_game_start)
+        game.connect("game-launch-status", self.on_game_launch_status)
+        game.connect("game-started", self.on_game_started)
+        game.connect("game-stopped", self.on_game_state_changed)
+
+    def unwatch_running_game(self):
+        if not self.running_game:
+            return
+        for callback in (
+            self.on_game_start, self.on_game_launch_status, self.on_game_started, self.on_game_state_changed
+        ):
+            self.running_game.disconnect_by_func(callback)
+        self.running_game = None
+
+    def on_running_games_changed(self, _model, _position, _removed, added):
+        if added:
+            self.watch_running_game()
+
+    def on_destroy(self, _widget):
+        self.running_games.disconnect(self.running_games_handler)
+        if self.runner_entries_timer:
+            GLib.source_remove(self.runner_entries_timer)
+            self.runner_entries_timer = None
+        self.unwatch_running_game()
 
     def place_content(self):
         self.put(self.get_close_button(), 276, 16)
@@ -45,6 +90,9 @@ class GamePanel(GenericPanel):
 
     def refresh(self):
         """Redraw the panel"""
+        if self.runner_entries_timer:
+            GLib.source_remove(self.runner_entries_timer)
+            self.runner_entries_timer = None
         for child in self.get_children():
             child.destroy()
         self.place_content()
@@ -82,7 +130,7 @@ class GamePanel(GenericPanel):
     def get_runner_label(self):
         """Return the label containing the runner info"""
         runner_icon = Gtk.Image.new_from_icon_name(
-            self.game.runner.name.lower().replace(" ", "") + "-symbolic",
+            self.game.runner_name.lower().replace(" ", "") + "-symbolic",
             Gtk.IconSize.MENU,
         )
         runner_icon.show()
@@ -119,9 +167,24 @@ class GamePanel(GenericPanel):
             return None
         return runner.context_menu_entries
 
+    def place_runner_buttons(self):
+        """Add the actions which need the game's configuration and runner to be loaded"""
+        self.runner_entries_timer = None
+        if self.game_actions.has_manual_command():
+            self.buttons["execute-script"].show()
+        for entry in self.get_runner_entries(self.game) or []:
+            name, label, callback = entry
+            button = get_link_button(label)
+            button.show()
+            button.connect("clicked", callback)
+            self.buttons[name] = button
+            self.put(button, self.buttons_x_offset, self.extra_button_start + self.extra_button_count * 40)
+            self.extra_button_count += 1
+        return False
+
     def get_buttons(self):
         """Return a dictionary of buttons to use in the panel"""
-        displayed = self.game_actions.get_displayed_entries()
+        displayed = self.game_actions.get_displayed_entries(read_config=False)
         icon_map = {
             "configure": "preferences-system-symbolic",
             "browse": "system-file-manager-symbolic",
@@ -159,12 +222,8 @@ class GamePanel(GenericPanel):
             button.connect("clicked", callback)
 
         if self.game.runner_name and self.game.is_installed:
-            for entry in self.get_runner_entries(self.game):
-                name, label, callback = entry
-                button = get_link_button(label)
-                button.show()
-                button.connect("clicked", callback)
-                buttons[name] = button
+            # Loading the configuration and runner is slow, wait for the selection to settle
+            self.runner_entries_timer = GLib.timeout_add(self.runner_entries_delay, self.place_runner_buttons)
         return buttons
 
     def place_buttons(self, base_height):  # pylint: disable=too-many-branches
@@ -174,9 +233,8 @@ class GamePanel(GenericPanel):
         icon_width = 32
         icon_start = 84
         icons_y_offset = 60
-        buttons_x_offset = 28
-        extra_button_start = 540  # Y position for runner actions
-        extra_button_index = 0
+        buttons_x_offset = self.buttons_x_offset
+        self.extra_button_count = 0
         for action_id, button in self.buttons.items():
             position = None
             if action_id in ("play", "stop", "install"):
@@ -216,9 +274,9 @@ class GamePanel(GenericPanel):
             if not position:
                 position = (
                     buttons_x_offset,
-                    extra_button_start + extra_button_index * 40,
+                    self.extra_button_start + self.extra_button_count * 40,
                 )
-                extra_button_index += 1
+                self.extra_button_count += 1
 
             self.put(button, position[0], position[1])
 
@@ -235,6 +293,10 @@ class GamePanel(GenericPanel):
         self.buttons["play"].set_label(_("Launching..."))
         self.buttons["play"].set_sensitive(False)
 
+    def on_game_launch_status(self, _widget, message):
+        """Callback for the `game-launch-status` signal"""
+        self.buttons["play"].set_label(message)
+
     def on_game_started(self, _widget):
         """Callback for the `game-started` signal"""
         self.buttons["stop"].show()
@@ -244,6 +306,9 @@ class GamePanel(GenericPanel):
 
     def on_game_state_changed(self, _widget, _game_id=None):
         """Generic callback to trigger a refresh"""
+        if self.running_game:
+            # The game was loaded to run, its playtime is more recent than the summary's
+            self.game = self.running_game
         self.refresh()
 
     def on_close(self, _widget):
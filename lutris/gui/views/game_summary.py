@@ -0,0 +1,91 @@
+"""Lightweight game representation for the game panel"""
+# Standard Library
+import html
+
+# Lutris Modules
+from lutris import pga
+from lutris.config import LutrisConfig
+from lutris.game import Game
+from lutris.util import strings
+
+from . import COL_ID, COL_INSTALLED, COL_LASTPLAYED, COL_NAME, COL_PLATFORM, COL_PLAYTIME, COL_RUNNER, COL_SLUG
+
+
+class GameSummary:
+
+    """Read-only summary of a game, with what is needed to show it in the game
+    panel. Unlike Game, it doesn't load the game's configuration or runner,
+    use load_game to get the full game when an action needs it."""
+
+    def __init__(self, game_id, slug, name, runner_name="", platform="", lastplayed=0, is_installed=False,
+                 playtime=0.0):
+        self.id = game_id  # pylint: disable=invalid-name
+        self.slug = slug
+        self.name = name
+        self.runner_name = runner_name or ""
+        self.platform = platform or ""
+        self.lastplayed = lastplayed or 0
+        self.is_installed = bool(is_installed)
+        self.playtime = playtime or 0.0
+        self._config = None
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return "<GameSummary id=%s slug=%s>" % (self.id, self.slug)
+
+    @classmethod
+    def from_row(cls, model, tree_iter):
+        """Return the summary of the game in a GameStore row"""
+        return cls(
+            model.get_value(tree_iter, COL_ID),
+            html.unescape(model.get_value(tree_iter, COL_SLUG)),
+            html.unescape(model.get_value(tree_iter, COL_NAME)),
+            runner_name=html.unescape(model.get_value(tree_iter, COL_RUNNER) or ""),
+            platform=model.get_value(tree_iter, COL_PLATFORM),
+            lastplayed=model.get_value(tree_iter, COL_LASTPLAYED),
+            is_installed=model.get_value(tree_iter, COL_INSTALLED),
+            playtime=model.get_value(tree_iter, COL_PLAYTIME),
+        )
+
+    @classmethod
+    def from_pga(cls, pga_game):
+        """Return the summary of a game from its database entry"""
+        return cls(
+            pga_game["id"],
+            pga_game["slug"],
+            pga_game["name"],
+            runner_name=pga_game["runner"],
+            platform=pga_game["platform"],
+            lastplayed=pga_game["lastplayed"],
+            is_installed=pga_game["installed"] and pga_game["runner"],
+            playtime=pga_game["playtime"],
+        )
+
+    @property
+    def formatted_playtime(self):
+        """Return a human readable formatted play time"""
+        return strings.get_formatted_playtime(self.playtime)
+
+    @property
+    def is_search_result(self):
+        """Return whether or not the game is a remote game from search results."""
+        return self.id < 0
+
+    @property
+    def config(self):
+        """Return the configuration of an installed game, read on first access"""
+        if self._config is None and self.is_installed and not self.is_search_result:
+            game_config_id = pga.get_game_by_field(self.id, "id").get("configpath")
+            if game_config_id:
+                self._config = LutrisConfig(runner_slug=self.runner_name, game_config_id=game_config_id)
+        return self._config
+
+    def load_game(self):
+        """Return the full Game"""
+        game = Game(self.id)
+        if self.is_search_result:
+            game.slug = self.slug
+            game.name = self.name
+        return game
@@ -11,7 +11,7 @@ from gi.repository.GdkPixbuf import Pixbuf
 from lutris import api, pga
 from lutris.gui.views.pga_game import PgaGame
 from lutris.gui.widgets.utils import get_pixbuf_for_game
-from lutris.util import system
+from lutris.util import profiler, system
 from lutris.util.jobs import AsyncCall
 from lutris.util.log import logger
 from lutris.util.resources import download_media, get_icon_path, update_desktop_icons
@@ -80,6 +80,7 @@ class GameStore(GObject.Object):
         "playtime_text": COL_PLAYTIME_TEXT,
     }
 
+    @profiler.phase("GameStore.__init__")
     def __init__(
         self,
         games,
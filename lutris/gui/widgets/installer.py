@@ -9,6 +9,7 @@ from lutris.gui.widgets.common import FileChooserEntry
 from lutris.gui.widgets.download_progress import DownloadProgressBox
 from lutris.installer.steam_installer import SteamInstaller
 from lutris.util import system
+from lutris.util.jobs import AsyncCall
 from lutris.util.log import logger
 from lutris.util.strings import add_url_tags, gtk_safe
 
@@ -366,11 +367,26 @@ class InstallerFileBox(Gtk.VBox):
             self.emit("file-available")
             self.cache_file()
             return
+        if self.provider == "download" and self.installer_file.uses_download_cache():
+            AsyncCall(self.installer_file.fetch_from_download_cache, self.on_download_cache_checked)
+            return
+        self.start_provider()
+
+    def start_provider(self):
+        """Fetch the file from its provider"""
         if self.start_func:
             self.start_func()
         else:
             logger.info("No start function provided, this file can't be provided")
 
+    def on_download_cache_checked(self, found, error):
+        """Skip the download if the file was found in the installer store"""
+        if error or not found:
+            self.start_provider()
+            return
+        self.emit("file-available")
+        self.cache_file()
+
     def cache_file(self):
         """Copy file to the PGA cache"""
         if self.cache_to_pga:
@@ -383,6 +399,18 @@ class InstallerFileBox(Gtk.VBox):
         """Action called on a completed download."""
         if isinstance(widget, SteamInstaller):
             self.installer_file.dest_file = widget.get_steam_data_path()
+        elif isinstance(widget, DownloadProgressBox) and self.installer_file.uses_download_cache():
+            AsyncCall(
+                self.installer_file.save_to_download_cache,
+                self.on_download_cache_saved,
+                etag=widget.downloader.etag
+            )
+            return
+        self.emit("file-available")
+        self.cache_file()
+
+    def on_download_cache_saved(self, _result, _error):
+        """Action called once a downloaded file has been added to the installer store."""
         self.emit("file-available")
         self.cache_file()
 
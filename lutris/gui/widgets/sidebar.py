@@ -149,8 +149,8 @@ class SidebarListBox(Gtk.ListBox):
         for runner_name in self.runners:
             icon_name = runner_name.lower().replace(" ", "") + "-symbolic"
             icon = Gtk.Image.new_from_icon_name(icon_name, Gtk.IconSize.MENU)
-            runner = runners.import_runner(runner_name)()
-            self.add(SidebarRow(runner_name, "runner", runner.human_name, icon, application=self.application))
+            human_name = runners.get_runner_info(runner_name).human_name
+            self.add(SidebarRow(runner_name, "runner", human_name, icon, application=self.application))
 
         self.add(SidebarRow(None, "platform", _("All"), None))
         for platform in self.platforms:
@@ -183,7 +183,7 @@ class SidebarListBox(Gtk.ListBox):
             row.set_header(SidebarHeader(_("Platforms")))
 
     def update(self, *_args):
-        self.installed_runners = [runner.name for runner in runners.get_installed()]
+        self.installed_runners = runners.get_installed_names()
         self.active_platforms = pga.get_used_platforms()
         self.invalidate_filter()
         return True
@@ -4,6 +4,7 @@ import glob
 import json
 import multiprocessing
 import os
+import queue
 import shlex
 import shutil
 import stat
@@ -24,6 +25,30 @@ from lutris.util.log import logger
 from lutris.util.wine.wine import WINE_DEFAULT_ARCH, get_wine_version_exe
 
 
+_PROGRESS_QUEUE = None
+
+
+def _set_progress_queue(progress_queue):
+    """Initializer for worker processes reporting their progress"""
+    global _PROGRESS_QUEUE  # pylint: disable=global-statement
+    _PROGRESS_QUEUE = progress_queue
+
+
+def _queue_progress(*args):
+    """Forward progress from a worker process to its parent"""
+    _PROGRESS_QUEUE.put(args)
+
+
+def _get_latest_progress(progress_queue, progress=None):
+    """Return the last progress in the queue, only the latest progress matters
+    and the ones that piled up are skipped"""
+    try:
+        while True:
+            progress = progress_queue.get_nowait()
+    except queue.Empty:
+        return progress
+
+
 class CommandsMixin:
 
     """The directives for the `installer:` part of the install script."""
@@ -169,13 +194,30 @@ class CommandsMixin:
         else:
             dest_path = self.target_path
         for filename in filenames:
+            if self.cancelled:
+                return
             msg = _("Extracting %s") % os.path.basename(filename)
             logger.debug(msg)
             GLib.idle_add(self.parent.set_status, msg)
             merge_single = "nomerge" not in data
             extractor = data.get("format")
             logger.debug("extracting file %s to %s", filename, dest_path)
-            self._killable_process(extract.extract_archive, filename, dest_path, merge_single, extractor)
+            GLib.idle_add(self.parent.show_extract_progress)
+            self._killable_process_with_progress(
+                self._on_extract_progress,
+                extract.extract_archive,
+                filename,
+                dest_path,
+                merge_single,
+                extractor,
+            )
+            if self.cancelled:
+                # The installer is being reverted, don't touch the window or extract anything else
+                return
+            GLib.idle_add(self.parent.hide_extract_progress)
+
+    def _on_extract_progress(self, bytes_done, bytes_total, files_done):
+        GLib.idle_add(self.parent.set_extract_progress, bytes_done, bytes_total, files_done)
 
     def input_menu(self, data):
         """Display an input request as a dropdown menu with options."""
@@ -261,7 +303,7 @@ class CommandsMixin:
             # can be used as executable. Skip copying if the source is the same
             # as destination.
             if os.path.dirname(src) != dst:
-                self._killable_process(shutil.copy, src, dst)
+                self._killable_process(system.copy_file, src, dst)
             if params["src"] in self.game_files.keys():
                 self.game_files[params["src"]] = os.path.join(dst, os.path.basename(src))
             return
@@ -291,7 +333,7 @@ class CommandsMixin:
                 return
         try:
             if self._is_cached_file(src):
-                action = shutil.copy
+                action = system.copy_file
             else:
                 action = shutil.move
             self._killable_process(action, src, dst)
@@ -516,3 +558,39 @@ class CommandsMixin:
         result = result_obj.get()  # Wait process end & reraise exceptions
         self.abort_current_task = None
         return result
+
+    def _killable_process_with_progress(self, on_progress, func, *args, **kwargs):
+        """Run function `func` in a separate, killable process.
+        `func` receives a `callback` argument and the values it is called with
+        are passed to `on_progress`, in the current thread.
+        """
+        progress_queue = multiprocessing.Queue()
+        process = multiprocessing.Pool(1, initializer=_set_progress_queue, initargs=(progress_queue, ))
+        kwargs["callback"] = _queue_progress
+        completed = False
+        try:
+            result_obj = process.apply_async(func, args, kwargs)
+            self.abort_current_task = process.terminate
+            while not result_obj.ready():
+                if self.cancelled:
+                    return None
+                try:
+                    progress = progress_queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                on_progress(*_get_latest_progress(progress_queue, progress))
+            result = result_obj.get()  # Reraise exceptions
+            completed = True
+        finally:
+            self.abort_current_task = None
+            if completed:
+                progress = _get_latest_progress(progress_queue)
+                process.close()
+                process.join()
+            else:
+                process.terminate()
+        # Deliver the progress reported right before the function returned
+        progress = _get_latest_progress(progress_queue, progress)
+        if progress:
+            on_progress(*progress)
+        return result
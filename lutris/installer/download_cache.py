@@ -0,0 +1,158 @@
+"""Content addressed store for installer files
+
+Downloaded files are stored once, keyed by the checksum provided by the
+installer script or by their URL and ETag, and shared between games with
+reflinks when the filesystem supports them. Hardlinks are never used: the
+store and the games would share one inode, so any change made to a game's
+copy would alter the stored file.
+"""
+# Standard Library
+import hashlib
+import json
+import os
+
+# Lutris Modules
+from lutris import settings
+from lutris.util import system
+from lutris.util.http import HTTPError, Request
+from lutris.util.log import logger
+
+STORE_PATH = os.path.join(settings.CACHE_DIR, "installer-store")
+DEFAULT_MAX_SIZE = 10 * 1024  # Megabytes
+
+
+def is_enabled():
+    """Return whether downloaded files should go through the store"""
+    return settings.read_setting("installer_store", default="True") != "False"
+
+
+def get_max_size():
+    """Return the maximum size of the store in bytes"""
+    try:
+        max_size = int(settings.read_setting("installer_store_max_size", default=DEFAULT_MAX_SIZE))
+    except ValueError:
+        max_size = DEFAULT_MAX_SIZE
+    return max_size * 1024 * 1024
+
+
+def get_checksum_key(checksum):
+    """Return the store key for a checksum in the type:hash format"""
+    try:
+        hash_type, value = checksum.split(":", 1)
+    except ValueError:
+        return None
+    return "%s-%s" % (hash_type.lower(), value.lower())
+
+
+def get_url_key(url, etag):
+    """Return the store key for a version of the file at url"""
+    return "url-" + hashlib.sha256(("%s\n%s" % (url, etag)).encode()).hexdigest()
+
+
+def _get_url_meta_path(url):
+    return os.path.join(STORE_PATH, "urls", hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+
+def _get_object_path(key):
+    return os.path.join(STORE_PATH, "objects", key)
+
+
+def _copy_file(source, destination):
+    """Copy source to destination, replacing it, with a reflink if possible"""
+    if os.path.lexists(destination):
+        os.remove(destination)
+    system.copy_file(source, destination)
+
+
+def get_remote_etag(url):
+    """Return the current ETag of a remote file"""
+    try:
+        request = Request(url, timeout=10).head()
+    except HTTPError as ex:
+        logger.warning("Failed to get the ETag of %s: %s", url, ex)
+        return None
+    return request.info.get("ETag")
+
+
+def lookup(url, checksum=None):
+    """Return the path of the stored copy of a file, None if it isn't stored"""
+    if checksum:
+        key = get_checksum_key(checksum)
+    else:
+        meta_path = _get_url_meta_path(url)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as meta_file:
+            stored_etag = json.load(meta_file).get("etag")
+        # Only check the remote file when a version of it is stored
+        if not stored_etag or get_remote_etag(url) != stored_etag:
+            return None
+        key = get_url_key(url, stored_etag)
+    if not key:
+        return None
+    path = _get_object_path(key)
+    if not os.path.isfile(path):
+        return None
+    os.utime(path)  # Mark the file as recently used
+    return path
+
+
+def fetch(url, dest_file, checksum=None):
+    """Provide dest_file from the store, return whether the file was found"""
+    path = lookup(url, checksum)
+    if not path:
+        return False
+    logger.info("Using stored copy of %s for %s", url, dest_file)
+    os.makedirs(os.path.dirname(dest_file), exist_ok=True)
+    _copy_file(path, dest_file)
+    return True
+
+
+def store(path, url, checksum=None, etag=None):
+    """Add a downloaded file to the store. Files with a checksum are only
+    stored if they match it, files without one need an ETag."""
+    if checksum:
+        key = get_checksum_key(checksum)
+        if not key:
+            return
+        hash_type, expected_hash = checksum.split(":", 1)
+        if system.get_file_checksum(path, hash_type) != expected_hash:
+            logger.warning("%s doesn't match its checksum, not storing it", path)
+            return
+    elif etag:
+        key = get_url_key(url, etag)
+        meta_path = _get_url_meta_path(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        with open(meta_path, "w") as meta_file:
+            json.dump({"url": url, "etag": etag}, meta_file)
+    else:
+        return
+    object_path = _get_object_path(key)
+    os.makedirs(os.path.dirname(object_path), exist_ok=True)
+    _copy_file(path, object_path)
+    logger.debug("Stored %s as %s", path, key)
+    collect_garbage()
+
+
+def collect_garbage(max_size=None):
+    """Remove the least recently used files until the store fits in max_size
+    bytes. Returns the number of bytes freed."""
+    if max_size is None:
+        max_size = get_max_size()
+    objects_path = os.path.join(STORE_PATH, "objects")
+    if not os.path.isdir(objects_path):
+        return 0
+    objects = []
+    for entry in os.scandir(objects_path):
+        if entry.is_file():
+            stat = entry.stat()
+            objects.append((stat.st_mtime, stat.st_size, entry.path))
+    total_size = sum(size for _mtime, size, _path in objects)
+    freed = 0
+    for _mtime, size, path in sorted(objects):
+        if total_size - freed <= max_size:
+            break
+        logger.debug("Removing %s from the installer store", path)
+        os.remove(path)
+        freed += size
+    return freed
@@ -4,6 +4,7 @@ import os
 from urllib.parse import urlparse
 
 from lutris import cache, pga, settings
+from lutris.installer import download_cache
 from lutris.installer.errors import ScriptingError
 from lutris.util import system
 from lutris.util.log import logger
@@ -137,6 +138,22 @@ class InstallerFile:
         if not system.path_exists(self.cache_path):
             os.makedirs(self.cache_path)
 
+    def uses_download_cache(self):
+        """Return whether the file can be provided by the installer store"""
+        return self.url.startswith("http") and download_cache.is_enabled()
+
+    def fetch_from_download_cache(self):
+        """Provide the file from the installer store, return whether it was found"""
+        if not self.uses_download_cache():
+            return False
+        return download_cache.fetch(self.url, self.dest_file, checksum=self.checksum)
+
+    def save_to_download_cache(self, etag=None):
+        """Add the downloaded file to the installer store"""
+        if not self.uses_download_cache():
+            return
+        download_cache.store(self.dest_file, self.url, checksum=self.checksum, etag=etag)
+
     def pga_uri(self):
         """Return the URI of the file stored in the PGA
         This isn't used yet, it looks in the PGA sources
@@ -1,7 +1,6 @@
 """Install a game by following its install script."""
 import os
 
-import yaml
 from gi.repository import GLib, GObject
 
 from lutris import pga, settings
@@ -18,6 +17,7 @@ from lutris.util.jobs import AsyncCall
 from lutris.util.log import logger
 from lutris.util.strings import unpack_dependencies
 from lutris.util.wine.wine import get_system_wine_version, get_wine_version_exe
+from lutris.util.yaml import load_yaml
 
 
 def fetch_script(game_slug, revision=None):
@@ -43,7 +43,8 @@ def fetch_script(game_slug, revision=None):
 def read_script(filename):
     """Return scripts from a local file"""
     logger.debug("Loading script(s) from %s", filename)
-    scripts = yaml.safe_load(open(filename, "r").read())
+    with open(filename, "r") as script_file:
+        scripts = load_yaml(script_file)
     if isinstance(scripts, list):
         return scripts
     if "results" in scripts:
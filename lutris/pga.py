@@ -13,6 +13,7 @@ from lutris.util.log import logger
 from lutris.util.strings import slugify
 
 PGA_DB = settings.PGA_DB
+_CATEGORY_GAMES_CACHE = {}  # Ids of the games in each category, by category name
 
 DATABASE = {
     "games": [
@@ -239,6 +240,7 @@ def get_games(
     filter_runner=None,
     select=None,
     show_installed_first=False,
+    read_only=False,
 ):
     """Get the list of every game in database."""
     query = "select * from games"
@@ -262,7 +264,7 @@ def get_games(
     else:
         query += " ORDER BY slug"
 
-    return sql.db_query(PGA_DB, query, tuple(params))
+    return sql.db_query(PGA_DB, query, tuple(params), read_only=read_only)
 
 
 def get_game_ids():
@@ -353,6 +355,18 @@ def get_games_by_slug(slug):
     return sql.db_select(PGA_DB, "games", condition=("slug", slug))
 
 
+def get_games_by_slugs(slugs):
+    """Return a dict of the games with the given slugs, keyed by slug.
+    The first game is used when several share a slug."""
+    slugs = list(slugs)
+    size = 999
+    games = {}
+    for page in range(math.ceil(len(slugs) / size)):
+        for game in get_games_where(slug__in=slugs[page * size:page * size + size]):
+            games.setdefault(game["slug"], game)
+    return games
+
+
 def add_game(name, **game_data):
     """Add a game to the PGA database."""
     game_data["name"] = name
@@ -375,6 +389,20 @@ def add_games_bulk(games):
     return [sql.db_insert(PGA_DB, "games", game) for game in games]
 
 
+def update_games_bulk(games):
+    """
+        Update a list of games in a single transaction.
+        The dicts must have an identical set of keys, including the game id.
+    """
+    if not games:
+        return
+    fields = [field for field in games[0] if field != "id"]
+    query = "UPDATE games SET {} WHERE id=?".format(", ".join("%s=?" % field for field in fields))
+    with sql.db_cursor(PGA_DB) as cursor:
+        for game in games:
+            sql.cursor_execute(cursor, query, tuple(game[field] for field in fields) + (game["id"], ))
+
+
 def add_or_update(**params):
     """Add a game to the PGA or update an existing one
 
@@ -414,6 +442,7 @@ def get_matching_game(params):
 def delete_game(game_id):
     """Delete a game from the PGA."""
     sql.db_delete(PGA_DB, "games", "id", game_id)
+    _CATEGORY_GAMES_CACHE.clear()
 
 
 def set_uninstalled(game_id):
@@ -543,15 +572,24 @@ def get_category(name):
 
 def get_games_in_category(category_name):
     """Get the ids of games in database."""
-    query = (
-        "select game_id from games_categories "
-        "JOIN categories ON categories.id = games_categories.category_id "
-        "WHERE categories.name=?"
-    )
-    return [
-        game["game_id"]
-        for game in sql.db_query(PGA_DB, query, (category_name, ))
-    ]
+    if category_name not in _CATEGORY_GAMES_CACHE:
+        query = (
+            "select game_id from games_categories "
+            "JOIN categories ON categories.id = games_categories.category_id "
+            "WHERE categories.name=?"
+        )
+        _CATEGORY_GAMES_CACHE[category_name] = [
+            game["game_id"]
+            for game in sql.db_query(PGA_DB, query, (category_name, ))
+        ]
+    return list(_CATEGORY_GAMES_CACHE[category_name])
+
+
+def is_game_in_category(game_id, category_name):
+    """Return whether a game is in a category, without querying the database
+    once the category is known."""
+    get_games_in_category(category_name)
+    return game_id in _CATEGORY_GAMES_CACHE[category_name]
 
 
 def get_categories_in_game(game_id):
@@ -575,6 +613,7 @@ def add_category(category_name):
 
 def add_game_to_category(game_id, category_id):
     """Add a category to a game"""
+    _CATEGORY_GAMES_CACHE.clear()
     return sql.db_insert(PGA_DB, "games_categories", {"game_id": game_id, "category_id": category_id})
 
 
@@ -583,3 +622,4 @@ def remove_category_from_game(game_id, category_id):
     query = "DELETE FROM games_categories WHERE category_id=? AND game_id=?"
     with sql.db_cursor(PGA_DB) as cursor:
         sql.cursor_execute(cursor, query, (category_id, game_id))
+    _CATEGORY_GAMES_CACHE.clear()
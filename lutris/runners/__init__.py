@@ -1,4 +1,11 @@
 """Runner loaders"""
+# Standard Library
+import json
+import os
+
+# Lutris Modules
+from lutris import settings
+from lutris.util.log import logger
 
 __all__ = [
     # Native
@@ -89,25 +96,149 @@ def import_task(runner, task):
     return getattr(runner_module, task)
 
 
+class RunnerInfo:
+
+    """Information about a runner, read from its class so that the runner is
+    only instantiated when it is actually needed"""
+
+    def __init__(self, name):
+        self.name = name
+        self._runner = None
+
+    @property
+    def runner_class(self):
+        return import_runner(self.name)
+
+    @property
+    def runner(self):
+        """Return an instance of the runner, created on first access. It is
+        shared, use runner_class to get a runner to configure or run."""
+        if self._runner is None:
+            self._runner = self.runner_class()
+        return self._runner
+
+    def _get_class_attribute(self, attribute):
+        """Return a class attribute, falling back to the instance when it is
+        computed or set by the constructor"""
+        value = getattr(self.runner_class, attribute, None)
+        if value is None or isinstance(value, property):
+            return getattr(self.runner, attribute)
+        return value
+
+    @property
+    def human_name(self):
+        return self._get_class_attribute("human_name")
+
+    @property
+    def platforms(self):
+        return self._get_class_attribute("platforms")
+
+    @property
+    def multiple_versions(self):
+        return self.runner_class.multiple_versions
+
+    @property
+    def description(self):
+        description = getattr(self.runner_class, "description", None)
+        if isinstance(description, property):
+            description = self.runner_class.__doc__
+        return description or self.runner.description
+
+    def is_installed(self):
+        """Return whether the runner is installed, the result is saved on disk
+        until the runner's directories or configuration change"""
+        stamp = get_installation_stamp(self.name)
+        installation_cache = read_installation_cache()
+        cached = installation_cache.get(self.name)
+        if not cached or cached["stamp"] != stamp:
+            cached = {"stamp": stamp, "installed": bool(self.runner.is_installed())}
+            installation_cache[self.name] = cached
+            save_installation_cache()
+        return cached["installed"]
+
+
+RUNNER_REGISTRY = {}
+INSTALLATION_CACHE_PATH = os.path.join(settings.CACHE_DIR, "runners-installed.json")
+_INSTALLATION_CACHE = {}
+
+
+def read_installation_cache():
+    """Return the installation state of the runners by name, as saved by
+    the current version of Lutris"""
+    if "runners" not in _INSTALLATION_CACHE:
+        installation_cache = {}
+        try:
+            with open(INSTALLATION_CACHE_PATH) as cache_file:
+                cache = json.load(cache_file)
+            if cache["version"] == settings.VERSION:
+                installation_cache = cache["runners"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        _INSTALLATION_CACHE["runners"] = installation_cache
+    return _INSTALLATION_CACHE["runners"]
+
+
+def save_installation_cache():
+    temp_path = "%s.%s.tmp" % (INSTALLATION_CACHE_PATH, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(INSTALLATION_CACHE_PATH), exist_ok=True)
+        with open(temp_path, "w") as cache_file:
+            json.dump({"version": settings.VERSION, "runners": read_installation_cache()}, cache_file)
+        os.replace(temp_path, INSTALLATION_CACHE_PATH)
+    except OSError as ex:
+        logger.warning("Failed to save the installed runners: %s", ex)
+
+
+def _get_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_installation_stamp(runner_name):
+    """Return the modification times of everything a runner's installation
+    state depends on, as lists so that it can be compared with a saved stamp"""
+    search_paths = [settings.RUNNER_DIR] + os.environ.get("PATH", "").split(os.pathsep)
+    return [
+        [_get_mtime(path) for path in search_paths],
+        _get_mtime(os.path.join(settings.RUNNER_DIR, runner_name)),
+        _get_mtime(os.path.join(settings.CONFIG_DIR, "runners/%s.yml" % runner_name)),
+    ]
+
+
+def get_runner_info(runner_name):
+    """Return the RunnerInfo of a runner"""
+    if runner_name not in __all__:
+        raise InvalidRunner("Invalid runner name '%s'" % runner_name)
+    if runner_name not in RUNNER_REGISTRY:
+        RUNNER_REGISTRY[runner_name] = RunnerInfo(runner_name)
+    return RUNNER_REGISTRY[runner_name]
+
+
+def get_installed_names():
+    """Return the sorted names of the installed runners"""
+    return sorted(runner_name for runner_name in __all__ if get_runner_info(runner_name).is_installed())
+
+
 def get_installed(sort=True):
     """Return a list of installed runners (class instances)."""
-    installed = []
-    for runner_name in __all__:
-        runner = import_runner(runner_name)()
-        if runner.is_installed():
-            installed.append(runner)
-    return sorted(installed) if sort else installed
+    runner_names = get_installed_names() if sort else [
+        runner_name for runner_name in __all__ if get_runner_info(runner_name).is_installed()
+    ]
+    return [import_runner(runner_name)() for runner_name in runner_names]
 
 
 def inject_runners(runners):
     for runner_name in runners:
         ADDON_RUNNERS[runner_name] = runners[runner_name]
+        RUNNER_REGISTRY.pop(runner_name, None)
         __all__.append(runner_name)
 
 
 def get_runner_names():
     return {
-        runner: import_runner(runner)().human_name for runner in __all__
+        runner: get_runner_info(runner).human_name for runner in __all__
     }
 
 
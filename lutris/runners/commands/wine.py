@@ -392,7 +392,7 @@ def install_cab_component(cabfile, component, wine_path=None, prefix=None, arch=
     """Install a component from a cabfile in a prefix"""
     cab_installer = CabInstaller(prefix, wine_path=wine_path, arch=arch)
     files = cab_installer.extract_from_cab(cabfile, component)
-    registry_files = cab_installer.get_registry_files(files)
-    for registry_file, _arch in registry_files:
-        set_regedit_file(registry_file, wine_path=wine_path, prefix=prefix, arch=_arch)
+    registry_file = cab_installer.get_registry_file(files)
+    if registry_file:
+        set_regedit_file(registry_file, wine_path=wine_path, prefix=prefix, arch=cab_installer.winearch)
     cab_installer.cleanup()
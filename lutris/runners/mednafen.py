@@ -1,15 +1,19 @@
 # Standard Library
+import json
+import os
 import subprocess
 from gettext import gettext as _
 
 # Lutris Modules
+from lutris import settings
 from lutris.runners.runner import Runner
-from lutris.util import system
+from lutris.util import joypad, system
 from lutris.util.display import DISPLAY_MANAGER
 from lutris.util.joypad import get_controller_mappings
 from lutris.util.log import logger
 
 DEFAULT_MEDNAFEN_SCALER = "nn4x"
+JOYSTICKS_CACHE_PATH = os.path.join(settings.CACHE_DIR, "mednafen-joysticks.json")
 
 
 class mednafen(Runner):
@@ -152,11 +156,45 @@ class mednafen(Runner):
                     return self.platforms[index]
         return ""
 
+    def get_joysticks_cache_key(self):
+        """Return what mednafen's joystick ids depend on: the executable and
+        the connected input devices. None if the devices can't be listed."""
+        if not joypad.evdev:
+            return None
+        return {
+            "executable": self.get_executable(),
+            "devices": [[dev.fn, dev.name, list(dev.info), dev.phys, dev.uniq] for dev in joypad.get_devices()],
+        }
+
     def find_joysticks(self):
-        """ Detect connected joysticks and return their ids """
-        joy_ids = []
-        if not self.is_installed:
+        """Return the ids of the connected joysticks, mednafen is only run to
+        find them when the input devices have changed since the last time."""
+        if not self.is_installed():
             return []
+        cache_key = self.get_joysticks_cache_key()
+        if cache_key is None:
+            return self.read_joystick_ids()
+        try:
+            with open(JOYSTICKS_CACHE_PATH) as cache_file:
+                cache = json.load(cache_file)
+            if cache["key"] == cache_key:
+                return cache["joy_ids"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        joy_ids = self.read_joystick_ids()
+        temp_path = "%s.%s.tmp" % (JOYSTICKS_CACHE_PATH, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(JOYSTICKS_CACHE_PATH), exist_ok=True)
+            with open(temp_path, "w") as cache_file:
+                json.dump({"key": cache_key, "joy_ids": joy_ids}, cache_file)
+            os.replace(temp_path, JOYSTICKS_CACHE_PATH)
+        except OSError as ex:
+            logger.warning("Failed to save the mednafen joystick ids: %s", ex)
+        return joy_ids
+
+    def read_joystick_ids(self):
+        """Run mednafen to detect connected joysticks and return their ids"""
+        joy_ids = []
         output = subprocess.Popen(
             [self.get_executable(), "dummy"],
             stdout=subprocess.PIPE,
@@ -522,12 +560,11 @@ class mednafen(Runner):
             "-" + machine + ".videoip",
             "1",
         ]
-        joy_ids = self.find_joysticks()
-        dont_map_controllers = self.runner_config.get("dont_map_controllers")
-        if joy_ids and not dont_map_controllers:
-            controls = self.set_joystick_controls(joy_ids, machine)
-            for control in controls:
-                options.append(control)
+        if not self.runner_config.get("dont_map_controllers"):
+            joy_ids = self.find_joysticks()
+            if joy_ids:
+                for control in self.set_joystick_controls(joy_ids, machine):
+                    options.append(control)
 
         if not system.path_exists(rom):
             return {"error": "FILE_NOT_FOUND", "file": rom}
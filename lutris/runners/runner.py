@@ -35,6 +35,7 @@ class Runner:  # pylint: disable=too-many-public-methods
     depends_on = None
     runner_executable = None
     entry_point_option = "main_file"
+    status_callback = None  # Called with messages to show while the game is launching
 
     def __init__(self, config=None):
         """Initialize runner."""
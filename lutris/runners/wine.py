@@ -236,7 +236,7 @@ class wine(Runner):
                 "advanced": True,
                 "type": "choice_with_entry",
                 "choices": get_dxvk_choices,
-                "default": dxvk.DXVKManager.DXVK_LATEST,
+                "default": lambda: dxvk.DXVKManager.DXVK_LATEST,
             },
             # Disabled until we get a working implementation if this option.
             # {
@@ -278,7 +278,7 @@ class wine(Runner):
                 "label": _("Enable Gallium Nine"),
                 "type": "bool",
                 "default": False,
-                "condition": nine.NineManager.is_available(),
+                "condition": nine.NineManager.is_available,
                 "advanced": True,
                 "help": _(
                     "Gallium Nine allows to run Direct3D 9 applications faster.\n"
@@ -349,7 +349,8 @@ class wine(Runner):
                 "option": "WineDesktop",
                 "label": _("Virtual desktop resolution"),
                 "type": "choice_with_entry",
-                "choices": DISPLAY_MANAGER.get_resolutions,
+                # Don't create the display manager before the choices are needed
+                "choices": lambda: DISPLAY_MANAGER.get_resolutions(),  # pylint: disable=unnecessary-lambda
                 "help": _("The size of the virtual desktop in pixels."),
             },
             {
@@ -804,11 +805,13 @@ class wine(Runner):
 
                 prefix_manager.set_registry_key(path, key, value)
 
-    def toggle_dxvk(self, enable, version=None, dxvk_manager: dxvk.DXVKManager = None):
+    def toggle_dxvk(self, enable, version=None, dxvk_manager: dxvk.DXVKManager = None, download=None):
         # manual version only sets the dlls to native
         if version.lower() != "manual":
             if enable:
-                if not dxvk_manager.is_available():
+                if download:
+                    download.result()
+                elif not dxvk_manager.is_available():
                     logger.info("DXVK %s is not available yet, downloading...", version)
                     dxvk_manager.download()
                 dxvk_manager.enable()
@@ -821,7 +824,11 @@ class wine(Runner):
                 if dxvk_manager.dxvk_dll_exists(dll):
                     self.dll_overrides[dll] = "n"
 
-    def setup_dxvk(self, base_name, dxvk_manager: dxvk.DXVKManager = None):
+    def on_dxvk_download_progress(self, downloaded_size, total_size):
+        if self.status_callback and total_size:
+            self.status_callback(_("Downloading DXVK: %d%%") % (downloaded_size * 100 // total_size))
+
+    def setup_dxvk(self, base_name, dxvk_manager: dxvk.DXVKManager = None, download=None):
         if not dxvk_manager:
             return
         try:
@@ -829,11 +836,32 @@ class wine(Runner):
                 bool(self.runner_config.get(base_name)),
                 version=dxvk_manager.version,
                 dxvk_manager=dxvk_manager,
+                download=download,
             )
         except dxvk.UnavailableDXVKVersion:
-            raise GameConfigError("Unable to get " + base_name.upper() + " %s" % dxvk_manager.version)
+            local_version = None
+            if dxvk_manager.version == dxvk_manager.latest_version:
+                local_version = dxvk_manager.get_latest_local_version()
+            if not local_version:
+                raise GameConfigError("Unable to get " + base_name.upper() + " %s" % dxvk_manager.version)
+            # The latest version can't be downloaded, probably because we are offline
+            logger.warning("Using %s %s instead of %s", base_name.upper(), local_version, dxvk_manager.version)
+            self.toggle_dxvk(
+                True,
+                version=local_version,
+                dxvk_manager=dxvk.DXVKManager(self.prefix_path, arch=self.wine_arch, version=local_version),
+            )
 
     def prelaunch(self):
+        dxvk_manager = dxvk.DXVKManager(
+            self.prefix_path,
+            arch=self.wine_arch,
+            version=self.runner_config.get("dxvk_version"),
+        )
+        dxvk_download = None
+        if self.runner_config.get("dxvk") and dxvk_manager.version.lower() != "manual":
+            # Fetch DXVK while the prefix is being prepared
+            dxvk_download = dxvk_manager.start_download(progress_callback=self.on_dxvk_download_progress)
         if not system.path_exists(os.path.join(self.prefix_path, "user.reg")):
             create_prefix(self.prefix_path, arch=self.wine_arch)
         prefix_manager = WinePrefixManager(self.prefix_path)
@@ -842,15 +870,7 @@ class wine(Runner):
         self.sandbox(prefix_manager)
         self.set_regedit_keys()
         self.setup_x360ce(self.runner_config.get("x360ce-path"))
-        dxvk_manager = dxvk.DXVKManager
-        self.setup_dxvk(
-            "dxvk",
-            dxvk_manager=dxvk_manager(
-                self.prefix_path,
-                arch=self.wine_arch,
-                version=self.runner_config.get("dxvk_version"),
-            ),
-        )
+        self.setup_dxvk("dxvk", dxvk_manager=dxvk_manager, download=dxvk_download)
 
         try:
             self.setup_nine(
@@ -1,7 +1,11 @@
 """Runtime handling module"""
 # Standard Library
+import concurrent.futures
+import ctypes
+import json
 import os
 import time
+from urllib.parse import urljoin
 
 # Third Party Libraries
 from gi.repository import GLib
@@ -16,6 +20,15 @@ from lutris.util.system import LINUX_SYSTEM
 
 RUNTIME_DISABLED = os.environ.get("LUTRIS_RUNTIME", "").lower() in ("0", "off")
 DEFAULT_RUNTIME = "Ubuntu-18.04"
+LD_CACHE_PATH = "/etc/ld.so.cache"
+MANIFEST_MAX_WORKERS = 4
+
+# renameat2 arguments, from linux/fcntl.h and linux/fs.h
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+
+# Computed runtime paths, see get_runtime_paths
+_RUNTIME_PATHS_CACHE = {}
 
 
 class Runtime:
@@ -26,6 +39,16 @@ class Runtime:
         self.name = name
         self.updater = updater
 
+    @property
+    def staging_path(self):
+        """Return the folder where a new version of the runtime is prepared"""
+        return os.path.join(RUNTIME_DIR, ".%s.staging" % self.name)
+
+    @property
+    def manifest_path(self):
+        """Return the path of the manifest of the installed runtime"""
+        return os.path.join(RUNTIME_DIR, ".%s.manifest.json" % self.name)
+
     @property
     def local_runtime_path(self):
         """Return the local path for the runtime folder"""
@@ -71,6 +94,9 @@ class Runtime:
         if not self.should_update(remote_updated_at):
             return None
 
+        if remote_runtime_info.get("manifest_url"):
+            return jobs.AsyncCall(self.update_from_manifest, self.on_manifest_updated, remote_runtime_info["manifest_url"])
+
         url = remote_runtime_info["url"]
         archive_path = os.path.join(RUNTIME_DIR, os.path.basename(url))
         downloader = Downloader(url, archive_path, overwrite=True)
@@ -99,14 +125,11 @@ class Runtime:
         Arguments:
             path (str): local path to the runtime archive
         """
-        directory, _filename = os.path.split(path)
-
-        # Delete the existing runtime path
-        initial_path = os.path.join(directory, self.name)
-        system.remove_folder(initial_path)
-
-        # Extract the runtime archive
-        jobs.AsyncCall(extract_archive, self.on_extracted, path, RUNTIME_DIR, merge_single=False)
+        # Extract the runtime archive next to the live runtime, which is
+        # only replaced once the extraction has succeeded
+        if os.path.exists(self.staging_path):
+            system.remove_folder(self.staging_path)
+        jobs.AsyncCall(extract_archive, self.on_extracted, path, self.staging_path, merge_single=False)
         return False
 
     def on_extracted(self, result, error):
@@ -118,10 +141,117 @@ class Runtime:
         archive_path, _destination_path = result
         logger.debug("Deleting runtime archive %s", archive_path)
         os.unlink(archive_path)
+        extracted_path = os.path.join(self.staging_path, self.name)
+        if os.path.isdir(extracted_path):
+            self.swap_in(extracted_path)
+            system.remove_folder(self.staging_path)
+        else:
+            self.swap_in(self.staging_path)
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
         self.set_updated_at()
         self.updater.notify_finish(self)
         return False
 
+    def swap_in(self, path):
+        """Replace the live runtime with the folder at path. Running games keep
+        the files they have opened, the live folder is never partially removed."""
+        live_path = self.local_runtime_path
+        if os.path.isdir(live_path) and exchange_paths(path, live_path):
+            system.remove_folder(path)
+            return
+        old_path = os.path.join(RUNTIME_DIR, ".%s.old" % self.name)
+        if os.path.exists(old_path):
+            system.remove_folder(old_path)
+        if os.path.exists(live_path):
+            os.rename(live_path, old_path)
+        os.rename(path, live_path)
+        if os.path.exists(old_path):
+            system.remove_folder(old_path)
+
+    def read_manifest(self):
+        """Return the files of the installed runtime by path, as listed in the
+        manifest it was installed from"""
+        try:
+            with open(self.manifest_path) as manifest_file:
+                return {entry["path"]: entry for entry in json.load(manifest_file)["files"]}
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def _stage_file(self, entry, manifest_url, installed_files):
+        """Put a file from the manifest in the staging folder, reusing the
+        installed copy when it didn't change"""
+        path = os.path.normpath(entry["path"])
+        if os.path.isabs(path) or path.startswith(".."):
+            raise ValueError("Invalid path in runtime manifest: %s" % entry["path"])
+        staged_path = os.path.join(self.staging_path, path)
+        os.makedirs(os.path.dirname(staged_path), exist_ok=True)
+        if entry.get("link"):
+            os.symlink(entry["link"], staged_path)
+            return 0
+        installed_path = os.path.join(self.local_runtime_path, path)
+        installed_entry = installed_files.get(entry["path"])
+        if (
+            installed_entry and installed_entry.get("sha256") == entry["sha256"]
+            and os.path.isfile(installed_path) and not os.path.islink(installed_path)
+            and os.path.getsize(installed_path) == entry.get("size", os.path.getsize(installed_path))
+        ):
+            system.clone_file(installed_path, staged_path)
+            return 0
+        if entry.get("size") == 0:
+            open(staged_path, "wb").close()
+        else:
+            http.Request(urljoin(manifest_url, entry.get("url", entry["path"]))).get_to_file(staged_path)
+            if system.get_file_checksum(staged_path, "sha256") != entry["sha256"]:
+                raise ValueError("Checksum mismatch for %s" % entry["path"])
+        if "mode" in entry:
+            os.chmod(staged_path, entry["mode"])
+        return entry.get("size", 0)
+
+    def update_from_manifest(self, manifest_url):
+        """Update the runtime from a manifest listing its files with their
+        checksums. Only the files that changed are downloaded, the others are
+        shared with the installed runtime. Returns the number of bytes downloaded."""
+        manifest = http.Request(manifest_url).get().json
+        if not manifest or "files" not in manifest:
+            raise ValueError("Invalid runtime manifest at %s" % manifest_url)
+        if os.path.exists(self.staging_path):
+            system.remove_folder(self.staging_path)
+        os.makedirs(self.staging_path)
+        installed_files = self.read_manifest()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=MANIFEST_MAX_WORKERS) as executor:
+            downloaded = sum(executor.map(
+                lambda entry: self._stage_file(entry, manifest_url, installed_files),
+                manifest["files"]
+            ))
+        self.swap_in(self.staging_path)
+        with open(self.manifest_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+        return downloaded
+
+    def on_manifest_updated(self, result, error):
+        """Callback method when a runtime has been updated from its manifest"""
+        if error:
+            logger.error("Runtime update failed")
+            logger.error(error)
+            if os.path.exists(self.staging_path):
+                system.remove_folder(self.staging_path)
+            self.updater.notify_finish(self)
+            return False
+        logger.debug("Runtime %s updated, %s bytes downloaded", self.name, result)
+        self.set_updated_at()
+        self.updater.notify_finish(self)
+        return False
+
+
+def exchange_paths(path, other_path):
+    """Atomically exchange two paths with renameat2.
+    Return False if the C library or the filesystem doesn't support it."""
+    libc = ctypes.CDLL(None, use_errno=True)
+    if not hasattr(libc, "renameat2"):
+        return False
+    return libc.renameat2(AT_FDCWD, os.fsencode(path), AT_FDCWD, os.fsencode(other_path), RENAME_EXCHANGE) == 0
+
 
 class RuntimeUpdater:
 
@@ -228,8 +358,32 @@ def get_winelib_paths(wine_path):
     return paths
 
 
+def _get_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
 def get_runtime_paths(version=None, prefer_system_libs=True, wine_path=None):
-    """Return Lutris runtime paths"""
+    """Return Lutris runtime paths
+
+    The result only changes when the runtimes are updated or the system
+    libraries change, it is computed once for each combination of parameters.
+    """
+    key = (
+        version,
+        prefer_system_libs,
+        wine_path if prefer_system_libs else None,
+        _get_mtime(RUNTIME_DIR),
+        _get_mtime(LD_CACHE_PATH),
+    )
+    if key not in _RUNTIME_PATHS_CACHE:
+        _RUNTIME_PATHS_CACHE[key] = _get_runtime_paths(version, prefer_system_libs, wine_path)
+    return list(_RUNTIME_PATHS_CACHE[key])
+
+
+def _get_runtime_paths(version, prefer_system_libs, wine_path):
     version = version or DEFAULT_RUNTIME
     if version.startswith("Ubuntu"):
         lutris_runtime_path = "%s-i686" % version
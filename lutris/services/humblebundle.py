@@ -1,5 +1,6 @@
 """Manage Humble Bundle libraries"""
 # Standard Library
+import concurrent.futures
 import json
 import os
 from gettext import gettext as _
@@ -65,6 +66,7 @@ class HumbleBundleService(OnlineService):
     cache_path = os.path.join(settings.CACHE_DIR, "humblebundle-library/")
 
     supported_platforms = ("linux", "windows")
+    max_workers = 8
 
     def request_token(self, url="", refresh_token=""):
         """Dummy function, should not be here. Fix in WebConnectDialog"""
@@ -86,16 +88,24 @@ class HumbleBundleService(OnlineService):
         """Return the local path for an order"""
         return os.path.join(self.cache_path, "%s.json" % gamekey)
 
-    def get_order(self, gamekey):
-        """Retrieve an order identitied by its key"""
+    @property
+    def index_path(self):
+        """Return the local path of the product index"""
+        return os.path.join(self.cache_path, "index.json")
+
+    def get_order(self, gamekey, refresh=False):
+        """Retrieve an order identitied by its key.
+        If refresh is set, the cached copy of the order is ignored.
+        """
         logger.debug("Getting Humble Bundle order %s", gamekey)
         cache_filename = self.order_path(gamekey)
-        if os.path.exists(cache_filename):
+        if not refresh and os.path.exists(cache_filename):
             with open(cache_filename) as cache_file:
                 return json.load(cache_file)
         response = self.make_api_request(self.api_url + "api/v1/order/%s?all_tpkds=true" % gamekey)
-        if not os.path.exists(self.cache_path):
-            os.makedirs(self.cache_path)
+        if not response:
+            return response
+        os.makedirs(self.cache_path, exist_ok=True)
         with open(cache_filename, "w") as cache_file:
             json.dump(response, cache_file)
         return response
@@ -111,9 +121,49 @@ class HumbleBundleService(OnlineService):
         return games
 
     def get_orders(self):
-        """Return all orders"""
+        """Return all orders, fetching the ones missing from the cache concurrently"""
         gamekeys = self.make_api_request(self.api_url + "api/v1/user/order")
-        return [self.get_order(gamekey["gamekey"]) for gamekey in gamekeys]
+        if not gamekeys:
+            return []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            orders = [
+                order for order in executor.map(self.get_order, [gamekey["gamekey"] for gamekey in gamekeys])
+                if order
+            ]
+        self.save_index(self.build_index(orders))
+        return orders
+
+    @staticmethod
+    def build_index(orders):
+        """Return a mapping of machine names and platforms to the gamekeys of
+        the orders containing them.
+        """
+        index = {}
+        for order in orders:
+            for product in order["subproducts"]:
+                platforms = index.setdefault(product["machine_name"], {})
+                for download in product["downloads"]:
+                    gamekeys = platforms.setdefault(download["platform"], [])
+                    if order["gamekey"] not in gamekeys:
+                        gamekeys.append(order["gamekey"])
+        return index
+
+    def load_index(self):
+        """Return the product index saved in the cache, None if there is none"""
+        if not os.path.exists(self.index_path):
+            return None
+        try:
+            with open(self.index_path) as index_file:
+                return json.load(index_file)
+        except ValueError as ex:
+            logger.error("Invalid Humble Bundle index %s: %s", self.index_path, ex)
+            return None
+
+    def save_index(self, index):
+        """Write the product index to the cache"""
+        os.makedirs(self.cache_path, exist_ok=True)
+        with open(self.index_path, "w") as index_file:
+            json.dump(index, index_file)
 
     @staticmethod
     def find_download_in_order(order, humbleid, platform):
@@ -131,10 +181,21 @@ class HumbleBundleService(OnlineService):
                     "download": download
                 }
 
+    def get_download_gamekeys(self, humbleid, platform):
+        """Return the gamekeys of the orders providing a game for a platform"""
+        index = self.load_index()
+        if not index or humbleid not in index:
+            # The game may come from an order made after the index was built
+            index = self.build_index(self.get_orders())
+        return index.get(humbleid, {}).get(platform, [])
+
     def get_downloads(self, humbleid, platform):
         """Return the download information for a given game"""
         download_links = []
-        for order in self.get_orders():
+        for gamekey in self.get_download_gamekeys(humbleid, platform):
+            order = self.get_order(gamekey)
+            if not order:
+                continue
             download = self.find_download_in_order(order, humbleid, platform)
             if download:
                 download_links.append(download)
@@ -188,9 +249,8 @@ def get_humble_download_link(humbleid, runner):
     logger.info("Found %s download for %s", len(downloads), humbleid)
     download = downloads[0]
     logger.info("Reloading order %s", download["product"]["human_name"])
-    os.remove(SERVICE.order_path(download["gamekey"]))
-    order = SERVICE.get_order(download["gamekey"])
-    download_info = SERVICE.find_download_in_order(order, humbleid, platform)
+    order = SERVICE.get_order(download["gamekey"], refresh=True)
+    download_info = SERVICE.find_download_in_order(order, humbleid, platform) if order else None
     if download_info:
         return pick_download_url_from_download_info(download_info)
     logger.warning("Couldn't retrieve any downloads for %s", humbleid)
@@ -8,6 +8,7 @@ from lutris.game import Game
 from lutris.gui.dialogs import DontShowAgainDialog
 from lutris.runners.json import load_json_runners
 from lutris.util.graphics import drivers, vkquery
+from lutris.util import profiler
 from lutris.util.linux import LINUX_SYSTEM
 from lutris.util.log import logger
 from lutris.util.system import create_folder
@@ -40,13 +41,17 @@ def init_db():
     pga.syncdb()
 
 
+@profiler.phase("init_lutris")
 def init_lutris():
     """Run full initialization of Lutris"""
-    runners.inject_runners(load_json_runners())
+    with profiler.phase("load_json_runners"):
+        runners.inject_runners(load_json_runners())
     # Load runner names
-    runners.RUNNER_NAMES = runners.get_runner_names()
+    with profiler.phase("get_runner_names"):
+        runners.RUNNER_NAMES = runners.get_runner_names()
     init_dirs()
-    init_db()
+    with profiler.phase("init_db"):
+        init_db()
 
 
 def check_driver():
@@ -147,7 +152,11 @@ def fill_missing_platforms():
 
 def run_all_checks():
     """Run all startup checks"""
-    check_driver()
-    check_libs()
-    check_vulkan()
-    fill_missing_platforms()
+    with profiler.phase("check_driver"):
+        check_driver()
+    with profiler.phase("check_libs"):
+        check_libs()
+    with profiler.phase("check_vulkan"):
+        check_vulkan()
+    with profiler.phase("fill_missing_platforms"):
+        fill_missing_platforms()
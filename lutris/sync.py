@@ -32,53 +32,55 @@ def sync_missing_games(not_in_local, remote_library):
     return set(missing_ids)
 
 
-def sync_game_details(remote_library):
+def sync_game_details(remote_library, media_callback=None):
     """Update local game details,
 
+    Banners and icons of the updated games are downloaded in the background,
+    media_callback is called with lists of (slug, media type) as they arrive.
+
     :return: A set of ids of the updated games.
     """
     if not remote_library:
         return set()
-    updated = set()
+    local_games = pga.get_games_by_slugs({remote_game["slug"] for remote_game in remote_library})
+    updates = []
+    media_fetcher = resources.MediaFetcher(callback=media_callback)
 
     for remote_game in remote_library:
         slug = remote_game["slug"]
-        sync_required = False
-        local_game = pga.get_game_by_field(slug, "slug")
+        local_game = local_games.get(slug)
         if not local_game:
             continue
-        if local_game["updated"] and remote_game["updated"] > local_game["updated"]:
-            # The remote game's info is more recent than the local game
-            sync_required = True
-
-        if not sync_required:
+        if not local_game["updated"] or remote_game["updated"] <= local_game["updated"]:
             continue
 
+        # The remote game's info is more recent than the local game
         logger.debug("Syncing details for %s", slug)
-        game_id = pga.add_or_update(
-            id=local_game["id"],
-            name=local_game["name"],
-            runner=local_game["runner"],
-            slug=slug,
-            year=remote_game["year"],
-            updated=remote_game["updated"],
-            steamid=remote_game["steamid"],
+        updates.append(
+            {
+                "id": local_game["id"],
+                "year": remote_game["year"],
+                "updated": remote_game["updated"],
+                "steamid": remote_game["steamid"],
+            }
         )
-        updated.add(game_id)
 
         if not local_game.get("has_custom_banner") and remote_game["banner_url"]:
             path = resources.get_banner_path(slug)
-            resources.download_media(remote_game["banner_url"], path, overwrite=True)
+            media_fetcher.queue((slug, "banner"), remote_game["banner_url"], path, overwrite=True)
         if not local_game.get("has_custom_icon") and remote_game["icon_url"]:
             path = resources.get_icon_path(slug)
-            resources.download_media(remote_game["icon_url"], path, overwrite=True)
+            media_fetcher.queue((slug, "icon"), remote_game["icon_url"], path, overwrite=True)
+    media_fetcher.shutdown(wait=False)
 
+    pga.update_games_bulk(updates)
+    updated = {update["id"] for update in updates}
     if updated:
         logger.debug("%d games updated", len(updated))
     return updated
 
 
-def sync_from_remote():
+def sync_from_remote(media_callback=None):
     """Synchronize from remote to local library.
 
     :return: The added and updated games (slugs)
@@ -92,5 +94,5 @@ def sync_from_remote():
     missing_slugs = remote_slugs.difference(local_slugs)
 
     added = sync_missing_games(missing_slugs, remote_library)
-    updated = sync_game_details(remote_library)
+    updated = sync_game_details(remote_library, media_callback=media_callback)
     return added, updated
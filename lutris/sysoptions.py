@@ -10,7 +10,7 @@ from gettext import gettext as _
 from lutris import runners
 from lutris.discord import DiscordPresence
 from lutris.util import system
-from lutris.util.display import DISPLAY_MANAGER, USE_DRI_PRIME
+from lutris.util.display import DISPLAY_MANAGER, use_dri_prime
 
 VULKAN_DATA_DIRS = [
     "/usr/local/etc/vulkan",  # standard site-local location
@@ -278,9 +278,9 @@ system_options = [  # pylint: disable=invalid-name
         "type":
         "bool",
         "default":
-        USE_DRI_PRIME,
+        use_dri_prime,
         "condition":
-        USE_DRI_PRIME,
+        use_dri_prime,
         "label":
         _("Use discrete graphics"),
         "advanced":
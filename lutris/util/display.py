@@ -1,8 +1,10 @@
 """Module to deal with various aspects of displays"""
 # isort:skip_file
 import enum
+import json
 import os
 import subprocess
+from functools import lru_cache
 
 try:
     from dbus.exceptions import DBusException
@@ -12,11 +14,16 @@ except ImportError:
 
 from gi.repository import Gdk, GLib, GnomeDesktop
 
+from lutris import settings
 from lutris.util import system
 from lutris.util.graphics.displayconfig import MutterDisplayManager
 from lutris.util.graphics.xrandr import LegacyDisplayManager, change_resolution, get_outputs
 from lutris.util.log import logger
 
+PCI_DEVICES_PATH = "/sys/bus/pci/devices"
+PCI_CLASS_DISPLAY = 0x03
+GRAPHICS_ADAPTERS_CACHE_PATH = os.path.join(settings.CACHE_DIR, "graphics-adapters.json")
+
 
 class NoScreenDetected(Exception):
 
@@ -34,12 +41,37 @@ def restore_gamma():
         logger.warning("you do not have permission to call xgamma")
 
 
-def _get_graphics_adapters():
-    """Return the list of graphics cards available on a system
+def _get_pci_devices():
+    """Return the addresses of the PCI devices listed in sysfs"""
+    try:
+        return sorted(os.listdir(PCI_DEVICES_PATH))
+    except OSError:
+        return []
 
-    Returns:
-        list: list of tuples containing PCI ID and description of the display controller
-    """
+
+def _read_sysfs_graphics_adapters(pci_devices):
+    """Return the display controllers found by reading the PCI class codes
+    from sysfs, None if they can't be read."""
+    adapters = []
+    for pci_id in pci_devices:
+        device_path = os.path.join(PCI_DEVICES_PATH, pci_id)
+        try:
+            with open(os.path.join(device_path, "class")) as class_file:
+                pci_class = int(class_file.read(), 16)
+            if pci_class >> 16 != PCI_CLASS_DISPLAY:
+                continue
+            ids = []
+            for id_name in ("vendor", "device"):
+                with open(os.path.join(device_path, id_name)) as id_file:
+                    ids.append(id_file.read().strip()[2:])
+        except (OSError, ValueError):
+            return None
+        adapters.append((pci_id, ":".join(ids)))
+    return adapters
+
+
+def _read_lspci_graphics_adapters():
+    """Return the display controllers listed by lspci"""
     lspci_path = system.find_executable("lspci")
     dev_subclasses = ["VGA", "XGA", "3D controller", "Display controller"]
     if not lspci_path:
@@ -53,6 +85,50 @@ def _get_graphics_adapters():
     ]
 
 
+def _get_cached_lspci_graphics_adapters(pci_devices):
+    """Return the output of lspci, cached on disk until the list of PCI
+    devices changes."""
+    try:
+        with open(GRAPHICS_ADAPTERS_CACHE_PATH) as cache_file:
+            cache = json.load(cache_file)
+        if cache["pci_devices"] == pci_devices:
+            return [tuple(adapter) for adapter in cache["adapters"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    adapters = _read_lspci_graphics_adapters()
+    temp_path = "%s.%s.tmp" % (GRAPHICS_ADAPTERS_CACHE_PATH, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(GRAPHICS_ADAPTERS_CACHE_PATH), exist_ok=True)
+        with open(temp_path, "w") as cache_file:
+            json.dump({"pci_devices": pci_devices, "adapters": adapters}, cache_file)
+        os.replace(temp_path, GRAPHICS_ADAPTERS_CACHE_PATH)
+    except OSError as ex:
+        logger.warning("Failed to save the list of graphics cards: %s", ex)
+    return adapters
+
+
+@lru_cache(maxsize=None)
+def get_graphics_adapters():
+    """Return the list of graphics cards available on a system
+
+    The PCI class codes are read from sysfs, lspci is only used if they
+    aren't available.
+
+    Returns:
+        list: list of tuples containing PCI ID and description of the display controller
+    """
+    pci_devices = _get_pci_devices()
+    adapters = _read_sysfs_graphics_adapters(pci_devices) if pci_devices else None
+    if adapters is None:
+        adapters = _get_cached_lspci_graphics_adapters(pci_devices)
+    return adapters
+
+
+def use_dri_prime():
+    """Return whether the system has more than one graphics card"""
+    return len(get_graphics_adapters()) > 1
+
+
 class DisplayManager:
 
     """Get display and resolution using GnomeDesktop"""
@@ -108,8 +184,9 @@ class DisplayManager:
         return get_outputs()
 
 
+@lru_cache(maxsize=None)
 def get_display_manager():
-    """Return the appropriate display manager instance.
+    """Return the appropriate display manager instance, created on first use.
     Defaults to Mutter if available. This is the only one to support Wayland.
     """
     if DBUS_AVAILABLE:
@@ -127,8 +204,17 @@ def get_display_manager():
         return LegacyDisplayManager()
 
 
-DISPLAY_MANAGER = get_display_manager()
-USE_DRI_PRIME = len(_get_graphics_adapters()) > 1
+class _LazyDisplayManager:
+
+    """Stand-in for the display manager, which is only created when one of
+    its attributes is used. Connecting to DBus and querying the screens is
+    slow and not needed by most command line calls."""
+
+    def __getattr__(self, name):
+        return getattr(get_display_manager(), name)
+
+
+DISPLAY_MANAGER = _LazyDisplayManager()
 
 
 class DesktopEnvironment(enum.Enum):
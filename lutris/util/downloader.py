@@ -47,6 +47,7 @@ class Downloader:
         self.speed = 0
         self.average_speed = 0
         self.time_left = "00:00:00"  # Based on average speed
+        self.etag = None
 
         self.last_size = 0
         self.last_check_time = 0
@@ -122,6 +123,7 @@ class Downloader:
             logger.info("%s returned a %s error", self.url, response.status_code)
         response.raise_for_status()
         self.full_size = int(response.headers.get("Content-Length", "").strip() or 0)
+        self.etag = response.headers.get("ETag")
         for chunk in response.iter_content(chunk_size=1024 * 1024):
             if not self.file_pointer:
                 break
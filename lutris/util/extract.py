@@ -1,7 +1,10 @@
 # Standard Library
+import bz2
 import errno
 import gzip
+import lzma
 import os
+import re
 import shutil
 import subprocess
 import tarfile
@@ -13,12 +16,33 @@ from lutris import settings
 from lutris.util import system
 from lutris.util.log import logger
 
+BUFFER_SIZE = 1024 * 1024  # Bytes
+
 
 class ExtractFailure(Exception):
 
     """Exception raised when and archive fails to extract"""
 
 
+class ProgressFile:
+
+    """Wraps a file object opened for reading and reports how many bytes of it
+    have been consumed so far."""
+
+    def __init__(self, fileobj, callback):
+        self.fileobj = fileobj
+        self.callback = callback
+        self.total = os.fstat(fileobj.fileno()).st_size
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        self.callback(self.fileobj.tell(), self.total)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self.fileobj, name)
+
+
 def random_id():
     """Return a random ID"""
     return str(uuid.uuid4())[:8]
@@ -84,6 +108,10 @@ def guess_extractor(path):
         extractor = "bz2"
     elif path.endswith(".gz"):
         extractor = "gzip"
+    elif path.endswith(".bz2"):
+        extractor = "bzip2"
+    elif path.endswith(".xz"):
+        extractor = "xz"
     elif path.endswith(".exe"):
         extractor = "exe"
     elif is_7zip_supported(path, None):
@@ -106,6 +134,10 @@ def get_archive_opener(extractor, path):
         opener, mode = tarfile.open, "r:bz2"
     elif extractor == "gzip":
         opener = "gz"
+    elif extractor == "bzip2":
+        opener = "bz2"
+    elif extractor == "xz":
+        opener = "xz"
     elif extractor == "gog":
         opener = "innoextract"
     elif extractor == "exe":
@@ -117,7 +149,19 @@ def get_archive_opener(extractor, path):
     return opener, mode
 
 
-def extract_archive(path, to_directory=".", merge_single=True, extractor=None):
+def is_empty_dir(path):
+    """Return whether path doesn't exist or is an empty directory"""
+    if not system.path_exists(path):
+        return True
+    return os.path.isdir(path) and not os.listdir(path)
+
+
+def extract_archive(path, to_directory=".", merge_single=True, extractor=None, callback=None):
+    """Extract an archive to a directory.
+
+    If given, callback is called with the number of bytes read from the
+    archive, the archive size and the number of files extracted so far.
+    """
     path = os.path.abspath(path)
     logger.debug("Extracting %s to %s", path, to_directory)
 
@@ -126,10 +170,28 @@ def extract_archive(path, to_directory=".", merge_single=True, extractor=None):
 
     opener, mode = get_archive_opener(extractor, path)
 
+    if is_empty_dir(to_directory):
+        # Nothing to merge with, the archive can be written in place
+        created_directory = not system.path_exists(to_directory)
+        os.makedirs(to_directory, exist_ok=True)
+        try:
+            _do_extract(path, to_directory, opener, mode, extractor, callback)
+        except (OSError, zlib.error, tarfile.ReadError, EOFError) as ex:
+            logger.error("Extraction failed: %s", ex)
+            remove_partial_extraction(to_directory, created_directory)
+            raise ExtractFailure(str(ex))
+        except Exception:
+            remove_partial_extraction(to_directory, created_directory)
+            raise
+        if merge_single:
+            lift_single_folder(to_directory)
+        logger.debug("Finished extracting %s to %s", path, to_directory)
+        return path, to_directory
+
     temp_name = ".extract-" + random_id()
     temp_path = temp_dir = os.path.join(to_directory, temp_name)
     try:
-        _do_extract(path, temp_path, opener, mode, extractor)
+        _do_extract(path, temp_path, opener, mode, extractor, callback)
     except (OSError, zlib.error, tarfile.ReadError, EOFError) as ex:
         logger.error("Extraction failed: %s", ex)
         raise ExtractFailure(str(ex))
@@ -161,7 +223,7 @@ def extract_archive(path, to_directory=".", merge_single=True, extractor=None):
                     shutil.move(source_path, destination_path)
                 elif os.path.isdir(destination_path):
                     try:
-                        system.merge_folders(source_path, destination_path)
+                        system.merge_folders(source_path, destination_path, move=True)
                     except OSError as ex:
                         logger.error(
                             "Failed to merge to destination %s: %s",
@@ -176,24 +238,115 @@ def extract_archive(path, to_directory=".", merge_single=True, extractor=None):
     return path, to_directory
 
 
-def _do_extract(archive, dest, opener, mode=None, extractor=None):
+def remove_partial_extraction(path, remove_directory):
+    """Remove what a failed extraction left in a directory that was empty"""
+    if remove_directory:
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    for filename in os.listdir(path):
+        file_path = os.path.join(path, filename)
+        if os.path.isdir(file_path) and not os.path.islink(file_path):
+            shutil.rmtree(file_path, ignore_errors=True)
+        else:
+            os.remove(file_path)
+
+
+def lift_single_folder(path):
+    """If path only contains a single folder, move the content of that folder
+    one level up. Only renames are involved, no data gets copied."""
+    extracted = os.listdir(path)
+    if len(extracted) != 1:
+        return
+    single_path = os.path.join(path, extracted[0])
+    if not os.path.isdir(single_path) or os.path.islink(single_path):
+        return
+    # Rename the folder first in case it contains a file with the same name
+    temp_path = os.path.join(path, ".extract-" + random_id())
+    os.rename(single_path, temp_path)
+    for filename in os.listdir(temp_path):
+        os.rename(os.path.join(temp_path, filename), os.path.join(path, filename))
+    os.rmdir(temp_path)
+
+
+def _do_extract(archive, dest, opener, mode=None, extractor=None, callback=None):
     if opener == "gz":
-        decompress_gz(archive, dest)
-    if opener == "7zip":
-        extract_7zip(archive, dest, archive_type=extractor)
+        decompress_gz(archive, dest, callback=callback)
+    elif opener == "bz2":
+        decompress_bz2(archive, dest, callback=callback)
+    elif opener == "xz":
+        decompress_xz(archive, dest, callback=callback)
+    elif opener == "7zip":
+        extract_7zip(archive, dest, archive_type=extractor, callback=callback)
     elif opener == "exe":
-        extract_exe(archive, dest)
+        extract_exe(archive, dest, callback=callback)
     elif opener == "innoextract":
-        extract_gog(archive, dest)
+        extract_gog(archive, dest, callback=callback)
     else:
+        extract_tar(archive, dest, opener, mode, callback=callback)
+
+
+def extract_tar(archive, dest, opener, mode, callback=None):
+    """Extract a tar archive, reporting progress as members get extracted"""
+    if not callback:
         handler = opener(archive, mode)
         handler.extractall(dest)
         handler.close()
-
-
-def extract_exe(path, dest):
+        return
+    progress = {"bytes": 0, "total": 0, "files": 0}
+
+    def on_read(bytes_read, total):
+        progress["bytes"] = bytes_read
+        progress["total"] = total
+
+    def iter_members(handler):
+        for member in handler:
+            yield member
+            progress["files"] += 1
+            callback(progress["bytes"], progress["total"], progress["files"])
+
+    with open(archive, "rb") as archive_file:
+        handler = opener(fileobj=ProgressFile(archive_file, on_read), mode=mode)
+        handler.extractall(dest, members=iter_members(handler))
+        handler.close()
+    callback(progress["total"], progress["total"], progress["files"])
+
+
+def _read_progress_output(command, progress_pattern, total, callback, file_pattern=None):
+    """Run command and parse its progress output.
+
+    progress_pattern must capture a percentage, and optionally the number of
+    files processed. When file_pattern is given, the files done are counted
+    from the lines matching it instead.
+    Returns the exit code of the command.
+    """
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    files_done = 0
+    percent = 0.0
+    buffer = b""
+    while True:
+        chunk = process.stdout.read1(4096)
+        if not chunk:
+            break
+        # Progress is redrawn with carriage returns or backspaces
+        segments = re.split(rb"[\r\n\b]+", buffer + chunk)
+        buffer = segments.pop()
+        for segment in segments:
+            line = segment.decode(errors="replace")
+            if file_pattern and file_pattern.match(line):
+                files_done += 1
+            match = progress_pattern.search(line)
+            if not match:
+                continue
+            percent = float(match.group(1))
+            if not file_pattern and match.lastindex and match.lastindex > 1 and match.group(2):
+                files_done = int(match.group(2))
+            callback(int(total * percent / 100), total, files_done)
+    return process.wait()
+
+
+def extract_exe(path, dest, callback=None):
     if check_inno_exe(path):
-        decompress_gog(path, dest)
+        decompress_gog(path, dest, callback=callback)
     else:
         # use 7za to check if exe is an archive
         _7zip_path = os.path.join(settings.RUNTIME_DIR, "p7zip/7za")
@@ -204,14 +357,14 @@ def extract_exe(path, dest):
         command = [_7zip_path, "t", path]
         return_code = subprocess.call(command)
         if return_code == 0:
-            extract_7zip(path, dest)
+            extract_7zip(path, dest, callback=callback)
         else:
             raise RuntimeError("specified exe is not an archive or GOG setup file")
 
 
-def extract_gog(path, dest):
+def extract_gog(path, dest, callback=None):
     if check_inno_exe(path):
-        decompress_gog(path, dest)
+        decompress_gog(path, dest, callback=callback)
     else:
         raise RuntimeError("specified exe is not a GOG setup file")
 
@@ -230,7 +383,7 @@ def check_inno_exe(path):
     return True
 
 
-def decompress_gog(file_path, destination_path):
+def decompress_gog(file_path, destination_path, callback=None):
     _innoextract_path = os.path.join(settings.RUNTIME_DIR, "innoextract/innoextract")
     if not system.path_exists(_innoextract_path):
         _innoextract_path = system.find_executable("innoextract")
@@ -243,30 +396,83 @@ def decompress_gog(file_path, destination_path):
         if e.errno != errno.EEXIST:
             raise OSError("cannot make output directory for extracting setup file")
     command = [_innoextract_path, "-g", "-d", destination_path, "-e", file_path]
-    return_code = subprocess.call(command)
+    if callback:
+        command.append("--progress=1")
+        return_code = _read_progress_output(
+            command,
+            re.compile(r"(\d+(?:\.\d+)?)%"),
+            os.path.getsize(file_path),
+            callback,
+            file_pattern=re.compile(r"^\s*- \""),
+        )
+    else:
+        return_code = subprocess.call(command)
     if return_code != 0:
         raise RuntimeError("innoextract failed to extract GOG setup file")
 
 
-def decompress_gz(file_path, dest_path=None):
-    """Decompress a gzip file."""
+def copy_stream(source, dest, callback=None):
+    """Copy the content of the file object source to dest using a fixed size
+    buffer, so that memory use doesn't depend on the amount of data copied.
+    callback is called with the number of bytes written so far.
+    """
+    buffer = bytearray(BUFFER_SIZE)
+    view = memoryview(buffer)
+    written = 0
+    while True:
+        size = source.readinto(buffer)
+        if not size:
+            break
+        dest.write(view[:size])
+        written += size
+        if callback:
+            callback(written)
+    return written
+
+
+def _decompress_file(file_path, dest_path, extension, open_func, callback=None):
+    """Decompress a single compressed file with open_func"""
+    filename = os.path.basename(file_path)
+    if filename.endswith(extension):
+        filename = filename[:-len(extension)]
     if dest_path:
-        dest_filename = os.path.join(dest_path, os.path.basename(file_path[:-3]))
+        os.makedirs(dest_path, exist_ok=True)
+        dest_filename = os.path.join(dest_path, filename)
     else:
-        dest_filename = file_path[:-3]
+        dest_filename = os.path.join(os.path.dirname(file_path), filename)
+
+    with open(file_path, "rb") as archive_file:
+        if callback:
+            archive_file = ProgressFile(
+                archive_file,
+                lambda bytes_read, total: callback(bytes_read, total, 0)
+            )
+        with open_func(archive_file, "rb") as compressed_file:
+            with open(dest_filename, "wb") as dest_file:
+                copy_stream(compressed_file, dest_file)
+    if callback:
+        total = os.path.getsize(file_path)
+        callback(total, total, 1)
+
+    return dest_path
+
 
-    gzipped_file = gzip.open(file_path, "rb")
-    file_content = gzipped_file.read()
-    gzipped_file.close()
+def decompress_gz(file_path, dest_path=None, callback=None):
+    """Decompress a gzip file."""
+    return _decompress_file(file_path, dest_path, ".gz", gzip.open, callback=callback)
 
-    dest_file = open(dest_filename, "wb")
-    dest_file.write(file_content)
-    dest_file.close()
 
-    return dest_path
+def decompress_bz2(file_path, dest_path=None, callback=None):
+    """Decompress a bzip2 file."""
+    return _decompress_file(file_path, dest_path, ".bz2", bz2.open, callback=callback)
 
 
-def extract_7zip(path, dest, archive_type=None):
+def decompress_xz(file_path, dest_path=None, callback=None):
+    """Decompress a xz file."""
+    return _decompress_file(file_path, dest_path, ".xz", lzma.open, callback=callback)
+
+
+def extract_7zip(path, dest, archive_type=None, callback=None):
     _7zip_path = os.path.join(settings.RUNTIME_DIR, "p7zip/7z")
     if not system.path_exists(_7zip_path):
         _7zip_path = system.find_executable("7z")
@@ -275,4 +481,9 @@ def extract_7zip(path, dest, archive_type=None):
     command = [_7zip_path, "x", path, "-o{}".format(dest), "-aoa"]
     if archive_type:
         command.append("-t{}".format(archive_type))
-    subprocess.call(command)
+    if callback:
+        # Progress lines look like " 42% 12 - path/of/file"
+        command += ["-bsp1", "-bso0"]
+        _read_progress_output(command, re.compile(r"(\d+)%(?:\s+(\d+))?"), os.path.getsize(path), callback)
+    else:
+        subprocess.call(command)
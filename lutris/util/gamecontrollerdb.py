@@ -37,13 +37,20 @@ class ControllerMapping:
         self.guid = guid
         self.name = name
         self.mapping = mapping
-        self.keys = {}
-        self.parse()
+        self._keys = None
 
     def __str__(self):
         return self.name
 
+    @property
+    def keys(self):
+        """Return the SDL keys by xinput key, the mapping is parsed on first access"""
+        if self._keys is None:
+            self._keys = self.parse()
+        return self._keys
+
     def parse(self):
+        keys = {}
         key_maps = self.mapping.split(",")
         for key_map in key_maps:
             if not key_map:
@@ -52,7 +59,8 @@ class ControllerMapping:
             if xinput_key not in self.valid_keys:
                 logger.warning("Unrecognized key %s", xinput_key)
                 continue
-            self.keys[xinput_key] = sdl_key
+            keys[xinput_key] = sdl_key
+        return keys
 
 
 class GameControllerDB:
@@ -72,9 +80,24 @@ class GameControllerDB:
 
     def parsedb(self):
         with open(self.db_path, "r") as db:
-            for line in db.readlines():
+            for line in db:
                 line = line.strip()
                 if not line or line.startswith("#"):
                     continue
-                guid, name, mapping = line.strip().split(",", 2)
+                guid, name, mapping = line.split(",", 2)
                 self.controllers[guid] = ControllerMapping(guid, name, mapping)
+
+
+_CONTROLLER_DB = {}
+
+
+def get_controller_db():
+    """Return the GameControllerDB, parsed again only when the file changes"""
+    try:
+        mtime = os.path.getmtime(GameControllerDB.db_path)
+    except OSError:
+        mtime = None
+    if "db" not in _CONTROLLER_DB or _CONTROLLER_DB["mtime"] != mtime:
+        _CONTROLLER_DB["db"] = GameControllerDB()
+        _CONTROLLER_DB["mtime"] = mtime
+    return _CONTROLLER_DB["db"]
@@ -1,6 +1,8 @@
 # Standard Library
 import json
+import os
 import socket
+import tempfile
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -8,9 +10,19 @@ from ssl import CertificateError
 
 # Lutris Modules
 from lutris.settings import PROJECT, SITE_URL, VERSION
+from lutris.util import profiler
 from lutris.util.log import logger
 
 
+def _get_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+UMASK = _get_umask()
+
+
 class HTTPError(Exception):
 
     """Exception raised on request failures"""
@@ -67,14 +79,16 @@ class Request:
     def user_agent(self):
         return "{} {}".format(PROJECT, VERSION)
 
-    def get(self, data=None):
-        logger.debug("GET %s", self.url)
-        req = urllib.request.Request(url=self.url, data=data, headers=self.headers)
+    def _open(self, data=None, method=None):
+        """Send the request and return the response object"""
+        logger.debug("%s %s", method or "GET", self.url)
+        req = urllib.request.Request(url=self.url, data=data, headers=self.headers, method=method)
         try:
-            if self.opener:
-                request = self.opener.open(req, timeout=self.timeout)
-            else:
-                request = urllib.request.urlopen(req, timeout=self.timeout)
+            with profiler.phase("%s %s" % (method or "GET", self.url), "http"):
+                if self.opener:
+                    request = self.opener.open(req, timeout=self.timeout)
+                else:
+                    request = urllib.request.urlopen(req, timeout=self.timeout)
         except (urllib.error.HTTPError, CertificateError) as error:
             if error.code == 401:
                 raise UnauthorizedAccess("Access to %s denied" % self.url)
@@ -93,34 +107,69 @@ class Request:
         self.status_code = request.getcode()
         if self.status_code > 299:
             logger.warning("Request responded with code %s", self.status_code)
-        self.content = b"".join(self._iter_chunks(request))
+        return request
+
+    def get(self, data=None):
+        request = self._open(data)
+        self.content = b"".join(bytes(chunk) for chunk in self._iter_chunks(request))
         self.info = request.info()
         request.close()
         return self
 
+    def head(self):
+        """Send a HEAD request, only the response headers are retrieved"""
+        request = self._open(method="HEAD")
+        self.info = request.info()
+        request.close()
+        return self
+
+    def get_to_file(self, path, data=None, callback=None):
+        """Send the request and write the response to path as it is received,
+        without keeping it in memory. callback is called with the number of
+        bytes received and the total size after each chunk."""
+        request = self._open(data)
+        self.info = request.info()
+        # Write next to path so that an interrupted download never replaces it
+        temp_fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".part")
+        try:
+            with open(temp_fd, "wb") as dest_file:
+                # Give the file the permissions it would get if it was created with open()
+                os.fchmod(dest_file.fileno(), 0o666 & ~UMASK)
+                for chunk in self._iter_chunks(request):
+                    dest_file.write(chunk)
+                    if callback:
+                        callback(self.downloaded_size, self.total_size)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        finally:
+            request.close()
+        if not self.downloaded_size or (self.stop_request and self.stop_request.is_set()):
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, path)
+        return self
+
     def _iter_chunks(self, request):
+        buffer = bytearray(self.buffer_size)
+        view = memoryview(buffer)
         while 1:
             if self.stop_request and self.stop_request.is_set():
                 self.content = b""
                 return self
             try:
-                chunk = request.read(self.buffer_size)
+                size = request.readinto(buffer)
             except (socket.timeout, ConnectionResetError):
                 raise HTTPError("Request timed out")
-            self.downloaded_size += len(chunk)
-            if not chunk:
+            self.downloaded_size += size
+            if not size:
                 return
-            yield chunk
+            yield view[:size]
 
     def post(self, data):
         raise NotImplementedError
 
-    def write_to_file(self, path):
-        content = self.content
-        if content:
-            with open(path, "wb") as dest_file:
-                dest_file.write(content)
-
     @property
     def json(self):
         if self.content:
@@ -1,9 +1,13 @@
 # Standard Library
 import binascii
 import struct
+from collections import namedtuple
+
+# Third Party Libraries
+from gi.repository import Gio, GLib
 
 # Lutris Modules
-from lutris.util.gamecontrollerdb import GameControllerDB
+from lutris.util.gamecontrollerdb import get_controller_db
 from lutris.util.log import logger
 
 try:
@@ -11,12 +15,69 @@ try:
 except ImportError:
     evdev = None
 
+INPUT_DEVICES_PATH = "/dev/input"
+
+# What is kept of an evdev.InputDevice, so that devices don't stay open
+InputDevice = namedtuple("InputDevice", ("fn", "name", "info", "phys", "uniq"))
+
+
+class InputDeviceIndex:
+
+    """Input devices, enumerated once and kept up to date by watching /dev/input"""
+
+    def __init__(self, path=INPUT_DEVICES_PATH):
+        self.path = path
+        self.monitor = None
+        self._devices = None
+
+    def _watch(self):
+        try:
+            self.monitor = Gio.File.new_for_path(self.path).monitor_directory(Gio.FileMonitorFlags.NONE, None)
+        except GLib.Error as ex:
+            logger.warning("Unable to watch %s for input devices: %s", self.path, ex)
+            return
+        self.monitor.connect("changed", self._on_directory_changed)
+
+    def _on_directory_changed(self, _monitor, _file, _other_file, _event_type):
+        self.invalidate()
+
+    def invalidate(self):
+        self._devices = None
+
+    @staticmethod
+    def read_devices():
+        """Open every input device and return what is needed of them"""
+        devices = []
+        for device_path in evdev.list_devices():
+            try:
+                device = evdev.InputDevice(device_path)
+            except OSError as ex:
+                logger.debug("Unable to open %s: %s", device_path, ex)
+                continue
+            devices.append(InputDevice(device_path, device.name, device.info, device.phys, device.uniq))
+            device.close()
+        return devices
+
+    def get_devices(self):
+        if self._devices is not None:
+            return self._devices
+        if not self.monitor:
+            self._watch()
+        devices = self.read_devices()
+        if self.monitor:
+            # Without a monitor, new devices can't be noticed and they are read every time
+            self._devices = devices
+        return devices
+
+
+INPUT_DEVICE_INDEX = InputDeviceIndex()
+
 
 def get_devices():
     if not evdev:
         logger.warning("python3-evdev not installed, controller support not available")
         return []
-    return [evdev.InputDevice(dev) for dev in evdev.list_devices()]
+    return INPUT_DEVICE_INDEX.get_devices()
 
 
 def get_joypads():
@@ -50,7 +111,9 @@ def get_sdl_identifier(device_info):
 
 def get_controller_mappings():
     devices = get_devices()
-    controller_db = GameControllerDB()
+    if not devices:
+        return []
+    controller_db = get_controller_db()
 
     controllers = []
 
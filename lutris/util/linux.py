@@ -8,9 +8,11 @@ import resource
 import shutil
 import subprocess
 import sys
+import threading
 from collections import Counter, defaultdict
 
 # Lutris Modules
+from lutris import settings
 from lutris.util import system
 from lutris.util.disks import get_drive_for_path
 from lutris.util.graphics import drivers, glxinfo, vkquery
@@ -22,6 +24,9 @@ except ImportError:
     logger.warning("Package 'distro' unavailable. Unable to read Linux distribution")
     linux_distribution = None
 
+SYSTEM_CACHE_PATH = os.path.join(settings.CACHE_DIR, "system.json")
+NVIDIA_VERSION_PATH = "/proc/driver/nvidia/version"
+
 # Linux components used by lutris
 SYSTEM_COMPONENTS = {
     "COMMANDS": [
@@ -86,9 +91,11 @@ SYSTEM_COMPONENTS = {
 
 class LinuxSystem:  # pylint: disable=too-many-public-methods
 
-    """Global cache for system commands"""
+    """Global cache for system commands
 
-    _cache = {}
+    Probes run on first access. The commands found in PATH, the ldconfig
+    libraries and the glxinfo output are persisted in SYSTEM_CACHE_PATH.
+    """
 
     multiarch_lib_folders = [
         ("/lib", "/lib64"),
@@ -111,23 +118,82 @@ class LinuxSystem:  # pylint: disable=too-many-public-methods
     flatpak_info_path = "/.flatpak-info"
 
     def __init__(self):
-        for key in ("COMMANDS", "TERMINALS"):
-            self._cache[key] = {}
-            for command in SYSTEM_COMPONENTS[key]:
-                command_path = shutil.which(command)
-                if not command_path:
-                    command_path = self.get_sbin_path(command)
-                if command_path:
-                    self._cache[key][command] = command_path
-
         # Detect if system is 64bit capable
         self.is_64_bit = sys.maxsize > 2**32
         self.arch = self.get_arch()
-        self.shared_libraries = self.get_shared_libraries()
-        self.populate_libraries()
-        self.populate_sound_fonts()
-        self.soft_limit, self.hard_limit = self.get_file_limits()
-        self.glxinfo = self.get_glxinfo()
+        self._cache = {}
+        self._probe_lock = threading.RLock()
+        self._disk_cache = None
+
+    @staticmethod
+    def get_cache_key():
+        """Return the values that invalidate the persisted probes when they change"""
+        try:
+            ld_cache_mtime = os.stat("/etc/ld.so.cache").st_mtime_ns
+        except OSError:
+            ld_cache_mtime = None
+        nvidia_version = None
+        if os.path.exists(NVIDIA_VERSION_PATH):
+            with open(NVIDIA_VERSION_PATH) as version_file:
+                nvidia_version = version_file.readline().strip()
+        return [os.environ.get("PATH", ""), ld_cache_mtime, platform.release(), nvidia_version]
+
+    def _load_disk_cache(self):
+        """Return the persisted probes if they are still valid"""
+        try:
+            with open(SYSTEM_CACHE_PATH) as cache_file:
+                disk_cache = json.load(cache_file)
+        except (OSError, ValueError):
+            return {"key": self.get_cache_key()}
+        key = self.get_cache_key()
+        if not isinstance(disk_cache, dict) or disk_cache.get("key") != key:
+            return {"key": key}
+        return disk_cache
+
+    def _save_disk_cache(self):
+        temp_path = "%s.%s.tmp" % (SYSTEM_CACHE_PATH, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(SYSTEM_CACHE_PATH), exist_ok=True)
+            with open(temp_path, "w") as cache_file:
+                json.dump(self._disk_cache, cache_file)
+            os.replace(temp_path, SYSTEM_CACHE_PATH)
+        except OSError as ex:
+            logger.warning("Failed to save the system cache: %s", ex)
+
+    def _get_probe(self, name, probe, persist=True):
+        """Return the result of probe, computed on first access only.
+        Persisted results are reused across runs until the cache key changes."""
+        if name in self._cache:
+            return self._cache[name]
+        with self._probe_lock:
+            if name in self._cache:
+                return self._cache[name]
+            if persist:
+                if self._disk_cache is None:
+                    self._disk_cache = self._load_disk_cache()
+                if name in self._disk_cache:
+                    value = self._disk_cache[name]
+                else:
+                    value = probe()
+                    if value:
+                        self._disk_cache[name] = value
+                        self._save_disk_cache()
+            else:
+                value = probe()
+            self._cache[name] = value
+        return value
+
+    @staticmethod
+    def find_commands(commands):
+        """Return the paths of the available commands"""
+        command_paths = {}
+        for command in commands:
+            command_path = shutil.which(command)
+            if not command_path:
+                command_path = LinuxSystem.get_sbin_path(command)
+            if command_path:
+                command_paths[command] = command_path
+        return command_paths
 
     @staticmethod
     def get_sbin_path(command):
@@ -142,6 +208,14 @@ class LinuxSystem:  # pylint: disable=too-many-public-methods
     def get_file_limits():
         return resource.getrlimit(resource.RLIMIT_NOFILE)
 
+    @property
+    def soft_limit(self):
+        return self._get_probe("FILE_LIMITS", self.get_file_limits, persist=False)[0]
+
+    @property
+    def hard_limit(self):
+        return self._get_probe("FILE_LIMITS", self.get_file_limits, persist=False)[1]
+
     def has_enough_file_descriptors(self):
         return self.hard_limit >= self.recommended_no_file_open
 
@@ -247,11 +321,22 @@ class LinuxSystem:  # pylint: disable=too-many-public-methods
                 if "/dev/%s" % partition["name"] == path_drive:
                     return partition["fstype"]
 
+    @property
+    def glxinfo(self):
+        return self._get_probe("GLXINFO", self.get_glxinfo, persist=False)
+
+    @property
+    def shared_libraries(self):
+        return self._get_probe("SHARED_LIBRARIES", self.get_shared_libraries, persist=False)
+
     def get_glxinfo(self):
         """Return a GlxInfo instance if the gfxinfo tool is available"""
         if not self.get("glxinfo"):
             return
-        _glxinfo = glxinfo.GlxInfo()
+        output = self._get_probe("GLXINFO_OUTPUT", glxinfo.GlxInfo.get_glxinfo_output)
+        if not output:
+            return
+        _glxinfo = glxinfo.GlxInfo(output)
         if not hasattr(_glxinfo, "display"):
             logger.warning("Invalid glxinfo received")
             return
@@ -268,15 +353,15 @@ class LinuxSystem:  # pylint: disable=too-many-public-methods
 
     def get(self, command):
         """Return a system command path if available"""
-        return self._cache["COMMANDS"].get(command)
+        return self._get_probe("COMMANDS", lambda: self.find_commands(SYSTEM_COMPONENTS["COMMANDS"])).get(command)
 
     def get_terminals(self):
         """Return list of installed terminals"""
-        return list(self._cache["TERMINALS"].values())
+        return list(self._get_probe("TERMINALS", lambda: self.find_commands(SYSTEM_COMPONENTS["TERMINALS"])).values())
 
     def get_soundfonts(self):
         """Return path of available soundfonts"""
-        return self._cache["SOUNDFONTS"]
+        return self._get_probe("SOUNDFONTS", self.get_sound_fonts, persist=False)
 
     def get_lib_folders(self):
         """Return shared library folders, sorted by most used to least used"""
@@ -306,6 +391,9 @@ class LinuxSystem:  # pylint: disable=too-many-public-methods
 
     def get_ldconfig_libs(self):
         """Return a list of available libraries, as returned by `ldconfig -p`."""
+        return self._get_probe("LDCONFIG", self._read_ldconfig_libs)
+
+    def _read_ldconfig_libs(self):
         ldconfig = self.get("ldconfig")
         if not ldconfig:
             logger.error("Could not detect ldconfig on this system")
@@ -333,29 +421,32 @@ class LinuxSystem:  # pylint: disable=too-many-public-methods
             shared_libraries[lib.name].append(lib)
         return shared_libraries
 
-    def populate_libraries(self):
-        """Populates the LIBRARIES cache with what is found on the system"""
-        self._cache["LIBRARIES"] = {}
+    def get_libraries(self):
+        """Return the required libraries found on the system, by architecture"""
+        libraries = {}
         for arch in self.runtime_architectures:
-            self._cache["LIBRARIES"][arch] = defaultdict(list)
+            libraries[arch] = defaultdict(list)
         for req in self.requirements:
             for lib in SYSTEM_COMPONENTS["LIBRARIES"][req]:
                 for shared_lib in self.shared_libraries[lib]:
-                    self._cache["LIBRARIES"][shared_lib.arch][req].append(lib)
+                    libraries[shared_lib.arch][req].append(lib)
+        return libraries
 
-    def populate_sound_fonts(self):
-        """Populates the soundfont cache"""
-        self._cache["SOUNDFONTS"] = []
+    def get_sound_fonts(self):
+        """Return the soundfonts found on the system"""
+        soundfonts = []
         for folder in self.soundfont_folders:
             if not os.path.exists(folder):
                 continue
             for soundfont in os.listdir(folder):
-                self._cache["SOUNDFONTS"].append(soundfont)
+                soundfonts.append(soundfont)
+        return soundfonts
 
     def get_missing_requirement_libs(self, req):
         """Return a list of sets of missing libraries for each supported architecture"""
         required_libs = set(SYSTEM_COMPONENTS["LIBRARIES"][req])
-        return [list(required_libs - set(self._cache["LIBRARIES"][arch][req])) for arch in self.runtime_architectures]
+        libraries = self._get_probe("LIBRARIES", self.get_libraries, persist=False)
+        return [list(required_libs - set(libraries[arch][req])) for arch in self.runtime_architectures]
 
     def get_missing_libs(self):
         """Return a dictionary of missing libraries"""
@@ -432,7 +523,7 @@ def gather_system_info():
     system_info["dist"] = LINUX_SYSTEM.get_dist_info()
     system_info["arch"] = LINUX_SYSTEM.get_arch()
     system_info["kernel"] = LINUX_SYSTEM.get_kernel_version()
-    system_info["glxinfo"] = glxinfo.GlxInfo().as_dict()
+    system_info["glxinfo"] = LINUX_SYSTEM.glxinfo.as_dict() if LINUX_SYSTEM.glxinfo else {}
     return system_info
 
 
@@ -0,0 +1,154 @@
+"""Startup profiling
+
+Set LUTRIS_PROFILE or pass --profile to record the duration of the startup
+phases, subprocess spawns, SQL queries and HTTP requests. A summary is
+printed on exit. When LUTRIS_PROFILE is a path ending in .json, a Chrome
+trace (chrome://tracing) is written to it, a path ending in .prof gets
+cProfile statistics instead.
+"""
+# Standard Library
+import atexit
+import cProfile
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Lutris Modules
+from lutris.util.log import logger
+
+PROFILE_ENV = "LUTRIS_PROFILE"
+SUMMARY_SIZE = 30
+
+
+class Profiler:
+
+    """Record named events with their durations"""
+
+    def __init__(self):
+        self.enabled = False
+        self.output_path = None
+        self.events = []
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._cprofile = None
+
+    def enable(self, output_path=None):
+        """Start recording events, the results are dumped at exit"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.output_path = output_path
+        if output_path and output_path.endswith(".prof"):
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._hook_subprocess()
+        atexit.register(self.dump)
+
+    def _hook_subprocess(self):
+        """Time the spawn of every process, whatever module starts it"""
+        popen_init = subprocess.Popen.__init__
+
+        def timed_init(popen, args, *init_args, **init_kwargs):
+            with self.phase(get_command_name(args), "subprocess"):
+                popen_init(popen, args, *init_args, **init_kwargs)
+
+        subprocess.Popen.__init__ = timed_init
+
+    def record(self, name, category, start, duration):
+        """Add an event, start is a time.perf_counter() value"""
+        with self._lock:
+            self.events.append((name, category, start - self.origin, duration, threading.get_ident()))
+
+    @contextmanager
+    def phase(self, name, category="phase"):
+        """Record the time spent in the with block (or decorated function)"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, category, start, time.perf_counter() - start)
+
+    def get_summary(self):
+        """Return a table of the events by total duration"""
+        totals = defaultdict(lambda: [0, 0.0, 0.0])
+        for name, category, _start, duration, _thread in self.events:
+            total = totals[(category, name)]
+            total[0] += 1
+            total[1] += duration
+            total[2] = max(total[2], duration)
+        lines = ["{:<11} {:>6} {:>10} {:>10}  {}".format("Category", "Calls", "Total ms", "Max ms", "Name")]
+        for (category, name), (count, duration, max_duration) in sorted(
+            totals.items(), key=lambda item: item[1][1], reverse=True
+        )[:SUMMARY_SIZE]:
+            lines.append("{:<11} {:>6} {:>10.1f} {:>10.1f}  {}".format(
+                category, count, duration * 1000, max_duration * 1000, name[:80]
+            ))
+        lines.append("Recorded %d events over %0.1f ms" % (len(self.events), (time.perf_counter() - self.origin) * 1000))
+        return "\n".join(lines)
+
+    def get_chrome_trace(self):
+        """Return the events in the Chrome trace event format"""
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": start * 1000000,
+                    "dur": duration * 1000000,
+                    "pid": os.getpid(),
+                    "tid": thread,
+                } for name, category, start, duration, thread in self.events
+            ]
+        }
+
+    def dump(self):
+        """Print the summary and write the output file if one was requested"""
+        if not self.enabled:
+            return
+        sys.stderr.write(self.get_summary() + "\n")
+        if not self.output_path:
+            return
+        try:
+            if self._cprofile:
+                self._cprofile.disable()
+                self._cprofile.dump_stats(self.output_path)
+            else:
+                with open(self.output_path, "w") as trace_file:
+                    json.dump(self.get_chrome_trace(), trace_file)
+        except OSError as ex:
+            logger.error("Failed to write the profile to %s: %s", self.output_path, ex)
+            return
+        logger.info("Profile written to %s", self.output_path)
+
+
+def get_command_name(args):
+    """Return a short name for a command given to subprocess"""
+    if isinstance(args, (str, bytes, os.PathLike)):
+        args = os.fsdecode(args).split()
+    if not args:
+        return "?"
+    return os.path.basename(str(args[0]))
+
+
+PROFILER = Profiler()
+phase = PROFILER.phase
+
+
+def enable_from_environment():
+    """Enable the profiler if LUTRIS_PROFILE is set"""
+    value = os.environ.get(PROFILE_ENV)
+    if not value or value == "0":
+        return
+    PROFILER.enable(output_path=value if value.endswith((".json", ".prof")) else None)
+
+
+enable_from_environment()
@@ -1,11 +1,14 @@
 """Utility module to handle media resources"""
+import concurrent.futures
 import os
+import threading
 
 from gi.repository import GLib
 
 from lutris import settings
 from lutris.util import system
 from lutris.util.http import HTTPError, Request
+from lutris.util.log import logger
 
 
 def get_icon_path(game_slug, icon_type="icon"):
@@ -39,8 +42,50 @@ def download_media(url, dest, overwrite=False):
         else:
             return dest
     try:
-        request = Request(url).get()
+        Request(url).get_to_file(dest)
     except HTTPError:
         return
-    request.write_to_file(dest)
     return dest
+
+
+class MediaFetcher:
+
+    """Download media files in parallel, with a bounded number of workers.
+
+    The callback is called from a worker thread with lists of the keys of
+    the finished downloads, once batch_size downloads are done or when no
+    download is left in the queue.
+    """
+
+    def __init__(self, callback=None, max_workers=8, batch_size=50):
+        self.callback = callback
+        self.batch_size = batch_size
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._done = []
+
+    def queue(self, key, url, dest, overwrite=False):
+        """Download url to dest in the background, key is reported to the callback"""
+        with self._lock:
+            self._pending += 1
+        future = self.executor.submit(download_media, url, dest, overwrite=overwrite)
+        future.add_done_callback(lambda done_future: self._on_download_done(key, done_future))
+
+    def _on_download_done(self, key, future):
+        batch = None
+        with self._lock:
+            self._pending -= 1
+            try:
+                if future.result():
+                    self._done.append(key)
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.exception("Failed to download media for %s: %s", key, ex)
+            if self._done and (len(self._done) >= self.batch_size or not self._pending):
+                batch, self._done = self._done, []
+        if batch and self.callback:
+            self.callback(batch)
+
+    def shutdown(self, wait=True):
+        """Stop accepting downloads, wait for the queued ones if requested"""
+        self.executor.shutdown(wait=wait)
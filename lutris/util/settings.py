@@ -1,6 +1,8 @@
 # Standard Library
+import atexit
 import configparser
 import os
+import threading
 
 # Lutris Modules
 from lutris.util.log import logger
@@ -8,11 +10,20 @@ from lutris.util.log import logger
 
 class SettingsIO:
 
-    """ConfigParser abstraction."""
+    """ConfigParser abstraction.
+
+    Settings are updated in memory right away and written to disk once no
+    setting has been changed for `write_delay` seconds, or at exit.
+    """
+
+    write_delay = 1  # Seconds
 
     def __init__(self, config_file):
         self.config_file = config_file
         self.config = configparser.ConfigParser()
+        self._lock = threading.RLock()
+        self._write_timer = None
+        self._is_dirty = False
         if os.path.exists(self.config_file):
             try:
                 self.config.read([self.config_file])
@@ -20,6 +31,7 @@ class SettingsIO:
                 logger.error("Failed to readconfig file %s: %s", self.config_file, ex)
             except UnicodeDecodeError as ex:
                 logger.error("Some invalid characters are preventing " "the setting file from loading properly: %s", ex)
+        atexit.register(self.flush)
 
     def read_setting(self, key, section="lutris", default=""):
         """Read a setting from the config file
@@ -29,15 +41,38 @@ class SettingsIO:
             section (str): Optional section, default to 'lutris'
             default (str): Default value to return if setting not present
         """
-        try:
-            return self.config.get(section, key)
-        except (configparser.NoOptionError, configparser.NoSectionError):
-            return default
+        with self._lock:
+            try:
+                return self.config.get(section, key)
+            except (configparser.NoOptionError, configparser.NoSectionError):
+                return default
 
     def write_setting(self, key, value, section="lutris"):
-        if not self.config.has_section(section):
-            self.config.add_section(section)
-        self.config.set(section, key, str(value))
+        with self._lock:
+            if not self.config.has_section(section):
+                self.config.add_section(section)
+            self.config.set(section, key, str(value))
+            self._is_dirty = True
+            if self._write_timer:
+                self._write_timer.cancel()
+            self._write_timer = threading.Timer(self.write_delay, self.flush)
+            self._write_timer.daemon = True
+            self._write_timer.start()
+
+    def flush(self):
+        """Write pending changes to the config file"""
+        with self._lock:
+            if self._write_timer:
+                self._write_timer.cancel()
+                self._write_timer = None
+            if not self._is_dirty:
+                return
+            self._write_config()
+            self._is_dirty = False
 
-        with open(self.config_file, "w") as config_file:
+    def _write_config(self):
+        """Write the config to a temporary file then move it in place"""
+        temp_path = self.config_file + ".tmp"
+        with open(temp_path, "w") as config_file:
             self.config.write(config_file)
+        os.replace(temp_path, self.config_file)
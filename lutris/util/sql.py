@@ -1,8 +1,10 @@
 # Standard Library
 import sqlite3
 import time
+from urllib.request import pathname2url
 
 # Lutris Modules
+from lutris.util import profiler
 from lutris.util.log import logger
 
 # Number of attempts to retry failed queries
@@ -11,17 +13,22 @@ DB_RETRIES = 5
 
 class db_cursor(object):
 
-    def __init__(self, db_path):
+    def __init__(self, db_path, read_only=False):
         self.db_path = db_path
+        self.read_only = read_only
         self.db_conn = None
 
     def __enter__(self):
-        self.db_conn = sqlite3.connect(self.db_path)
+        if self.read_only:
+            self.db_conn = sqlite3.connect("file:%s?mode=ro" % pathname2url(self.db_path), uri=True)
+        else:
+            self.db_conn = sqlite3.connect(self.db_path)
         cursor = self.db_conn.cursor()
         return cursor
 
     def __exit__(self, _type, value, traceback):
-        self.db_conn.commit()
+        if not self.read_only:
+            self.db_conn.commit()
         self.db_conn.close()
 
 
@@ -32,7 +39,8 @@ def cursor_execute(cursor, query, params=None):
         params = ()
     while True:
         try:
-            return cursor.execute(query, params)
+            with profiler.phase(query, "sql"):
+                return cursor.execute(query, params)
         except sqlite3.OperationalError as ex:
             i += 1
             if i == DB_RETRIES:
@@ -114,8 +122,8 @@ def db_select(db_path, table, fields=None, condition=None):
     return results
 
 
-def db_query(db_path, query, params=()):
-    with db_cursor(db_path) as cursor:
+def db_query(db_path, query, params=(), read_only=False):
+    with db_cursor(db_path, read_only=read_only) as cursor:
         cursor_execute(cursor, query, params)
         rows = cursor.fetchall()
         column_names = [column[0] for column in cursor.description]
@@ -1,4 +1,7 @@
 """System utilities"""
+import concurrent.futures
+import errno
+import fcntl
 import hashlib
 import os
 import re
@@ -10,6 +13,10 @@ import subprocess
 from lutris.util.linux import LINUX_SYSTEM
 from lutris.util.log import logger
 
+# ioctl request to share the data blocks of a file, from linux/fs.h
+FICLONE = 0x40049409
+COPY_BUFFER_SIZE = 1024 * 1024  # Bytes
+
 
 def execute(command, env=None, cwd=None, log_errors=False, quiet=False, shell=False, timeout=None):
     """
@@ -168,25 +175,117 @@ def substitute(string_template, variables):
     return template.safe_substitute(variables)
 
 
-def merge_folders(source, destination):
-    """Merges the content of source to destination"""
+def _reflink_file(source_file, dest_file):
+    """Make dest_file share the data of source_file, return whether the
+    filesystem supports it."""
+    try:
+        fcntl.ioctl(dest_file.fileno(), FICLONE, source_file.fileno())
+    except OSError:
+        return False
+    return True
+
+
+def _copy_file_range(source_file, dest_file):
+    """Copy a file in kernel space, return False if copy_file_range is not
+    available for those files."""
+    if not hasattr(os, "copy_file_range"):
+        return False
+    source_fd = source_file.fileno()
+    dest_fd = dest_file.fileno()
+    try:
+        copied = os.copy_file_range(source_fd, dest_fd, COPY_BUFFER_SIZE * 64)
+    except OSError as ex:
+        if ex.errno in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+            return False
+        raise
+    while copied:
+        copied = os.copy_file_range(source_fd, dest_fd, COPY_BUFFER_SIZE * 64)
+    return True
+
+
+def copy_file(source, destination):
+    """Copy the file source and its permissions to destination, which can be a
+    directory. A reflink is made when the filesystem supports it, otherwise the
+    data is copied in kernel space with copy_file_range or with a buffered copy.
+    Returns the path of the new file.
+    """
+    if os.path.isdir(destination):
+        destination = os.path.join(destination, os.path.basename(source))
+    # Opening destination for writing would truncate source
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        raise shutil.SameFileError("{!r} and {!r} are the same file".format(source, destination))
+    with open(source, "rb") as source_file:
+        with open(destination, "wb") as dest_file:
+            if not _reflink_file(source_file, dest_file) and not _copy_file_range(source_file, dest_file):
+                shutil.copyfileobj(source_file, dest_file, COPY_BUFFER_SIZE)
+    shutil.copymode(source, destination)
+    return destination
+
+
+def clone_file(source, destination):
+    """Make destination a copy of source that shares its data, with a reflink
+    if the filesystem supports it or a hardlink otherwise. Falls back to a
+    regular copy when source and destination are on different filesystems.
+    """
+    if os.path.lexists(destination):
+        os.remove(destination)
+    with open(source, "rb") as source_file:
+        with open(destination, "wb") as dest_file:
+            if _reflink_file(source_file, dest_file):
+                shutil.copymode(source, destination)
+                return destination
+    os.remove(destination)
+    try:
+        os.link(source, destination)
+    except OSError:
+        copy_file(source, destination)
+    return destination
+
+
+def is_same_filesystem(source, destination):
+    """Return whether two existing paths are on the same filesystem"""
+    return os.stat(source).st_dev == os.stat(destination).st_dev
+
+
+def merge_folders(source, destination, move=False, max_workers=8):
+    """Merges the content of source to destination.
+    If move is set, source is considered disposable and its content gets moved
+    instead of copied when both folders are on the same filesystem.
+    """
     logger.debug("Merging %s into %s", source, destination)
     source = os.path.abspath(source)
-    for (dirpath, dirnames, filenames) in os.walk(source):
-        source_relpath = dirpath[len(source):].strip("/")
-        dst_abspath = os.path.join(destination, source_relpath)
-        for dirname in dirnames:
-            new_dir = os.path.join(dst_abspath, dirname)
-            logger.debug("creating dir: %s", new_dir)
-            try:
-                os.mkdir(new_dir)
-            except OSError:
-                pass
-        for filename in filenames:
-            # logger.debug("Copying %s", filename)
-            if not os.path.exists(dst_abspath):
-                os.makedirs(dst_abspath)
-            shutil.copy(os.path.join(dirpath, filename), os.path.join(dst_abspath, filename))
+    if not os.path.exists(destination):
+        os.makedirs(destination)
+    move = move and is_same_filesystem(source, destination)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        copies = []
+        for (dirpath, dirnames, filenames) in os.walk(source):
+            source_relpath = dirpath[len(source):].strip("/")
+            dst_abspath = os.path.join(destination, source_relpath)
+            for dirname in list(dirnames):
+                new_dir = os.path.join(dst_abspath, dirname)
+                if move and not os.path.lexists(new_dir):
+                    # Nothing to merge with, move the whole folder at once
+                    os.rename(os.path.join(dirpath, dirname), new_dir)
+                    dirnames.remove(dirname)
+                    continue
+                logger.debug("creating dir: %s", new_dir)
+                try:
+                    os.mkdir(new_dir)
+                except OSError:
+                    pass
+            for filename in filenames:
+                # logger.debug("Copying %s", filename)
+                if not os.path.exists(dst_abspath):
+                    os.makedirs(dst_abspath)
+                source_path = os.path.join(dirpath, filename)
+                dest_path = os.path.join(dst_abspath, filename)
+                if move:
+                    os.replace(source_path, dest_path)
+                else:
+                    copies.append(executor.submit(copy_file, source_path, dest_path))
+        for future in concurrent.futures.as_completed(copies):
+            future.result()  # Reraise copy errors
 
 
 def remove_folder(path):
@@ -3,6 +3,7 @@
 import os
 import re
 import shutil
+import struct
 import subprocess
 import tempfile
 import xml.etree.ElementTree
@@ -10,6 +11,11 @@ import xml.etree.ElementTree
 # Lutris Modules
 from lutris.util.log import logger
 
+PE_MACHINES_64 = (0x0200, 0x8664, 0xaa64)  # IA-64, x86-64 and ARM64
+REGISTRY_HEADER = "Windows Registry Editor Version 5.00\n\n"
+# Keys seen by 32-bit programs under a different path in 64-bit prefixes
+WOW64_REDIRECTED_KEYS = ("HKEY_LOCAL_MACHINE\\Software\\Classes\\", "HKEY_LOCAL_MACHINE\\Software\\")
+
 
 class CabInstaller:
 
@@ -32,6 +38,16 @@ class CabInstaller:
         """I have no clue why"""
         return key.strip("\\").replace("HKEY_CLASSES_ROOT", "HKEY_LOCAL_MACHINE\\Software\\Classes")
 
+    def redirect_key(self, key, arch):
+        """Return the path of a key written by a 32-bit component as seen by
+        64-bit programs, so that all the keys can be imported at once."""
+        if self.winearch != "win64" or arch == "win64":
+            return key
+        for redirected_key in WOW64_REDIRECTED_KEYS:
+            if key.lower().startswith(redirected_key.lower()):
+                return redirected_key + "Wow6432Node\\" + key[len(redirected_key):]
+        return key
+
     @staticmethod
     def get_arch_from_manifest(root):
         registry_keys = root.findall("{urn:schemas-microsoft-com:asm.v3}assemblyIdentity")
@@ -45,7 +61,16 @@ class CabInstaller:
 
     @staticmethod
     def get_arch_from_dll(dll_path):
-        if "x86-64" in subprocess.check_output(["file", dll_path]).decode():
+        """Return the architecture of a DLL, read from the machine type of its PE header"""
+        with open(dll_path, "rb") as dll_file:
+            dos_header = dll_file.read(64)
+            if len(dos_header) < 64 or not dos_header.startswith(b"MZ"):
+                return "win32"
+            dll_file.seek(struct.unpack_from("<I", dos_header, 0x3c)[0])
+            pe_header = dll_file.read(6)
+        if len(pe_header) < 6 or not pe_header.startswith(b"PE\0\0"):
+            return "win32"
+        if struct.unpack_from("<H", pe_header, 4)[0] in PE_MACHINES_64:
             return "win64"
         return "win32"
 
@@ -124,8 +149,8 @@ class CabInstaller:
         arch = self.get_arch_from_manifest(root)
         registry_keys = root.findall("{urn:schemas-microsoft-com:asm.v3}registryKeys")
         if registry_keys:
-            for registry_key in registry_keys[0].getchildren():
-                key = self.process_key(registry_key.attrib["keyName"])
+            for registry_key in registry_keys[0]:
+                key = self.redirect_key(self.process_key(registry_key.attrib["keyName"]), arch)
                 out += "[%s]\n" % key
                 for reg_value in registry_key.findall("{urn:schemas-microsoft-com:asm.v3}registryValue"):
                     name, value = self.process_value(reg_value, arch)
@@ -152,40 +177,42 @@ class CabInstaller:
         }
         return dest_map[(self.winearch, arch)]
 
-    def get_dll_destdir(self, dll_path):
-        if self.get_arch_from_dll(dll_path) == "win32" and self.winearch == "win64":
+    def get_dll_destdir(self, arch):
+        if arch == "win32" and self.winearch == "win64":
             return os.path.join(self.prefix, "drive_c/windows/syswow64")
         return os.path.join(self.prefix, "drive_c/windows/system32")
 
     def install_dll(self, dll_path):
-        dest_dir = self.get_dll_destdir(dll_path)
+        arch = self.get_arch_from_dll(dll_path)
+        dest_dir = self.get_dll_destdir(arch)
         logger.debug("Copying %s to %s", dll_path, dest_dir)
         shutil.copy(dll_path, dest_dir)
 
-        dest_dll_path = os.path.join(dest_dir, os.path.basename(dll_path))
         if not self.register_dlls:
             return
-        arch = self.get_arch_from_dll(dest_dll_path)
-        subprocess.call([self.get_winebin(arch), "regsvr32", os.path.basename(dest_dll_path)])
+        subprocess.call([self.get_winebin(arch), "regsvr32", os.path.basename(dll_path)])
 
-    def get_registry_files(self, output_files):
-        reg_files = []
+    def get_registry_file(self, output_files):
+        """Install the DLLs and merge the registry keys of all the manifests
+        into a single file. Return its path, None if there are no keys."""
+        registry_keys = []
         for file_path in output_files:
             if file_path.endswith(".manifest"):
-                out = "Windows Registry Editor Version 5.00\n\n"
-                outdata, arch = self.get_registry_from_manifest(file_path)
+                outdata, _arch = self.get_registry_from_manifest(file_path)
                 if outdata:
-                    out += outdata
-                    with open(os.path.join(self.tmpdir, file_path + ".reg"), "w") as reg_file:
-                        reg_file.write(out)
-                    reg_files.append((file_path + ".reg", arch))
-            if file_path.endswith(".dll"):
+                    registry_keys.append(outdata)
+            elif file_path.endswith(".dll"):
                 self.install_dll(file_path)
-        return reg_files
-
-    def apply_to_registry(self, file_path, arch):
+        if not registry_keys:
+            return None
+        reg_path = os.path.join(self.tmpdir, "component.reg")
+        with open(reg_path, "w") as reg_file:
+            reg_file.write(REGISTRY_HEADER + "".join(registry_keys))
+        return reg_path
+
+    def apply_to_registry(self, file_path):
         logger.info("Applying %s to registry", file_path)
-        subprocess.call([self.get_winebin(arch), "regedit", os.path.join(self.tmpdir, file_path)])
+        subprocess.call([self.get_winebin(self.winearch), "regedit", file_path])
 
     def extract_from_cab(self, cabfile, component):
         """Extracts files matching a `component` name from a `cabfile`
@@ -197,14 +224,20 @@ class CabInstaller:
         Returns:
             list: Files extracted from the cab file
         """
-        subprocess.check_output(["cabextract", "-F", "*%s*" % component, "-d", self.tmpdir, cabfile])
-        return [os.path.join(r, file) for r, d, f in os.walk(self.tmpdir) for file in f]
+        output = subprocess.check_output(["cabextract", "-F", "*%s*" % component, "-d", self.tmpdir, cabfile])
+        extracted_prefix = "  extracting "
+        extracted_files = [
+            line[len(extracted_prefix):] for line in output.decode(errors="replace").splitlines()
+            if line.startswith(extracted_prefix)
+        ]
+        return extracted_files or [os.path.join(r, file) for r, d, f in os.walk(self.tmpdir) for file in f]
 
     def install(self, cabfile, component):
         """Install `component` from `cabfile`"""
         logger.info("Installing %s from %s", component, cabfile)
 
-        for file_path, arch in self.get_registry_files(self.extract_from_cab(cabfile, component)):
-            self.apply_to_registry(file_path, arch)
+        registry_file = self.get_registry_file(self.extract_from_cab(cabfile, component))
+        if registry_file:
+            self.apply_to_registry(registry_file)
 
         self.cleanup()
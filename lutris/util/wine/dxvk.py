@@ -1,72 +1,152 @@
 """DXVK helper module"""
 # Standard Library
+import concurrent.futures
 import json
 import os
 import shutil
 import threading
 import time
+import urllib.error
 import urllib.request
 
 # Lutris Modules
 from lutris.settings import RUNTIME_DIR
 from lutris.util import system
-from lutris.util.downloader import Downloader
 from lutris.util.extract import extract_archive
+from lutris.util.http import HTTPError, Request
 from lutris.util.log import logger
 
 CACHE_MAX_AGE = 86400  # Re-download DXVK versions every day
+RETRY_DELAY = 600  # Seconds before retrying a failed refresh, doubled on each failure
+REQUEST_TIMEOUT = 10
 
+# Downloads started early in prelaunch, see DXVKManager.start_download
+DOWNLOAD_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+_DOWNLOADS = {}  # Futures of the downloads in progress, by archive URL
+_DOWNLOADS_LOCK = threading.Lock()
 
-@system.run_once
-def init_dxvk_versions():
 
-    def get_dxvk_versions(base_name, tags_url):
-        """Get DXVK versions from GitHub"""
-        dxvk_path = os.path.join(RUNTIME_DIR, base_name)
-        if not os.path.isdir(dxvk_path):
-            os.mkdir(dxvk_path)
-        versions_path = os.path.join(dxvk_path, base_name + "_versions.json")
-        internet_available = True
-        try:
-            urllib.request.urlretrieve(tags_url, versions_path)
-        except Exception as ex:  # pylint: disable= broad-except
-            logger.error(ex)
-            internet_available = False
-        dxvk_versions = list()
-        with open(versions_path, "r") as dxvk_tags:
-            dxvk_json = json.load(dxvk_tags)
-            for x in dxvk_json:
-                version_name = x["tag_name"].replace("v", "")
-                if internet_available or version_name in os.listdir(dxvk_path):
-                    dxvk_versions.append(version_name)
-        if not dxvk_versions:  # We don't want to set manager.DXVK_VERSIONS, if the list is empty
-            raise IndexError
-        return dxvk_versions
-
-    def init_versions(manager):
-        try:
-            manager.DXVK_VERSIONS = get_dxvk_versions(manager.base_name, manager.DXVK_TAGS_URL)
-        except (IndexError, FileNotFoundError):
-            pass
+def get_versions_path(base_name):
+    """Return the path of the last fetched list of releases"""
+    return os.path.join(RUNTIME_DIR, base_name, base_name + "_versions.json")
+
+
+def _get_refresh_state_path(base_name):
+    return os.path.join(RUNTIME_DIR, base_name, base_name + "_versions.state.json")
+
+
+def _read_refresh_state(base_name):
+    try:
+        with open(_get_refresh_state_path(base_name)) as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(data, path):
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as json_file:
+        json.dump(data, json_file)
+    os.replace(temp_path, path)
+
+
+def get_local_versions(manager, versions):
+    """Return the versions that are already downloaded, in the same order"""
+    try:
+        local_versions = set(os.listdir(manager.base_dir))
+    except OSError:
+        return []
+    return [version for version in versions if version in local_versions]
+
+
+def load_dxvk_versions(manager):
+    """Set the versions of a manager from the last fetched list of releases.
+    When the last refresh failed, only the versions available locally are
+    used, if there are any, since the others likely can't be downloaded.
+    Return False if no list was fetched yet."""
+    try:
+        with open(get_versions_path(manager.base_name)) as dxvk_tags:
+            dxvk_versions = [release["tag_name"].replace("v", "") for release in json.load(dxvk_tags)]
+    except (OSError, ValueError, TypeError, KeyError) as ex:
+        logger.debug("No %s versions available locally: %s", manager.base_name.upper(), ex)
+        return False
+    if _read_refresh_state(manager.base_name).get("failures"):
+        dxvk_versions = get_local_versions(manager, dxvk_versions) or dxvk_versions
+    if not dxvk_versions:  # We don't want to set manager.DXVK_VERSIONS, if the list is empty
+        return False
+    with manager.init_lock:
+        manager.DXVK_VERSIONS = dxvk_versions
         manager.DXVK_LATEST, manager.DXVK_PAST_RELEASES = (
-            manager.DXVK_VERSIONS[0],
-            manager.DXVK_VERSIONS[1:9],
+            dxvk_versions[0],
+            dxvk_versions[1:9],
         )
+    return True
 
-    # prevent race condition with if statement
-    with DXVKManager.init_lock:
-        # don't start init twice
-        if not DXVKManager.init_started:
-            DXVKManager.init_started = True
-            init_versions(DXVKManager)
+
+def refresh_dxvk_versions(manager):
+    """Fetch the list of releases from GitHub if the local one is older than
+    CACHE_MAX_AGE. Unchanged lists aren't downloaded again and failures are
+    retried with an increasing delay. Return True if the versions changed."""
+    now = time.time()
+    state = _read_refresh_state(manager.base_name)
+    if now < state.get("next_check", 0):
+        return False
+    versions_path = get_versions_path(manager.base_name)
+    os.makedirs(os.path.dirname(versions_path), exist_ok=True)
+    headers = {}
+    if state.get("etag") and os.path.exists(versions_path):
+        headers["If-None-Match"] = state["etag"]
+    request = urllib.request.Request(manager.DXVK_TAGS_URL, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+            releases = json.loads(response.read().decode())
+            etag = response.headers.get("ETag")
+        if not isinstance(releases, list):
+            raise ValueError("Unexpected response from %s" % manager.DXVK_TAGS_URL)
+    except urllib.error.HTTPError as ex:
+        if ex.code != 304:
+            return _on_refresh_failed(manager, state, now, ex)
+        logger.debug("%s versions are up to date", manager.base_name.upper())
+        state.update(next_check=now + CACHE_MAX_AGE, failures=0)
+        _write_json(state, _get_refresh_state_path(manager.base_name))
+        return False
+    except (OSError, ValueError) as ex:
+        return _on_refresh_failed(manager, state, now, ex)
+    _write_json(releases, versions_path)
+    _write_json({"etag": etag, "next_check": now + CACHE_MAX_AGE, "failures": 0},
+                _get_refresh_state_path(manager.base_name))
+    return load_dxvk_versions(manager)
+
+
+def _on_refresh_failed(manager, state, now, error):
+    failures = state.get("failures", 0) + 1
+    logger.warning("Failed to refresh %s versions: %s", manager.base_name.upper(), error)
+    state.update(next_check=now + min(RETRY_DELAY * 2 ** (failures - 1), CACHE_MAX_AGE), failures=failures)
+    _write_json(state, _get_refresh_state_path(manager.base_name))
+    load_dxvk_versions(manager)
+    return False
+
+
+@system.run_once
+def init_dxvk_versions():
+    """Load the known DXVK versions and refresh them when they are outdated,
+    this is meant to run in a background thread"""
+    wait_for_dxvk_init()
+    refresh_dxvk_versions(DXVKManager)
 
 
 def wait_for_dxvk_init():
-    # wait for finishing DXVK initialization and prevent race condition with if statement
+    """Make sure the last known DXVK versions are loaded, this never waits
+    for the network"""
     with DXVKManager.init_lock:
-        # in case DXVK init never got started, start it to prevent waiting indefinitely
         if not DXVKManager.init_started:
-            init_dxvk_versions()
+            DXVKManager.init_started = True
+            load_dxvk_versions(DXVKManager)
+
+
+def _forget_download(url):
+    with _DOWNLOADS_LOCK:
+        _DOWNLOADS.pop(url, None)
 
 
 class UnavailableDXVKVersion(RuntimeError):
@@ -89,7 +169,6 @@ class DXVKManager:
     base_name = "dxvk"
     base_dir = os.path.join(RUNTIME_DIR, base_name)
     dxvk_dlls = ("dxgi", "d3d11", "d3d10core", "d3d9", "d3d12")
-    latest_version = DXVK_LATEST
 
     def __init__(self, prefix, arch="win64", version=None):
         self.prefix = prefix
@@ -98,6 +177,18 @@ class DXVKManager:
         self._version = version
         self.wine_arch = arch
 
+    @property
+    def latest_version(self):
+        return self.DXVK_LATEST
+
+    def get_latest_local_version(self):
+        """Return the most recent known version that is downloaded, None if
+        there is none"""
+        for version in get_local_versions(self, self.DXVK_VERSIONS):
+            if self.is_valid_dxvk_dir(os.path.join(self.base_dir, version)):
+                return version
+        return None
+
     @property
     def version(self):
         """Return version of DXVK (latest known version if not provided)"""
@@ -110,6 +201,40 @@ class DXVKManager:
         """Return path to DXVK local cache"""
         return os.path.join(self.base_dir, self.version)
 
+    @property
+    def state_path(self):
+        """Return the path of the file recording what is enabled in the prefix"""
+        return os.path.join(self.prefix, ".%s_state.json" % self.base_name)
+
+    def read_state(self):
+        try:
+            with open(self.state_path) as state_file:
+                return json.load(state_file)
+        except (OSError, ValueError):
+            return {}
+
+    def write_state(self, dlls):
+        """Record the enabled version and the DLL symlinks, by path relative
+        to the prefix"""
+        try:
+            _write_json({"version": self.version, "arch": self.wine_arch, "dlls": dlls}, self.state_path)
+        except OSError as ex:
+            logger.warning("Failed to save the %s state of %s: %s", self.base_name.upper(), self.prefix, ex)
+
+    def is_state_current(self):
+        """Return whether the recorded state matches the requested version and
+        the DLL symlinks in the prefix"""
+        state = self.read_state()
+        if not state.get("dlls") or state.get("version") != self.version or state.get("arch") != self.wine_arch:
+            return False
+        for dll_path, target in state["dlls"].items():
+            try:
+                if os.readlink(os.path.join(self.prefix, dll_path)) != target:
+                    return False
+            except OSError:
+                return False
+        return True
+
     @staticmethod
     def is_dxvk_dll(dll_path):
         """Check if a given DLL path is provided by DXVK
@@ -143,29 +268,82 @@ class DXVKManager:
         return system.path_exists(os.path.join(self.dxvk_path, "x64", dll_name + ".dll")
                                   ) and system.path_exists(os.path.join(self.dxvk_path, "x32", dll_name + ".dll"))
 
-    def download(self):
-        """Download DXVK to the local cache"""
-        dxvk_url = self.base_url.format(self.version, self.version)
-        if self.is_available():
-            logger.warning("%s already available at %s", self.base_name.upper(), self.dxvk_path)
+    @property
+    def archive_url(self):
+        return self.base_url.format(self.version, self.version)
+
+    def start_download(self, progress_callback=None):
+        """Download DXVK in the background if it isn't available locally.
 
-        dxvk_archive_path = os.path.join(self.base_dir, os.path.basename(dxvk_url))
+        Return a future to wait for before enabling it, or None if there is
+        nothing to download. Concurrent requests for the same version share
+        the same download. progress_callback is called from the download
+        thread with the bytes received and the total size.
+        """
+        if self.is_available():
+            return None
+        url = self.archive_url
+        with _DOWNLOADS_LOCK:
+            future = _DOWNLOADS.get(url)
+            if not future:
+                if self.is_available():
+                    return None
+                logger.info("%s %s is not available yet, downloading...", self.base_name.upper(), self.version)
+                future = DOWNLOAD_EXECUTOR.submit(self._fetch, progress_callback)
+                _DOWNLOADS[url] = future
+                future.add_done_callback(lambda _future: _forget_download(url))
+        return future
+
+    def download(self, progress_callback=None):
+        """Download DXVK to the local cache and wait for it to be available"""
+        future = self.start_download(progress_callback)
+        if future:
+            future.result()
+
+    def _fetch(self, progress_callback=None):
+        """Download and extract the DXVK archive. The files are moved in place
+        only once they are all extracted and checked."""
+        url = self.archive_url
+        archive_path = os.path.join(self.base_dir, os.path.basename(url))
+        staging_path = self.dxvk_path + ".staging"
+        progress = {"percent": -1}
+
+        def on_progress(downloaded_size, total_size):
+            percent = downloaded_size * 100 // total_size if total_size else 0
+            if percent != progress["percent"]:
+                progress["percent"] = percent
+                progress_callback(downloaded_size, total_size)
 
-        downloader = Downloader(dxvk_url, dxvk_archive_path)
-        downloader.start()
-        while downloader.check_progress() < 1 and downloader.state != downloader.ERROR:
-            time.sleep(0.3)
-        if not system.path_exists(dxvk_archive_path):
+        try:
+            Request(url).get_to_file(archive_path, callback=on_progress if progress_callback else None)
+        except HTTPError as ex:
+            raise UnavailableDXVKVersion("Failed to download %s %s: %s" % (self.base_name.upper(), self.version, ex))
+        if not system.path_exists(archive_path):
             raise UnavailableDXVKVersion("Failed to download %s %s" % (self.base_name.upper(), self.version))
-        if os.stat(dxvk_archive_path).st_size:
-            extract_archive(dxvk_archive_path, self.dxvk_path, merge_single=True)
-            os.remove(dxvk_archive_path)
+        try:
+            if os.path.exists(staging_path):
+                system.remove_folder(staging_path)
+            extract_archive(archive_path, staging_path, merge_single=True)
+        finally:
+            os.remove(archive_path)
+        if not self.is_valid_dxvk_dir(staging_path):
+            system.remove_folder(staging_path)
+            raise UnavailableDXVKVersion("Invalid %s %s archive" % (self.base_name.upper(), self.version))
+        if self.is_available():
+            system.remove_folder(staging_path)
         else:
-            os.remove(dxvk_archive_path)
-            raise UnavailableDXVKVersion("Failed to download %s %s" % (self.base_name.upper(), self.version))
+            os.rename(staging_path, self.dxvk_path)
+
+    def is_valid_dxvk_dir(self, path):
+        """Return whether path has DXVK dlls for both architectures"""
+        return all(
+            any(os.path.isfile(os.path.join(path, dxvk_arch, dll + ".dll")) for dll in self.dxvk_dlls)
+            for dxvk_arch in ("x64", "x32")
+        )
 
     def enable_dxvk_dll(self, system_dir, dxvk_arch, dll):
-        """Copies DXVK dlls to the appropriate destination"""
+        """Copies DXVK dlls to the appropriate destination,
+        return the path of the DXVK dll if it was installed"""
         # Copying DXVK's version
         dxvk_dll_path = os.path.join(self.dxvk_path, dxvk_arch, "%s.dll" % dll)
         if system.path_exists(dxvk_dll_path):
@@ -183,8 +361,9 @@ class DXVKManager:
                 else:
                     os.remove(wine_dll_path)
             os.symlink(dxvk_dll_path, wine_dll_path)
-        else:
-            self.disable_dxvk_dll(system_dir, dxvk_arch, dll)
+            return dxvk_dll_path
+        self.disable_dxvk_dll(system_dir, dxvk_arch, dll)
+        return None
 
     def disable_dxvk_dll(self, system_dir, dxvk_arch, dll):  # pylint: disable=unused-argument
         """Remove DXVK DLL from Wine prefix"""
@@ -214,13 +393,23 @@ class DXVKManager:
         if not system.path_exists(self.dxvk_path):
             logger.error("%s %s is not available locally", self.base_name.upper(), self.version)
             return
+        if self.is_state_current():
+            logger.debug("%s %s is already enabled", self.base_name.upper(), self.version)
+            return
+        dlls = {}
         for system_dir, dxvk_arch, dll in self._iter_dxvk_dlls():
-            self.enable_dxvk_dll(system_dir, dxvk_arch, dll)
+            dxvk_dll_path = self.enable_dxvk_dll(system_dir, dxvk_arch, dll)
+            if dxvk_dll_path:
+                wine_dll_path = os.path.join(system_dir, "%s.dll" % dll)
+                dlls[os.path.relpath(wine_dll_path, self.prefix)] = dxvk_dll_path
+        self.write_state(dlls)
 
     def disable(self):
         """Disable DXVK for the current prefix"""
         for system_dir, dxvk_arch, dll in self._iter_dxvk_dlls():
             self.disable_dxvk_dll(system_dir, dxvk_arch, dll)
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
 
 
 class DXVKManagerNoD3D9(DXVKManager):
@@ -1,7 +1,9 @@
 """Gallium Nine helper module"""
 # Standard Library
+import json
 import os
 import shutil
+from functools import lru_cache
 
 # Lutris Modules
 from lutris.runners.commands.wine import wineexec
@@ -15,6 +17,23 @@ class NineUnavailable(RuntimeError):
     """Exception raised when Gallium Nine is not available"""
 
 
+@lru_cache(maxsize=None)
+def _find_lib_files(lib_folders, subdir, file_names):
+    """Return the paths of each file found in the subdir of the library
+    folders. Cached for the life of the process, by set of library folders."""
+    found_files = {}
+    for file_name in file_names:
+        found_files[file_name] = tuple(
+            os.path.join(lib, subdir, file_name) for lib in lib_folders
+            if os.path.exists(os.path.join(lib, subdir, file_name))
+        )
+    return found_files
+
+
+def find_lib_files(subdir, file_names):
+    return _find_lib_files(tuple(system.LINUX_SYSTEM.iter_lib_folders()), subdir, file_names)
+
+
 class NineManager:
 
     """Utility class to install and manage Gallium Nine to a Wine prefix"""
@@ -35,13 +54,7 @@ class NineManager:
         basic check for presence of d3dadapter9 library in 'd3d' subdirectory
         of system library directory
         """
-        for mesa_file in NineManager.mesa_files:
-            if not any(
-                [os.path.exists(os.path.join(lib, "d3d", mesa_file)) for lib in system.LINUX_SYSTEM.iter_lib_folders()]
-            ):
-                return False
-
-        return True
+        return all(find_lib_files("d3d", NineManager.mesa_files).values())
 
     @staticmethod
     def nine_is_installed():
@@ -49,22 +62,32 @@ class NineManager:
 
         check 'wine/fakedlls' subdirectory of system library directory for Nine binaries
         """
-        for nine_file in NineManager.nine_files:
-            if not any(
-                [
-                    os.path.exists(os.path.join(lib, "wine/fakedlls", nine_file))
-                    for lib in system.LINUX_SYSTEM.iter_lib_folders()
-                ]
-            ):
-                return False
-
-        return True
+        return all(find_lib_files("wine/fakedlls", NineManager.nine_files).values())
 
     @staticmethod
     def is_available():
         """Check if Gallium Nine can be enabled on this system"""
         return NineManager.nine_is_supported() and NineManager.nine_is_installed()
 
+    @property
+    def state_path(self):
+        """Return the path of the file recording the Nine state of the prefix"""
+        return os.path.join(self.prefix, ".nine_state.json")
+
+    def read_state(self):
+        try:
+            with open(self.state_path) as state_file:
+                return json.load(state_file)
+        except (OSError, ValueError):
+            return {}
+
+    def write_state(self, enabled):
+        try:
+            with open(self.state_path, "w") as state_file:
+                json.dump({"enabled": enabled, "arch": self.wine_arch}, state_file)
+        except OSError as ex:
+            logger.warning("Failed to save the Gallium Nine state of %s: %s", self.prefix, ex)
+
     def get_system_path(self, arch):
         """Return path of Windows system directory with binaries of chosen architecture"""
         windows_path = os.path.join(self.prefix, "drive_c/windows")
@@ -94,16 +117,15 @@ class NineManager:
         return True
 
     def prepare_prefix(self):
+        nine_file_paths = find_lib_files("wine/fakedlls", NineManager.nine_files)
         for nine_file in NineManager.nine_files:
-            for lib in system.LINUX_SYSTEM.iter_lib_folders():
-                nine_file_path = os.path.join(lib, "wine/fakedlls", nine_file)
-
-                if (os.path.exists(nine_file_path) and CabInstaller.get_arch_from_dll(nine_file_path) == "win32"):
+            for nine_file_path in nine_file_paths[nine_file]:
+                dll_arch = CabInstaller.get_arch_from_dll(nine_file_path)
+                if dll_arch == "win32":
                     shutil.copy(nine_file_path, self.get_system_path("x32"))
 
-                if self.wine_arch == "win64":
-                    if (os.path.exists(nine_file_path) and CabInstaller.get_arch_from_dll(nine_file_path) == "win64"):
-                        shutil.copy(nine_file_path, self.get_system_path("x64"))
+                if self.wine_arch == "win64" and dll_arch == "win64":
+                    shutil.copy(nine_file_path, self.get_system_path("x64"))
 
             if not os.path.exists(os.path.join(self.get_system_path("x32"), nine_file)):
                 raise NineUnavailable("could not install " + nine_file + " (x32)")
@@ -151,8 +173,13 @@ class NineManager:
             prefix=self.prefix,
             blocking=True,
         )
+        self.write_state(True)
 
     def disable(self):
+        state = self.read_state()
+        if state.get("enabled") is False and state.get("arch") == self.wine_arch:
+            # Nothing was enabled since the last time Nine was disabled
+            return
         if self.is_prefix_prepared():
             # DXVK might to restore the dll - backup it again before calling ninewinecfg
             self.move_dll(True)
@@ -166,3 +193,4 @@ class NineManager:
             )
 
             self.move_dll(False)
+        self.write_state(False)
@@ -6,11 +6,67 @@ import stat
 from textwrap import dedent
 
 # Third Party Libraries
-from gi.repository import GLib
+from gi.repository import Gio, GLib
 
 # Lutris Modules
 from lutris.settings import CACHE_DIR
 from lutris.util import system
+from lutris.util.log import logger
+
+
+class LauncherIndex:
+
+    """Names of the launchers in a folder, read once and kept up to date by
+    watching the folder"""
+
+    def __init__(self, path):
+        self.path = path
+        self.monitor = None
+        self._names = None
+
+    def _watch(self):
+        try:
+            self.monitor = Gio.File.new_for_path(self.path).monitor_directory(Gio.FileMonitorFlags.NONE, None)
+        except GLib.Error as ex:
+            logger.warning("Unable to watch %s for launchers: %s", self.path, ex)
+            return
+        self.monitor.connect("changed", self._on_directory_changed)
+
+    def _on_directory_changed(self, _monitor, _file, _other_file, _event_type):
+        self.invalidate()
+
+    def invalidate(self):
+        self._names = None
+
+    def get_names(self):
+        """Return the names of the .desktop files in the folder"""
+        if self._names is not None:
+            return self._names
+        if not self.monitor:
+            self._watch()
+        try:
+            names = {name for name in os.listdir(self.path) if name.endswith(".desktop")}
+        except OSError:
+            names = set()
+        if self.monitor:
+            # Without a monitor, changes can't be noticed and the folder is read every time
+            self._names = names
+        return names
+
+
+LAUNCHER_INDEXES = {}
+
+
+def get_launcher_index(path):
+    """Return the LauncherIndex of a folder"""
+    if path not in LAUNCHER_INDEXES:
+        LAUNCHER_INDEXES[path] = LauncherIndex(path)
+    return LAUNCHER_INDEXES[path]
+
+
+def invalidate_launcher_index(path):
+    if path in LAUNCHER_INDEXES:
+        LAUNCHER_INDEXES[path].invalidate()
 
 
 def get_xdg_entry(directory):
@@ -30,16 +86,21 @@ def get_xdg_entry(directory):
     return GLib.get_user_special_dir(special_dir[directory])
 
 
+def get_xdg_basenames(game_slug, game_id):
+    """Return the possible filenames of .desktop shortcuts, legacy ones first"""
+    return [
+        "{}.desktop".format(game_slug),
+        "{}-{}.desktop".format(game_slug, game_id),
+        "net.lutris.{}-{}.desktop".format(game_slug, game_id),
+    ]
+
+
 def get_xdg_basename(game_slug, game_id, base_dir=None):
     """Return the filename for .desktop shortcuts"""
     if base_dir:
         # When base dir is provided, lookup possible combinations
         # and return the first match
-        for path in [
-            "{}.desktop".format(game_slug),
-            "{}-{}.desktop".format(game_slug, game_id),
-            "net.lutris.{}-{}.desktop".format(game_slug, game_id),
-        ]:
+        for path in get_xdg_basenames(game_slug, game_id):
             if system.path_exists(os.path.join(base_dir, path)):
                 return path
 
@@ -79,14 +140,21 @@ def create_launcher(game_slug, game_id, game_name, desktop=False, menu=False):
         if not os.path.exists(desktop_dir):
             os.mkdir(desktop_dir)
         shutil.copy(tmp_launcher_path, os.path.join(desktop_dir, launcher_filename))
+        invalidate_launcher_index(desktop_dir)
     if menu:
-        menu_path = os.path.join(GLib.get_user_data_dir(), "applications")
+        menu_path = get_menu_dir()
         if not os.path.exists(menu_path):
             os.mkdir(menu_path)
         shutil.copy(tmp_launcher_path, os.path.join(menu_path, launcher_filename))
+        invalidate_launcher_index(menu_path)
     os.remove(tmp_launcher_path)
 
 
+def get_menu_dir():
+    """Return the folder of the user's application menu entries"""
+    return os.path.join(GLib.get_user_data_dir(), "applications")
+
+
 def get_launcher_path(game_slug, game_id):
     """Return the path of a XDG game launcher.
     When legacy is set, it will return the old path with only the slug,
@@ -101,18 +169,24 @@ def get_menu_launcher_path(game_slug, game_id):
     """Return the path to a XDG menu launcher, prioritizing legacy paths if
     they exist
     """
-    menu_dir = os.path.join(GLib.get_user_data_dir(), "applications")
+    menu_dir = get_menu_dir()
     return os.path.join(menu_dir, get_xdg_basename(game_slug, game_id, base_dir=menu_dir))
 
 
+def launcher_exists(base_dir, game_slug, game_id):
+    """Return True if base_dir has a launcher for a game, according to its index"""
+    launcher_names = get_launcher_index(base_dir).get_names()
+    return any(name in launcher_names for name in get_xdg_basenames(game_slug, game_id))
+
+
 def desktop_launcher_exists(game_slug, game_id):
     """Return True if there is an existing desktop icon for a game"""
-    return system.path_exists(get_launcher_path(game_slug, game_id))
+    return launcher_exists(GLib.get_user_special_dir(GLib.UserDirectory.DIRECTORY_DESKTOP), game_slug, game_id)
 
 
 def menu_launcher_exists(game_slug, game_id):
     """Return True if there is an existing application menu entry for a game"""
-    return system.path_exists(get_menu_launcher_path(game_slug, game_id))
+    return launcher_exists(get_menu_dir(), game_slug, game_id)
 
 
 def remove_launcher(game_slug, game_id, desktop=False, menu=False):
@@ -121,8 +195,10 @@ def remove_launcher(game_slug, game_id, desktop=False, menu=False):
         launcher_path = get_launcher_path(game_slug, game_id)
         if system.path_exists(launcher_path):
             os.remove(launcher_path)
+        invalidate_launcher_index(os.path.dirname(launcher_path))
 
     if menu:
         menu_path = get_menu_launcher_path(game_slug, game_id)
         if system.path_exists(menu_path):
             os.remove(menu_path)
+        invalidate_launcher_index(os.path.dirname(menu_path))
@@ -1,4 +1,8 @@
 """Utility functions for YAML handling"""
+# Standard Library
+import os
+import threading
+
 # Third Party Libraries
 # pylint: disable=no-member
 import yaml
@@ -7,6 +11,17 @@ import yaml
 from lutris.util.log import logger
 from lutris.util.system import path_exists
 
+# Use the libyaml bindings when PyYAML has been built with them
+try:
+    from yaml import CSafeLoader as SafeLoader, CDumper as Dumper
+except ImportError:
+    from yaml import SafeLoader, Dumper
+
+
+def load_yaml(stream):
+    """Parse a YAML document from a string or a file object"""
+    return yaml.load(stream, Loader=SafeLoader)
+
 
 def read_yaml_from_file(filename):
     """Read filename and return parsed yaml"""
@@ -15,7 +30,7 @@ def read_yaml_from_file(filename):
 
     with open(filename, "r") as yaml_file:
         try:
-            yaml_content = yaml.safe_load(yaml_file) or {}
+            yaml_content = load_yaml(yaml_file) or {}
         except (yaml.scanner.ScannerError, yaml.parser.ParserError):
             logger.error("error parsing file %s", filename)
             yaml_content = {}
@@ -24,6 +39,15 @@ def read_yaml_from_file(filename):
 
 
 def write_yaml_to_file(config, filepath):
-    yaml_config = yaml.dump(config, default_flow_style=False)
-    with open(filepath, "w") as filehandler:
-        filehandler.write(yaml_config)
+    """Write config to filepath. The content is written to a temporary file
+    which then replaces filepath, so that the file is never left truncated."""
+    yaml_config = yaml.dump(config, default_flow_style=False, Dumper=Dumper)
+    temp_path = "%s.%s-%s.tmp" % (filepath, os.getpid(), threading.get_ident())
+    try:
+        with open(temp_path, "w") as filehandler:
+            filehandler.write(yaml_config)
+        os.replace(temp_path, filepath)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
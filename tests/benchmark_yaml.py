@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Compare the speed of the pure Python and libyaml YAML loaders and dumpers
+on a large installer script and on a directory of game configs."""
+import os
+import sys
+import tempfile
+import time
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lutris.util import yaml as lutris_yaml  # noqa: E402
+
+GAME_CONFIG_COUNT = 1000
+
+
+def get_installer_script():
+    """Return an installer script with a lot of files and commands"""
+    return {
+        "files": [
+            {"file%s" % index: {"url": "https://example.com/file%s.zip" % index, "filename": "file%s.zip" % index}}
+            for index in range(500)
+        ],
+        "installer": [
+            {"extract": {"file": "file%s" % index, "dst": "$GAMEDIR/data%s" % index}}
+            for index in range(500)
+        ] + [
+            {"task": {"name": "set_regedit", "path": "HKEY_CURRENT_USER\\Software\\Game", "key": "key%s" % index,
+                      "value": "value%s" % index}}
+            for index in range(2000)
+        ],
+        "game": {"exe": "drive_c/game/game.exe", "prefix": "$GAMEDIR"},
+        "wine": {"version": "lutris-5.7-x86_64", "dxvk": True},
+        "system": {"env": {"VAR%s" % index: "value%s" % index for index in range(100)}},
+    }
+
+
+def get_game_config(index):
+    return {
+        "game": {"exe": "/home/user/Games/game%s/game.exe" % index, "prefix": "/home/user/Games/game%s" % index},
+        "system": {"env": {"DXVK_HUD": "fps"}, "disable_screen_saver": True},
+        "wine": {"version": "lutris-5.7-x86_64", "dxvk": True, "esync": True},
+    }
+
+
+def timed(label, func, *args):
+    start = time.monotonic()
+    func(*args)
+    print("%-45s %8.3fs" % (label, time.monotonic() - start))
+
+
+def read_configs(config_dir):
+    for filename in os.listdir(config_dir):
+        lutris_yaml.read_yaml_from_file(os.path.join(config_dir, filename))
+
+
+def write_configs(config_dir):
+    for index in range(GAME_CONFIG_COUNT):
+        lutris_yaml.write_yaml_to_file(get_game_config(index), os.path.join(config_dir, "game%s.yml" % index))
+
+
+def run(label):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        script_path = os.path.join(temp_dir, "installer.yml")
+        config_dir = os.path.join(temp_dir, "games")
+        os.makedirs(config_dir)
+        timed("%s: write installer script" % label, lutris_yaml.write_yaml_to_file, get_installer_script(), script_path)
+        timed("%s: read installer script" % label, lutris_yaml.read_yaml_from_file, script_path)
+        timed("%s: write %s game configs" % (label, GAME_CONFIG_COUNT), write_configs, config_dir)
+        timed("%s: read %s game configs" % (label, GAME_CONFIG_COUNT), read_configs, config_dir)
+
+
+if __name__ == "__main__":
+    if lutris_yaml.SafeLoader is yaml.SafeLoader:
+        print("PyYAML was built without libyaml, only the pure Python implementation is available")
+        run("python")
+        sys.exit()
+    run("libyaml")
+    lutris_yaml.SafeLoader, lutris_yaml.Dumper = yaml.SafeLoader, yaml.Dumper
+    run("python")
@@ -0,0 +1,33 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from lutris.runners import mednafen as mednafen_module
+from lutris.runners.mednafen import mednafen
+
+
+class TestMednafenRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.runner = mednafen()
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.cache_dir, "mednafen-joysticks.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_joysticks_are_only_detected_when_devices_change(self):
+        cache_key = {"executable": "/usr/bin/mednafen", "devices": [["/dev/input/event3", "Pad", [3, 1, 2, 3], "", ""]]}
+        with patch.object(mednafen_module, "JOYSTICKS_CACHE_PATH", self.cache_path), \
+                patch.object(self.runner, "is_installed", return_value=True), \
+                patch.object(self.runner, "get_joysticks_cache_key", return_value=cache_key), \
+                patch.object(self.runner, "read_joystick_ids", return_value=["0x1234"]) as read_joystick_ids:
+            self.assertEqual(self.runner.find_joysticks(), ["0x1234"])
+            self.assertEqual(self.runner.find_joysticks(), ["0x1234"])
+            self.assertEqual(read_joystick_ids.call_count, 1)
+            cache_key["devices"] = []
+            read_joystick_ids.return_value = []
+            self.assertEqual(self.runner.find_joysticks(), [])
+            self.assertEqual(read_joystick_ids.call_count, 2)
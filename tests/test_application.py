@@ -0,0 +1,27 @@
+import socket
+import subprocess
+from unittest.mock import patch
+
+import gi
+
+gi.require_version('Gtk', '3.0')
+
+from lutris import pga
+from lutris.gui.application import Application
+from test_pga import DatabaseTester
+
+
+class TestCommandLine(DatabaseTester):
+    def setUp(self):
+        super().setUp()
+        pga.add_game(name="LutrisTest", runner="linux", installed=1)
+
+    def test_list_games_is_headless(self):
+        application = Application()
+        with patch.object(subprocess, "Popen") as popen, \
+                patch.object(socket.socket, "connect") as connect, \
+                patch("lutris.gui.application.migrate") as migrate:
+            self.assertEqual(application.run(["lutris", "--list-games", "--json"]), 0)
+        popen.assert_not_called()
+        connect.assert_not_called()
+        migrate.assert_not_called()
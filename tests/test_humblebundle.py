@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from lutris.services.humblebundle import HumbleBundleService
+
+API_URL = "https://www.humblebundle.com/"
+
+
+def get_order(gamekey, machine_name, platforms):
+    return {
+        "gamekey": gamekey,
+        "product": {"human_name": machine_name},
+        "created": "2020-01-01",
+        "subproducts": [
+            {
+                "machine_name": machine_name,
+                "downloads": [{"platform": platform} for platform in platforms],
+            }
+        ],
+    }
+
+
+class TestHumbleBundleService(TestCase):
+    def setUp(self):
+        self.service = HumbleBundleService()
+        self.service.cache_path = tempfile.mkdtemp()
+        self.orders = {
+            "key1": get_order("key1", "braid", ["linux", "windows"]),
+            "key2": get_order("key2", "braid", ["linux"]),
+            "key3": get_order("key3", "fez", ["mac"]),
+        }
+        self.requested_urls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.service.cache_path)
+
+    def make_api_request(self, url):
+        self.requested_urls.append(url)
+        if url == API_URL + "api/v1/user/order":
+            return [{"gamekey": gamekey} for gamekey in self.orders]
+        gamekey = url.split("/")[-1].split("?")[0]
+        return self.orders.get(gamekey)
+
+    def test_build_index(self):
+        index = HumbleBundleService.build_index(self.orders.values())
+        self.assertEqual(index, {
+            "braid": {"linux": ["key1", "key2"], "windows": ["key1"]},
+            "fez": {"mac": ["key3"]},
+        })
+
+    def test_orders_are_indexed_and_reloaded(self):
+        with patch.object(self.service, "make_api_request", side_effect=self.make_api_request):
+            orders = self.service.get_orders()
+        self.assertEqual(sorted(order["gamekey"] for order in orders), ["key1", "key2", "key3"])
+        self.assertEqual(
+            self.service.load_index(), HumbleBundleService.build_index(self.orders.values())
+        )
+
+        # The index and orders are read from the cache, without any request
+        self.requested_urls = []
+        with patch.object(self.service, "make_api_request", side_effect=self.make_api_request):
+            self.assertEqual(self.service.get_download_gamekeys("braid", "linux"), ["key1", "key2"])
+            self.assertEqual(self.service.get_order("key2"), self.orders["key2"])
+        self.assertEqual(self.requested_urls, [])
+
+    def test_invalid_index_is_ignored(self):
+        with open(self.service.index_path, "w") as index_file:
+            index_file.write("{")
+        self.assertIsNone(self.service.load_index())
+
+    def test_order_refresh_ignores_the_cache(self):
+        with patch.object(self.service, "make_api_request", side_effect=self.make_api_request):
+            self.service.get_order("key1")
+            self.orders["key1"] = get_order("key1", "braid", ["linux", "windows", "mac"])
+            self.assertEqual(len(self.service.get_order("key1")["subproducts"][0]["downloads"]), 2)
+            refreshed_order = self.service.get_order("key1", refresh=True)
+            self.assertEqual(len(refreshed_order["subproducts"][0]["downloads"]), 3)
+            self.assertEqual(len(self.service.get_order("key1")["subproducts"][0]["downloads"]), 3)
+        self.assertEqual(len(self.requested_urls), 2)
+        self.assertTrue(os.path.exists(self.service.order_path("key1")))
@@ -1,4 +1,10 @@
+import hashlib
+import os
+import shutil
+import tempfile
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from lutris.installer import commands, download_cache
 from lutris.installer.interpreter import ScriptInterpreter
 from lutris.installer.installer import LutrisInstaller
 from lutris.installer.errors import ScriptingError
@@ -64,3 +70,103 @@ class TestScriptInterpreter(TestCase):
             )
         self.assertEqual(ex.exception.message,
                          "The command \"substitute\" does not exist.")
+
+
+class TestDownloadCache(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store_path = download_cache.STORE_PATH
+        download_cache.STORE_PATH = os.path.join(self.temp_dir, "store")
+        self.downloaded_path = os.path.join(self.temp_dir, "vcredist.exe")
+        with open(self.downloaded_path, "wb") as downloaded_file:
+            downloaded_file.write(b"vcredist")
+        self.checksum = "md5:" + hashlib.md5(b"vcredist").hexdigest()
+
+    def tearDown(self):
+        download_cache.STORE_PATH = self.store_path
+        shutil.rmtree(self.temp_dir)
+
+    def test_stored_file_is_provided_to_other_games(self):
+        url = "https://example.com/vcredist.exe"
+        download_cache.store(self.downloaded_path, url, checksum=self.checksum)
+        dest_file = os.path.join(self.temp_dir, "other-game", "vcredist.exe")
+        self.assertTrue(download_cache.fetch(url, dest_file, checksum=self.checksum))
+        with open(dest_file, "rb") as provided_file:
+            self.assertEqual(provided_file.read(), b"vcredist")
+
+    def test_stored_file_doesnt_share_its_inode(self):
+        url = "https://example.com/vcredist.exe"
+        download_cache.store(self.downloaded_path, url, checksum=self.checksum)
+        dest_file = os.path.join(self.temp_dir, "other-game", "vcredist.exe")
+        download_cache.fetch(url, dest_file, checksum=self.checksum)
+        stored_path = download_cache.lookup(url, checksum=self.checksum)
+        for path in (self.downloaded_path, dest_file):
+            self.assertFalse(os.path.samefile(path, stored_path))
+        with open(dest_file, "wb") as provided_file:
+            provided_file.write(b"patched")
+        with open(stored_path, "rb") as stored_file:
+            self.assertEqual(stored_file.read(), b"vcredist")
+
+    def test_file_not_matching_checksum_is_not_stored(self):
+        url = "https://example.com/vcredist.exe"
+        download_cache.store(self.downloaded_path, url, checksum="md5:0123")
+        self.assertIsNone(download_cache.lookup(url, checksum="md5:0123"))
+
+    def test_garbage_collection_removes_least_recently_used_files(self):
+        url = "https://example.com/vcredist.exe"
+        download_cache.store(self.downloaded_path, url, checksum=self.checksum)
+        self.assertEqual(download_cache.collect_garbage(max_size=len(b"vcredist")), 0)
+        self.assertEqual(download_cache.collect_garbage(max_size=0), len(b"vcredist"))
+        self.assertIsNone(download_cache.lookup(url, checksum=self.checksum))
+
+
+def report_progress(steps, callback=None):
+    for step in range(1, steps + 1):
+        callback(step, steps, step)
+    return steps
+
+
+class CommandsTester(commands.CommandsMixin):
+    def __init__(self, target_path):
+        self.target_path = target_path
+        self.parent = MagicMock()
+        self.cancelled = False
+        self.abort_current_task = None
+
+    def _get_file(self, file_id):
+        return os.path.join(self.target_path, file_id)
+
+    @staticmethod
+    def _substitute(template_string):
+        return template_string
+
+
+class TestExtractCommand(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for filename in ("part1.zip", "part2.zip"):
+            open(os.path.join(self.temp_dir, filename), "w").close()
+        self.commands = CommandsTester(self.temp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_extraction_stops_when_cancelled(self):
+        def cancel(*_args):
+            self.commands.cancelled = True
+
+        with patch.object(commands.GLib, "idle_add") as idle_add, \
+                patch.object(self.commands, "_killable_process_with_progress", side_effect=cancel) as extract:
+            self.commands.extract({"file": "part*.zip"})
+        self.assertEqual(extract.call_count, 1)
+        queued = [call[0][0] for call in idle_add.call_args_list]
+        self.assertNotIn(self.commands.parent.hide_extract_progress, queued)
+
+    def test_last_progress_is_delivered(self):
+        progress = []
+        result = self.commands._killable_process_with_progress(
+            lambda *args: progress.append(args), report_progress, 3
+        )
+        self.assertEqual(result, 3)
+        self.assertEqual(progress[-1], (3, 3, 3))
+        self.assertIsNone(self.commands.abort_current_task)
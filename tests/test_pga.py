@@ -1,4 +1,5 @@
 import unittest
+import unittest.mock
 import os
 from sqlite3 import OperationalError
 from lutris import pga
@@ -10,6 +11,7 @@ TEST_PGA_PATH = os.path.join(os.path.dirname(__file__), 'pga.db')
 class DatabaseTester(unittest.TestCase):
     def setUp(self):
         pga.PGA_DB = TEST_PGA_PATH
+        pga._CATEGORY_GAMES_CACHE.clear()
         if os.path.exists(TEST_PGA_PATH):
             os.remove(TEST_PGA_PATH)
         pga.syncdb()
@@ -64,6 +66,34 @@ class TestPersonnalGameArchive(DatabaseTester):
         game = pga.get_game_by_field("some-game", "slug")
         self.assertEqual(game['directory'], '/foo')
 
+    def test_can_read_games_from_a_read_only_database(self):
+        game_list = pga.get_games(read_only=True)
+        self.assertEqual(game_list[0]['id'], self.game_id)
+        with self.assertRaises(OperationalError):
+            sql.db_query(TEST_PGA_PATH, "delete from games", read_only=True)
+
+    def test_category_membership_is_cached(self):
+        category_id = pga.add_category("favorite")
+        self.assertFalse(pga.is_game_in_category(self.game_id, "favorite"))
+        pga.add_game_to_category(self.game_id, category_id)
+        self.assertTrue(pga.is_game_in_category(self.game_id, "favorite"))
+        with unittest.mock.patch.object(sql, "db_query") as db_query:
+            self.assertTrue(pga.is_game_in_category(self.game_id, "favorite"))
+            db_query.assert_not_called()
+        pga.remove_category_from_game(self.game_id, category_id)
+        self.assertEqual(pga.get_games_in_category("favorite"), [])
+
+    def test_can_update_games_in_bulk(self):
+        other_id = pga.add_game(name="other game", runner="linux")
+        games = pga.get_games_by_slugs(["lutristest", "other-game", "missing"])
+        self.assertEqual(set(games), {"lutristest", "other-game"})
+        pga.update_games_bulk([
+            {"id": self.game_id, "year": 1999, "steamid": 10},
+            {"id": other_id, "year": 2001, "steamid": 20},
+        ])
+        self.assertEqual(pga.get_game_by_field(self.game_id, "id")["year"], 1999)
+        self.assertEqual(pga.get_game_by_field(other_id, "id")["steamid"], 20)
+
     def test_get_games_is_safe(self):
         try:
             pga.get_games(select="; asdf")
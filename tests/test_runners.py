@@ -1,8 +1,12 @@
 import logging
+import os
+import shutil
+import tempfile
 from unittest.mock import patch
 
 from lutris.config import LutrisConfig
 from lutris import runners
+from lutris.util.yaml import read_yaml_from_file, write_yaml_to_file
 from test_pga import DatabaseTester
 
 LOGGER = logging.getLogger(__name__)
@@ -105,3 +109,66 @@ class ImportRunnerTest(DatabaseTester):
             self.assertEqual(game_config.runner_slug, 'wine')
             wine = wine_runner(game_config)
             self.assertEqual(wine.system_config.get('resolution'), '1680x1050')
+
+    def test_config_files_are_parsed_once(self):
+        with tempfile.TemporaryDirectory() as config_dir:
+            write_yaml_to_file({'system': {'resolution': '640x480'}}, os.path.join(config_dir, 'system.yml'))
+            with patch('lutris.settings.CONFIG_DIR', config_dir), \
+                    patch('lutris.config.read_yaml_from_file', wraps=read_yaml_from_file) as yaml_reader:
+                for _i in range(1000):
+                    config = LutrisConfig()
+                    self.assertEqual(config.system_config['resolution'], '640x480')
+                config.raw_system_config['resolution'] = '800x600'
+                config.save()
+                self.assertEqual(LutrisConfig().system_config['resolution'], '800x600')
+                self.assertEqual(yaml_reader.call_count, 1)
+
+
+class RunnerRegistryTest(DatabaseTester):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        cache_path_patch = patch.object(
+            runners, "INSTALLATION_CACHE_PATH", os.path.join(self.cache_dir, "runners-installed.json")
+        )
+        cache_path_patch.start()
+        self.addCleanup(cache_path_patch.stop)
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        runners._INSTALLATION_CACHE.clear()
+        self.addCleanup(runners._INSTALLATION_CACHE.clear)
+
+    def test_runner_info_doesnt_instantiate_runners(self):
+        runner_class = runners.import_runner("dosbox")
+        with patch.object(runner_class, "__init__", side_effect=AssertionError):
+            runner_info = runners.RunnerInfo("dosbox")
+            self.assertEqual(runner_info.human_name, runner_class.human_name)
+            self.assertEqual(runner_info.platforms, runner_class.platforms)
+            self.assertEqual(runner_info.description, runner_class.description)
+
+    def test_installation_is_cached_until_stamp_changes(self):
+        runner_info = runners.RunnerInfo("dosbox")
+        with patch.object(runners, "get_installation_stamp", return_value=1), \
+                patch.object(runner_info.runner, "is_installed", return_value=True) as is_installed:
+            self.assertTrue(runner_info.is_installed())
+            self.assertTrue(runner_info.is_installed())
+            self.assertEqual(is_installed.call_count, 1)
+            runners.get_installation_stamp.return_value = 2
+            is_installed.return_value = False
+            self.assertFalse(runner_info.is_installed())
+
+    def test_installation_is_read_from_disk_without_instantiating_runners(self):
+        runner_class = runners.import_runner("dosbox")
+        with patch.object(runners, "get_installation_stamp", return_value=[1]), \
+                patch.object(runner_class, "is_installed", return_value=True):
+            self.assertTrue(runners.RunnerInfo("dosbox").is_installed())
+        runners._INSTALLATION_CACHE.clear()
+        with patch.object(runners, "get_installation_stamp", return_value=[1]), \
+                patch.object(runner_class, "__init__", side_effect=AssertionError):
+            self.assertTrue(runners.RunnerInfo("dosbox").is_installed())
+
+    def test_installed_runners_are_new_instances(self):
+        with patch.object(runners, "get_installed_names", return_value=["dosbox"]):
+            first_runner, = runners.get_installed()
+            second_runner, = runners.get_installed()
+        self.assertIsNot(first_runner, second_runner)
+        self.assertIsNot(first_runner, runners.get_runner_info("dosbox").runner)
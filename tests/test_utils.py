@@ -1,10 +1,31 @@
+import hashlib
 import os
+import shutil
+import socket
+import subprocess
+import sys
+import tarfile
+import tempfile
+import zlib
 from collections import OrderedDict
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from lutris import runtime
+from lutris.util import display
+from lutris.util import extract
+from lutris.util import linux
+from lutris.util import profiler
+from lutris.util import resources
 from lutris.util import system
 from lutris.util.steam import vdf
 from lutris.util import strings
+from lutris.util import xdgshortcuts
 from lutris.util import fileio
+from lutris.util import http
+from lutris.util import gamecontrollerdb
+from lutris.util import joypad
+from lutris.util import yaml
+from lutris.util.settings import SettingsIO
 
 
 class TestFileUtils(TestCase):
@@ -171,3 +192,432 @@ class TestSubstitute(TestCase):
     def test_can_sub_game_files_with_dashes_in_key(self):
         replacements = {'steam-data': '/tmp'}
         self.assertEqual(system.substitute('--path=$steam-data', replacements), '--path=/tmp')
+
+
+class TestMergeFolders(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.temp_dir, "source")
+        self.destination = os.path.join(self.temp_dir, "destination")
+        os.makedirs(os.path.join(self.source, "data", "levels"))
+        os.makedirs(os.path.join(self.destination, "data"))
+        for path in ("game.sh", "data/game.dat", "data/levels/e1m1"):
+            with open(os.path.join(self.source, path), "w") as source_file:
+                source_file.write(path)
+        with open(os.path.join(self.destination, "data", "save.dat"), "w") as save_file:
+            save_file.write("save")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def assert_merged(self):
+        for path in ("game.sh", "data/game.dat", "data/levels/e1m1"):
+            with open(os.path.join(self.destination, path)) as dest_file:
+                self.assertEqual(dest_file.read(), path)
+        self.assertTrue(os.path.exists(os.path.join(self.destination, "data", "save.dat")))
+
+    def test_copy_file_keeps_permissions(self):
+        source_path = os.path.join(self.source, "game.sh")
+        os.chmod(source_path, 0o755)
+        dest_path = system.copy_file(source_path, self.destination)
+        self.assertEqual(dest_path, os.path.join(self.destination, "game.sh"))
+        self.assertEqual(os.stat(dest_path).st_mode & 0o777, 0o755)
+
+    def test_copy_file_refuses_to_copy_a_file_onto_itself(self):
+        source_path = os.path.join(self.source, "game.sh")
+        link_path = os.path.join(self.destination, "game.sh")
+        os.link(source_path, link_path)
+        for destination in (source_path, self.source, link_path):
+            with self.assertRaises(shutil.SameFileError):
+                system.copy_file(source_path, destination)
+        with open(source_path) as source_file:
+            self.assertEqual(source_file.read(), "game.sh")
+
+    def test_merge_folders_copies_files(self):
+        system.merge_folders(self.source, self.destination)
+        self.assert_merged()
+        self.assertTrue(os.path.exists(os.path.join(self.source, "data", "levels", "e1m1")))
+
+    def test_merge_folders_can_move_files(self):
+        system.merge_folders(self.source, self.destination, move=True)
+        self.assert_merged()
+        self.assertFalse(os.path.exists(os.path.join(self.source, "data", "levels")))
+        self.assertFalse(os.path.exists(os.path.join(self.source, "game.sh")))
+
+
+class TestExtractArchive(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        source_dir = os.path.join(self.temp_dir, "source", "game")
+        os.makedirs(os.path.join(source_dir, "data"))
+        with open(os.path.join(source_dir, "game.sh"), "w") as game_file:
+            game_file.write("#!/bin/sh")
+        with open(os.path.join(source_dir, "data", "game"), "w") as data_file:
+            data_file.write("data")
+        self.archive_path = os.path.join(self.temp_dir, "game.tar.gz")
+        with tarfile.open(self.archive_path, "w:gz") as archive:
+            archive.add(source_dir, arcname="game")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_extract_to_empty_directory_merges_single_folder(self):
+        dest_path = os.path.join(self.temp_dir, "dest")
+        extract.extract_archive(self.archive_path, dest_path)
+        self.assertEqual(sorted(os.listdir(dest_path)), ["data", "game.sh"])
+        self.assertTrue(os.path.isfile(os.path.join(dest_path, "data", "game")))
+
+    def test_extract_reports_progress(self):
+        progress = []
+        dest_path = os.path.join(self.temp_dir, "dest")
+        extract.extract_archive(
+            self.archive_path, dest_path, callback=lambda *args: progress.append(args)
+        )
+        archive_size = os.path.getsize(self.archive_path)
+        self.assertEqual(progress[-1], (archive_size, archive_size, 4))
+
+    def test_extract_merges_with_existing_files(self):
+        dest_path = os.path.join(self.temp_dir, "dest")
+        os.makedirs(dest_path)
+        with open(os.path.join(dest_path, "save.dat"), "w") as save_file:
+            save_file.write("save")
+        extract.extract_archive(self.archive_path, dest_path)
+        self.assertEqual(sorted(os.listdir(dest_path)), ["data", "game.sh", "save.dat"])
+
+    def test_extract_exe_archive(self):
+        exe_path = os.path.join(self.temp_dir, "setup.exe")
+        with open(exe_path, "wb") as exe_file:
+            exe_file.write(b"MZ")
+
+        def extract_7zip(path, dest, archive_type=None, callback=None):
+            with open(os.path.join(dest, "game.exe"), "w") as game_file:
+                game_file.write("game")
+
+        runtime_dir = os.path.join(self.temp_dir, "runtime")
+        os.makedirs(os.path.join(runtime_dir, "p7zip"))
+        open(os.path.join(runtime_dir, "p7zip", "7za"), "w").close()
+        dest_path = os.path.join(self.temp_dir, "dest")
+        with patch.object(extract, "check_inno_exe", return_value=False), \
+                patch.object(extract.settings, "RUNTIME_DIR", runtime_dir), \
+                patch.object(extract.subprocess, "call", return_value=0), \
+                patch.object(extract, "extract_7zip", side_effect=extract_7zip):
+            extract.extract_archive(exe_path, dest_path)
+        self.assertEqual(os.listdir(dest_path), ["game.exe"])
+
+    def test_failed_extraction_leaves_no_partial_files(self):
+        with open(self.archive_path, "r+b") as archive_file:
+            archive_file.truncate(os.path.getsize(self.archive_path) // 2)
+        dest_path = os.path.join(self.temp_dir, "dest")
+        with self.assertRaises(extract.ExtractFailure):
+            extract.extract_archive(self.archive_path, dest_path)
+        self.assertFalse(os.path.exists(dest_path))
+        os.makedirs(dest_path)
+        with self.assertRaises(extract.ExtractFailure):
+            extract.extract_archive(self.archive_path, dest_path)
+        self.assertEqual(os.listdir(dest_path), [])
+
+
+class TestDecompress(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_decompress_gz_has_bounded_memory_use(self):
+        # 1 GB of zeros, which compresses to about 1 MB
+        archive_path = os.path.join(self.temp_dir, "disk.img.gz")
+        chunk = bytes(1024 * 1024)
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        with open(archive_path, "wb") as archive:
+            for _i in range(1024):
+                archive.write(compressor.compress(chunk))
+            archive.write(compressor.flush())
+        dest_path = os.path.join(self.temp_dir, "dest")
+        # Measured in a new process so that the memory used by other tests doesn't hide the peak
+        script = (
+            "import resource, sys\n"
+            "from lutris.util import extract\n"
+            "max_rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+            "extract.decompress_gz(sys.argv[1], sys.argv[2])\n"
+            "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - max_rss_before)\n"
+        )
+        output = subprocess.check_output([sys.executable, "-c", script, archive_path, dest_path])
+        self.assertEqual(os.path.getsize(os.path.join(dest_path, "disk.img")), 1024 * 1024 * 1024)
+        # ru_maxrss is in kilobytes
+        self.assertLess(int(output.decode().strip().splitlines()[-1]), 64 * 1024)
+
+
+class TestRequest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.dest_path = os.path.join(self.temp_dir, "banner.jpg")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def get_response(self, chunks):
+        response = MagicMock()
+
+        def readinto(buffer):
+            chunk = chunks.pop(0)
+            if isinstance(chunk, Exception):
+                raise chunk
+            buffer[:len(chunk)] = chunk
+            return len(chunk)
+        response.readinto.side_effect = readinto
+        return response
+
+    def test_get_to_file_writes_the_complete_file(self):
+        request = http.Request("https://example.com/banner.jpg")
+        with patch.object(request, "_open", return_value=self.get_response([b"abc", b"def", b""])):
+            request.get_to_file(self.dest_path)
+        with open(self.dest_path, "rb") as dest_file:
+            self.assertEqual(dest_file.read(), b"abcdef")
+        self.assertEqual(os.listdir(self.temp_dir), ["banner.jpg"])
+
+    def test_concurrent_downloads_of_a_file_dont_share_their_temporary_file(self):
+        first_request = http.Request("https://example.com/banner.jpg")
+        second_request = http.Request("https://example.com/banner.jpg")
+        second_response = self.get_response([b"second", b""])
+
+        def download_second(_downloaded_size, _total_size):
+            if second_response.readinto.call_count == 0:
+                with patch.object(second_request, "_open", return_value=second_response):
+                    second_request.get_to_file(self.dest_path)
+
+        with patch.object(first_request, "_open", return_value=self.get_response([b"fir", b"st", b""])):
+            first_request.get_to_file(self.dest_path, callback=download_second)
+        with open(self.dest_path, "rb") as dest_file:
+            self.assertEqual(dest_file.read(), b"first")
+        self.assertEqual(os.listdir(self.temp_dir), ["banner.jpg"])
+
+    def test_interrupted_download_leaves_no_file(self):
+        request = http.Request("https://example.com/banner.jpg")
+        with patch.object(request, "_open", return_value=self.get_response([b"abc", socket.timeout()])):
+            with self.assertRaises(http.HTTPError):
+                request.get_to_file(self.dest_path)
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+
+class TestYaml(TestCase):
+    def test_yaml_files_are_written_atomically(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, "game.yml")
+            yaml.write_yaml_to_file({"game": {"exe": "old.exe"}}, config_path)
+            yaml.write_yaml_to_file({"game": {"exe": "game.exe"}}, config_path)
+            self.assertEqual(os.listdir(temp_dir), ["game.yml"])
+            self.assertEqual(yaml.read_yaml_from_file(config_path), {"game": {"exe": "game.exe"}})
+
+
+class TestSettingsIO(TestCase):
+    def test_rapid_writes_are_written_once(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, "lutris.conf")
+            settings_io = SettingsIO(config_path)
+            with patch.object(settings_io, "_write_config", wraps=settings_io._write_config) as write_config:
+                for width in range(100):
+                    settings_io.write_setting("width", width)
+                self.assertEqual(settings_io.read_setting("width"), "99")
+                self.assertEqual(write_config.call_count, 0)
+                settings_io.flush()
+                settings_io.flush()
+                self.assertEqual(write_config.call_count, 1)
+            self.assertEqual(SettingsIO(config_path).read_setting("width"), "99")
+
+
+class TestLinuxSystem(TestCase):
+    def test_probes_are_persisted(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = os.path.join(temp_dir, "system.json")
+            with patch.object(linux, "SYSTEM_CACHE_PATH", cache_path):
+                with patch.object(linux.LinuxSystem, "find_commands", return_value={"ldconfig": "/sbin/ldconfig"}):
+                    self.assertEqual(linux.LinuxSystem().get("ldconfig"), "/sbin/ldconfig")
+                with patch.object(linux.LinuxSystem, "find_commands") as find_commands:
+                    self.assertEqual(linux.LinuxSystem().get("ldconfig"), "/sbin/ldconfig")
+                    find_commands.assert_not_called()
+                with patch.object(linux.LinuxSystem, "get_cache_key", return_value=["/usr/bin", 0, "6.0", None]):
+                    with patch.object(linux.LinuxSystem, "find_commands", return_value={}) as find_commands:
+                        self.assertIsNone(linux.LinuxSystem().get("ldconfig"))
+                        find_commands.assert_called_once()
+
+
+class TestProfiler(TestCase):
+    def test_phases_are_recorded_when_enabled(self):
+        timings = profiler.Profiler()
+        with timings.phase("disabled"):
+            pass
+        self.assertEqual(timings.events, [])
+        timings.enabled = True
+        with timings.phase("SELECT * FROM games", "sql"):
+            pass
+        with timings.phase("SELECT * FROM games", "sql"):
+            pass
+        self.assertEqual(len(timings.events), 2)
+        self.assertIn("sql", timings.get_summary())
+        trace_events = timings.get_chrome_trace()["traceEvents"]
+        self.assertEqual([event["name"] for event in trace_events], ["SELECT * FROM games"] * 2)
+
+    def test_command_name(self):
+        self.assertEqual(profiler.get_command_name(["/usr/bin/glxinfo", "-B"]), "glxinfo")
+        self.assertEqual(profiler.get_command_name("lspci -nn"), "lspci")
+
+
+class TestRuntimePaths(TestCase):
+    def test_runtime_paths_are_computed_once(self):
+        runtime._RUNTIME_PATHS_CACHE.clear()
+        with patch.object(runtime.LINUX_SYSTEM, "iter_lib_folders", return_value=iter(["/usr/lib"])) as lib_folders:
+            paths = runtime.get_runtime_paths(prefer_system_libs=True)
+            paths.append("/tmp")
+            self.assertEqual(runtime.get_runtime_paths(prefer_system_libs=True), paths[:-1])
+            self.assertEqual(lib_folders.call_count, 1)
+
+
+class TestRuntimeUpdate(TestCase):
+    def setUp(self):
+        self.runtime_dir = tempfile.mkdtemp()
+        self.remote_files = {}
+        self.downloaded_urls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.runtime_dir)
+
+    def fake_request(self, url):
+        test = self
+
+        class FakeRequest:
+            def get(self):
+                self.json = test.remote_files[url]
+                return self
+
+            def get_to_file(self, path):
+                test.downloaded_urls.append(url)
+                with open(path, "wb") as dest_file:
+                    dest_file.write(test.remote_files[url])
+                return self
+        return FakeRequest()
+
+    def publish(self, files):
+        manifest = {"files": []}
+        for path, content in files.items():
+            self.remote_files["https://lutris.net/runtime/" + path] = content
+            manifest["files"].append({
+                "path": path,
+                "sha256": hashlib.sha256(content).hexdigest(),
+                "size": len(content),
+            })
+        self.remote_files["https://lutris.net/runtime/manifest.json"] = manifest
+
+    def test_only_changed_files_are_downloaded(self):
+        updater = runtime.RuntimeUpdater()
+        with patch.object(runtime, "RUNTIME_DIR", self.runtime_dir), \
+                patch.object(runtime.http, "Request", side_effect=self.fake_request):
+            test_runtime = runtime.Runtime("test", updater)
+            self.publish({"lib/libfoo.so": b"foo", "lib/libbar.so": b"bar"})
+            test_runtime.update_from_manifest("https://lutris.net/runtime/manifest.json")
+            self.publish({"lib/libfoo.so": b"foo", "lib/libbar.so": b"bar 2"})
+            self.downloaded_urls = []
+            test_runtime.update_from_manifest("https://lutris.net/runtime/manifest.json")
+        self.assertEqual(self.downloaded_urls, ["https://lutris.net/runtime/lib/libbar.so"])
+        runtime_path = os.path.join(self.runtime_dir, "test")
+        with open(os.path.join(runtime_path, "lib/libbar.so"), "rb") as lib_file:
+            self.assertEqual(lib_file.read(), b"bar 2")
+        self.assertEqual(sorted(os.listdir(self.runtime_dir)), [".test.manifest.json", "test"])
+
+
+class TestGraphicsAdapters(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pci_path = os.path.join(self.temp_dir, "devices")
+        for pci_id, pci_class, device in (
+            ("0000:00:02.0", "0x030000", "0x9bc4"),
+            ("0000:00:14.0", "0x0c0330", "0x06ed"),
+            ("0000:01:00.0", "0x030200", "0x1f91"),
+        ):
+            os.makedirs(os.path.join(self.pci_path, pci_id))
+            for name, content in (("class", pci_class), ("vendor", "0x8086"), ("device", device)):
+                with open(os.path.join(self.pci_path, pci_id, name), "w") as sysfs_file:
+                    sysfs_file.write(content + "\n")
+        display.get_graphics_adapters.cache_clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        display.get_graphics_adapters.cache_clear()
+
+    def test_adapters_are_read_from_sysfs(self):
+        with patch.object(display, "PCI_DEVICES_PATH", self.pci_path):
+            with patch.object(display, "_read_lspci_graphics_adapters") as read_lspci:
+                self.assertEqual(
+                    display.get_graphics_adapters(),
+                    [("0000:00:02.0", "8086:9bc4"), ("0000:01:00.0", "8086:1f91")]
+                )
+                self.assertTrue(display.use_dri_prime())
+                read_lspci.assert_not_called()
+
+    def test_lspci_output_is_cached(self):
+        os.remove(os.path.join(self.pci_path, "0000:00:14.0", "class"))
+        cache_path = os.path.join(self.temp_dir, "graphics-adapters.json")
+        adapters = [("00:02.0", "Intel Corporation UHD Graphics")]
+        with patch.object(display, "PCI_DEVICES_PATH", self.pci_path), \
+                patch.object(display, "GRAPHICS_ADAPTERS_CACHE_PATH", cache_path):
+            with patch.object(display, "_read_lspci_graphics_adapters", return_value=adapters) as read_lspci:
+                self.assertEqual(display.get_graphics_adapters(), adapters)
+                display.get_graphics_adapters.cache_clear()
+                self.assertEqual(display.get_graphics_adapters(), adapters)
+                read_lspci.assert_called_once()
+
+
+class TestLauncherIndex(TestCase):
+    def setUp(self):
+        self.launcher_dir = tempfile.mkdtemp()
+        open(os.path.join(self.launcher_dir, "quake.desktop"), "w").close()
+
+    def tearDown(self):
+        shutil.rmtree(self.launcher_dir)
+
+    def test_launchers_are_listed_once_until_the_folder_changes(self):
+        with patch.object(xdgshortcuts.LauncherIndex, "_watch"):
+            index = xdgshortcuts.LauncherIndex(self.launcher_dir)
+            index.monitor = object()
+            with patch.object(xdgshortcuts, "get_launcher_index", return_value=index):
+                self.assertTrue(xdgshortcuts.launcher_exists(self.launcher_dir, "quake", 1))
+                open(os.path.join(self.launcher_dir, "net.lutris.doom-2.desktop"), "w").close()
+                self.assertFalse(xdgshortcuts.launcher_exists(self.launcher_dir, "doom", 2))
+                index._on_directory_changed(None, None, None, None)
+                self.assertTrue(xdgshortcuts.launcher_exists(self.launcher_dir, "doom", 2))
+
+
+class TestMediaFetcher(TestCase):
+    def test_completed_downloads_are_reported_in_batches(self):
+        batches = []
+        fetcher = resources.MediaFetcher(callback=batches.append, max_workers=2, batch_size=2)
+        with patch.object(resources, "download_media", side_effect=lambda url, dest, overwrite: dest):
+            for index in range(5):
+                fetcher.queue(index, "http://example.com/%s.png" % index, "/tmp/%s.png" % index)
+            fetcher.shutdown()
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+        self.assertEqual(sorted(key for batch in batches for key in batch), list(range(5)))
+
+
+class TestInputDevices(TestCase):
+    def test_devices_are_read_once_until_dev_input_changes(self):
+        device = joypad.InputDevice("/dev/input/event3", "Pad", None, "", "")
+        with patch.object(joypad.InputDeviceIndex, "_watch"), \
+                patch.object(joypad.InputDeviceIndex, "read_devices", return_value=[device]) as read_devices, \
+                patch.object(joypad, "evdev", object()):
+            index = joypad.InputDeviceIndex()
+            index.monitor = object()
+            with patch.object(joypad, "INPUT_DEVICE_INDEX", index):
+                self.assertEqual(joypad.get_joypads(), [("/dev/input/event3", "Pad")])
+                self.assertEqual(joypad.get_joypads(), [("/dev/input/event3", "Pad")])
+                self.assertEqual(read_devices.call_count, 1)
+                index._on_directory_changed(None, None, None, None)
+                joypad.get_joypads()
+                self.assertEqual(read_devices.call_count, 2)
+
+    def test_controller_mappings_are_parsed_on_access(self):
+        mapping = gamecontrollerdb.ControllerMapping("0300", "Pad", "a:b0,b:b1,platform:Linux,")
+        with patch.object(mapping, "parse", wraps=mapping.parse) as parse:
+            self.assertEqual(mapping.keys["a"], "b0")
+            self.assertEqual(mapping.keys["platform"], "Linux")
+            self.assertEqual(parse.call_count, 1)
@@ -1,5 +1,14 @@
+import json
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
 from lutris.runners import wine
+from lutris.util.wine import cabinstall, dxvk, nine
 
 
 class TestDllOverrides(TestCase):
@@ -13,3 +22,206 @@ class TestDllOverrides(TestCase):
         }
         env_string = wine.get_overrides_env(overrides)
         self.assertEqual(env_string, "d3dcompiler_43,d3dcompiler_47=n,b;dnsapi=b;rasapi32=n;dwrite=")
+
+
+class TestDXVKVersions(TestCase):
+    def setUp(self):
+        self.runtime_dir = tempfile.mkdtemp()
+
+        class Manager(dxvk.DXVKManager):
+            DXVK_VERSIONS = ["1.0"]
+            init_lock = threading.RLock()
+            base_dir = os.path.join(self.runtime_dir, "dxvk")
+        self.manager = Manager
+
+    def tearDown(self):
+        shutil.rmtree(self.runtime_dir)
+
+    @staticmethod
+    def get_response(releases, etag):
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.read.return_value = json.dumps(releases).encode()
+        response.headers = {"ETag": etag}
+        return response
+
+    def test_versions_are_refreshed_once_per_day(self):
+        releases = [{"tag_name": "v2.0"}, {"tag_name": "v1.9"}]
+        with patch.object(dxvk, "RUNTIME_DIR", self.runtime_dir), \
+                patch.object(dxvk.urllib.request, "urlopen", return_value=self.get_response(releases, "abc")) as urlopen:
+            self.assertFalse(dxvk.load_dxvk_versions(self.manager))
+            self.assertTrue(dxvk.refresh_dxvk_versions(self.manager))
+            self.assertEqual(self.manager.DXVK_LATEST, "2.0")
+            self.assertFalse(dxvk.refresh_dxvk_versions(self.manager))
+            self.assertEqual(urlopen.call_count, 1)
+
+    def test_failed_refresh_keeps_known_versions(self):
+        with patch.object(dxvk, "RUNTIME_DIR", self.runtime_dir), \
+                patch.object(dxvk.urllib.request, "urlopen", side_effect=OSError("offline")) as urlopen:
+            self.assertFalse(dxvk.refresh_dxvk_versions(self.manager))
+            self.assertFalse(dxvk.refresh_dxvk_versions(self.manager))
+            self.assertEqual(urlopen.call_count, 1)
+        self.assertEqual(self.manager.DXVK_VERSIONS, ["1.0"])
+
+    def test_offline_uses_the_latest_local_version(self):
+        releases = [{"tag_name": "v2.0"}, {"tag_name": "v1.9"}, {"tag_name": "v1.8"}]
+        with patch.object(dxvk, "RUNTIME_DIR", self.runtime_dir), \
+                patch.object(dxvk.urllib.request, "urlopen", return_value=self.get_response(releases, "abc")):
+            dxvk.refresh_dxvk_versions(self.manager)
+        self.assertEqual(self.manager.DXVK_LATEST, "2.0")
+        for dxvk_arch in ("x64", "x32"):
+            dll_dir = os.path.join(self.manager.base_dir, "1.9", dxvk_arch)
+            os.makedirs(dll_dir)
+            open(os.path.join(dll_dir, "d3d11.dll"), "w").close()
+        manager = self.manager(os.path.join(self.runtime_dir, "prefix"))
+        self.assertEqual(manager.get_latest_local_version(), "1.9")
+
+        with patch.object(dxvk, "RUNTIME_DIR", self.runtime_dir), \
+                patch.object(dxvk.time, "time", return_value=time.time() + dxvk.CACHE_MAX_AGE + 1), \
+                patch.object(dxvk.urllib.request, "urlopen", side_effect=OSError("offline")):
+            self.assertFalse(dxvk.refresh_dxvk_versions(self.manager))
+        self.assertEqual(self.manager.DXVK_VERSIONS, ["1.9"])
+        self.assertEqual(manager.version, "1.9")
+
+    def test_wine_falls_back_to_local_version_when_download_fails(self):
+        runner = wine.wine()
+        manager = MagicMock(version="2.0", latest_version="2.0")
+        manager.get_latest_local_version.return_value = "1.9"
+        with patch.object(wine.wine, "runner_config", {"dxvk": True}), \
+                patch.object(wine.wine, "prefix_path", "/prefix"), \
+                patch.object(wine.wine, "wine_arch", "win64"), \
+                patch.object(runner, "toggle_dxvk", side_effect=[dxvk.UnavailableDXVKVersion("offline"), None]) \
+                as toggle_dxvk:
+            runner.setup_dxvk("dxvk", dxvk_manager=manager)
+        self.assertEqual(toggle_dxvk.call_args[1]["version"], "1.9")
+        self.assertEqual(toggle_dxvk.call_args[1]["dxvk_manager"].version, "1.9")
+
+
+class TestDXVKManager(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.prefix = os.path.join(self.temp_dir, "prefix")
+        for system_dir in ("system32", "syswow64"):
+            os.makedirs(os.path.join(self.prefix, "drive_c/windows", system_dir))
+            with open(os.path.join(self.prefix, "drive_c/windows", system_dir, "d3d11.dll"), "wb") as dll_file:
+                dll_file.write(b"wine")
+        for arch in ("x64", "x32"):
+            os.makedirs(os.path.join(self.temp_dir, "dxvk/1.0", arch))
+            for dll in dxvk.DXVKManager.dxvk_dlls:
+                with open(os.path.join(self.temp_dir, "dxvk/1.0", arch, dll + ".dll"), "wb") as dll_file:
+                    dll_file.write(b"dxvk")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_enable_is_skipped_when_nothing_changed(self):
+        with patch.object(dxvk.DXVKManager, "base_dir", os.path.join(self.temp_dir, "dxvk")):
+            manager = dxvk.DXVKManager(self.prefix, version="1.0")
+            manager.enable()
+            d3d11_path = os.path.join(self.prefix, "drive_c/windows/system32/d3d11.dll")
+            self.assertEqual(os.readlink(d3d11_path), os.path.join(manager.dxvk_path, "x64/d3d11.dll"))
+            self.assertTrue(os.path.exists(d3d11_path + ".orig"))
+            with patch.object(dxvk.DXVKManager, "is_dxvk_dll") as is_dxvk_dll:
+                manager.enable()
+                is_dxvk_dll.assert_not_called()
+                os.remove(d3d11_path)
+                manager.enable()
+                self.assertEqual(os.readlink(d3d11_path), os.path.join(manager.dxvk_path, "x64/d3d11.dll"))
+
+    def test_concurrent_downloads_are_shared(self):
+        fetched = threading.Event()
+        with patch.object(dxvk.DXVKManager, "base_dir", os.path.join(self.temp_dir, "dxvk")):
+            with patch.object(dxvk.DXVKManager, "_fetch", side_effect=lambda _callback: fetched.wait(5)) as fetch:
+                first = dxvk.DXVKManager(self.prefix, version="2.0").start_download()
+                second = dxvk.DXVKManager(self.prefix, version="2.0").start_download()
+                self.assertIs(first, second)
+                fetched.set()
+                first.result(timeout=5)
+                fetch.assert_called_once()
+            self.assertIsNone(dxvk.DXVKManager(self.prefix, version="1.0").start_download())
+
+
+class TestNineManager(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.lib_dir = os.path.join(self.temp_dir, "lib")
+        os.makedirs(os.path.join(self.lib_dir, "d3d"))
+        with open(os.path.join(self.lib_dir, "d3d", "d3dadapter9.so.1"), "wb") as lib_file:
+            lib_file.write(b"mesa")
+        self.prefix = os.path.join(self.temp_dir, "prefix")
+        for system_dir in ("system32", "syswow64"):
+            os.makedirs(os.path.join(self.prefix, "drive_c/windows", system_dir))
+            for nine_file in nine.NineManager.nine_files:
+                with open(os.path.join(self.prefix, "drive_c/windows", system_dir, nine_file), "wb") as dll_file:
+                    dll_file.write(b"nine")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_system_support_is_cached(self):
+        with patch.object(nine.system.LINUX_SYSTEM, "iter_lib_folders", return_value=iter([self.lib_dir])):
+            self.assertTrue(nine.NineManager.nine_is_supported())
+        with patch.object(nine.system.LINUX_SYSTEM, "iter_lib_folders", return_value=iter([self.lib_dir])), \
+                patch.object(nine.os.path, "exists") as exists:
+            self.assertTrue(nine.NineManager.nine_is_supported())
+            exists.assert_not_called()
+
+    def test_disable_is_skipped_once_recorded(self):
+        manager = nine.NineManager("wine", self.prefix, "win64")
+        with patch.object(nine, "wineexec") as wineexec:
+            manager.disable()
+            self.assertEqual(wineexec.call_count, 1)
+            manager.disable()
+            self.assertEqual(wineexec.call_count, 1)
+            manager.write_state(True)
+            manager.disable()
+            self.assertEqual(wineexec.call_count, 2)
+
+
+class TestCabInstaller(TestCase):
+    manifest = """<?xml version="1.0" encoding="UTF-8"?>
+<assembly xmlns="urn:schemas-microsoft-com:asm.v3" manifestVersion="1.0">
+  <assemblyIdentity name="xaudio" processorArchitecture="%s"/>
+  <registryKeys>
+    <registryKey keyName="HKEY_CLASSES_ROOT\\CLSID\\{ID}">
+      <registryValue name="" valueType="REG_SZ" value="XAudio2"/>
+    </registryKey>
+  </registryKeys>
+</assembly>
+"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.installer = cabinstall.CabInstaller(self.temp_dir, arch="win64")
+
+    def tearDown(self):
+        self.installer.cleanup()
+        shutil.rmtree(self.temp_dir)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "wb") as test_file:
+            test_file.write(content)
+        return path
+
+    def test_arch_is_read_from_pe_header(self):
+        dos_header = b"MZ" + b"\0" * 58 + struct.pack("<I", 64)
+        self.assertEqual(
+            cabinstall.CabInstaller.get_arch_from_dll(self.write_file("64.dll", dos_header + b"PE\0\0\x64\x86")),
+            "win64"
+        )
+        self.assertEqual(
+            cabinstall.CabInstaller.get_arch_from_dll(self.write_file("32.dll", dos_header + b"PE\0\0\x4c\x01")),
+            "win32"
+        )
+
+    def test_manifests_are_merged_in_one_registry_file(self):
+        manifests = [
+            self.write_file("amd64.manifest", (self.manifest % "amd64").encode()),
+            self.write_file("x86.manifest", (self.manifest % "x86").encode()),
+        ]
+        with open(self.installer.get_registry_file(manifests)) as reg_file:
+            registry = reg_file.read()
+        self.assertTrue(registry.startswith(cabinstall.REGISTRY_HEADER))
+        self.assertIn("[HKEY_LOCAL_MACHINE\\Software\\Classes\\CLSID\\{ID}]\n@=\"XAudio2\"", registry)
+        self.assertIn("[HKEY_LOCAL_MACHINE\\Software\\Classes\\Wow6432Node\\CLSID\\{ID}]\n@=\"XAudio2\"", registry)